@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import ExitStack
+from datetime import date, datetime, timezone
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tortoise import Tortoise
+from tortoise.contrib.fastapi import register_tortoise
+from backend.crud.report_search import ensure_report_search_index
+from backend.models import tortoise_models as models
+
+DB_URL = "sqlite://:memory:"
+DB_MODULES = {"models": ["backend.models.tortoise_models"]}
+
+@pytest.fixture
+def run():
+    # Runs an async test body against a fresh in-memory database
+    def runner(test):
+        async def main():
+            await Tortoise.init(db_url=DB_URL, modules=DB_MODULES)
+            await Tortoise.generate_schemas()
+            await ensure_report_search_index()
+            try:
+                return await test()
+            finally:
+                await Tortoise.close_connections()
+        return asyncio.run(main())
+    return runner
+
+@pytest.fixture
+def make_client():
+    # make_client(*routers, middleware=()) -> a started TestClient on a fresh in-memory database;
+    # client.portal.call(async_fn) runs setup code on the app's event loop
+    stack = ExitStack()
+
+    def factory(*routers, middleware=()):
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router)
+        for cls in middleware:
+            app.add_middleware(cls)
+        register_tortoise(app, db_url=DB_URL, modules=DB_MODULES, generate_schemas=True)
+        app.add_event_handler("startup", ensure_report_search_index)
+        return stack.enter_context(TestClient(app))
+
+    yield factory
+    stack.close()
+
+@pytest.fixture
+def seed():
+    # One of each record a study needs, plus the study
+    async def create():
+        department = await models.Department.create(name="Radiology", description="")
+        user = await models.User.create(name="Reader", email="reader@example.com", password_hash="x", role="radiologist")
+        patient = await models.Patient.create(
+            first_name="Ada", last_name="Lovelace", date_of_birth=date(1990, 1, 1), gender="female",
+            medical_record_number="MRN-1"
+        )
+        physician = await models.ReferringPhysician.create(
+            first_name="Rene", last_name="Laennec", specialization="Internal", license_number="LIC-1"
+        )
+        room = await models.Room.create(name="CT 1", department=department, capacity=1)
+        equipment = await models.Equipment.create(
+            name="Scanner", type="CT", model="X", serial_number="SN-1", purchase_date=date(2020, 1, 1),
+            warranty_expiry=date(2030, 1, 1), room=room
+        )
+        study = await models.Study.create(
+            patient=patient, referring_physician=physician, room=room, equipment=equipment,
+            study_date=datetime(2024, 1, 1, tzinfo=timezone.utc), study_type="CT Head"
+        )
+        return {
+            "department": department, "user": user, "patient": patient, "physician": physician,
+            "room": room, "equipment": equipment, "study": study,
+        }
+    return create
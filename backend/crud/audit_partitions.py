@@ -0,0 +1,370 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from tortoise.transactions import in_transaction
+from backend.database.tortoise_config import DATA_DIR
+from backend.models.tortoise_models import AuditLog, AuditLog_Pydantic
+from backend.crud.pagination import DEFAULT_CURSOR_KEYS, DEFAULT_PAGE_SIZE, decode_cursor, paginate
+from backend.crud.serialization import serialize_queryset
+from backend.crud.filters import date_range, day_bounds
+
+logger = logging.getLogger(__name__)
+
+AUDIT_TABLE = "audit_logs"
+# Months kept in the database, the current one included; older months are moved to the archive
+AUDIT_HOT_MONTHS = int(os.getenv("AUDIT_HOT_MONTHS", "13"))
+# Archived months are deleted once they are this old
+AUDIT_RETENTION_YEARS = int(os.getenv("AUDIT_RETENTION_YEARS", "7"))
+# PostgreSQL partitions are created this many months ahead of the current one
+AUDIT_PARTITIONS_AHEAD = int(os.getenv("AUDIT_PARTITIONS_AHEAD", "3"))
+AUDIT_ARCHIVE_DIR = Path(os.getenv("AUDIT_ARCHIVE_DIR", DATA_DIR / "audit_archive"))
+# Rows read per query while exporting a month
+ARCHIVE_CHUNK_SIZE = 10000
+# PostgreSQL advisory lock key held by whichever instance runs maintenance
+AUDIT_MAINTENANCE_LOCK = 0x61756469745F6D74
+
+COLUMNS = (
+    "id", "user_id", "action", "module", "description", "ip_address", "user_agent",
+    "resource_id", "resource_type", "old_values", "new_values", "created_at", "department_id",
+)
+_MONTH_TABLE = re.compile(rf"^{AUDIT_TABLE}_(\d{{4}})_(\d{{2}})$")
+_ARCHIVE_FILE = re.compile(rf"^{AUDIT_TABLE}_(\d{{4}})_(\d{{2}})\.ndjson\.gz$")
+
+def month_start(moment) -> date:
+    return date(moment.year, moment.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+def month_bounds(month: date) -> Tuple[datetime, datetime]:
+    # Months are cut in UTC, the zone created_at is stored in
+    return (
+        datetime.combine(month, time.min, tzinfo=timezone.utc),
+        datetime.combine(add_months(month, 1), time.min, tzinfo=timezone.utc),
+    )
+
+def month_table(month: date) -> str:
+    return f"{AUDIT_TABLE}_{month:%Y_%m}"
+
+def archive_path(month: date) -> Path:
+    return AUDIT_ARCHIVE_DIR / f"{month_table(month)}.ndjson.gz"
+
+def current_month() -> date:
+    return month_start(datetime.now(timezone.utc))
+
+def _overlapping(months: List[date], since: Optional[datetime], until: Optional[datetime]) -> List[date]:
+    return [
+        month for month in months
+        if (since is None or month_bounds(month)[1] > since) and (until is None or month_bounds(month)[0] < until)
+    ]
+
+def _postgres(db) -> bool:
+    return db.capabilities.dialect == "postgres"
+
+def _sql_params(db) -> Tuple[List[Any], Callable[[Any], str]]:
+    params: List[Any] = []
+    postgres = _postgres(db)
+
+    def param(value: Any) -> str:
+        params.append(value)
+        return f"${len(params)}" if postgres else "?"
+    return params, param
+
+def _to_python(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Raw rows (and archived ones) come back as stored; the model fields turn them into what the ORM returns
+    fields = AuditLog._meta.fields_map
+    return {key: fields[key].to_python_value(value) if value is not None else None for key, value in row.items()}
+
+def _index_statements(table: str) -> List[str]:
+    # The model's indexes, named after the table so every month table gets its own copy
+    return [
+        f'CREATE INDEX IF NOT EXISTS "{table}_{"_".join(columns)}" ON "{table}" ({", ".join(columns)})'
+        for columns in AuditLog._meta.indexes
+    ]
+
+async def _oldest(db) -> Optional[datetime]:
+    rows = await db.execute_query_dict(f'SELECT MIN(created_at) AS oldest FROM "{AUDIT_TABLE}"')
+    oldest = rows[0]["oldest"] if rows else None
+    return AuditLog._meta.fields_map["created_at"].to_python_value(oldest) if oldest is not None else None
+
+@asynccontextmanager
+async def maintenance_lock() -> AsyncIterator[bool]:
+    # Yields whether this instance may run maintenance. On PostgreSQL the session lock lives on a connection
+    # held for the whole pass; a SQLite database is served by a single process.
+    db = AuditLog._meta.db
+    if not _postgres(db):
+        yield True
+        return
+    async with db.acquire_connection() as conn:
+        locked = await conn.fetchval("SELECT pg_try_advisory_lock($1)", AUDIT_MAINTENANCE_LOCK)
+        try:
+            yield locked
+        finally:
+            if locked:
+                await conn.execute("SELECT pg_advisory_unlock($1)", AUDIT_MAINTENANCE_LOCK)
+
+# PostgreSQL: native range partitions on created_at
+
+async def _postgres_partitions(db) -> List[str]:
+    rows = await db.execute_query_dict(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        f"WHERE i.inhparent = to_regclass('{AUDIT_TABLE}')"
+    )
+    return [row["relname"] for row in rows]
+
+async def _is_partitioned(db) -> bool:
+    # audit_logs is converted by the partition_audit_logs migration
+    rows = await db.execute_query_dict(
+        f"SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('{AUDIT_TABLE}')"
+    )
+    return bool(rows)
+
+async def _add_postgres_partition(db, month: date) -> None:
+    # Rows that already landed in the default partition move into the new one
+    table = month_table(month)
+    since, until = month_bounds(month)
+    async with in_transaction("default") as conn:
+        await conn.execute_query(f'CREATE TABLE "{table}" (LIKE "{AUDIT_TABLE}" INCLUDING DEFAULTS)')
+        await conn.execute_query(
+            f'WITH moved AS (DELETE FROM "{AUDIT_TABLE}_default" WHERE created_at >= $1 AND created_at < $2 RETURNING *) '
+            f'INSERT INTO "{table}" SELECT * FROM moved',
+            [since, until]
+        )
+        await conn.execute_query(
+            f"ALTER TABLE \"{AUDIT_TABLE}\" ATTACH PARTITION \"{table}\" "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{add_months(month, 1)} 00:00:00+00')"
+        )
+
+# SQLite: closed months are rolled out of audit_logs into one table per month
+
+async def rolled_months(db) -> List[date]:
+    if _postgres(db):
+        return []
+    rows = await db.execute_query_dict(
+        f"SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '{AUDIT_TABLE}_%'"
+    )
+    matches = [_MONTH_TABLE.match(row["name"]) for row in rows]
+    return sorted(date(int(m.group(1)), int(m.group(2)), 1) for m in matches if m)
+
+async def _roll_month(db, month: date) -> None:
+    table = month_table(month)
+    since, until = month_bounds(month)
+    async with in_transaction("default") as conn:
+        await conn.execute_query(f'CREATE TABLE IF NOT EXISTS "{table}" AS SELECT * FROM "{AUDIT_TABLE}" WHERE 0')
+        for statement in _index_statements(table):
+            await conn.execute_query(statement)
+        await conn.execute_query(
+            f'INSERT INTO "{table}" SELECT * FROM "{AUDIT_TABLE}" WHERE created_at >= ? AND created_at < ?',
+            [since, until]
+        )
+        await conn.execute_query(f'DELETE FROM "{AUDIT_TABLE}" WHERE created_at >= ? AND created_at < ?', [since, until])
+
+async def ensure_audit_partitions() -> int:
+    # Returns how many monthly partitions were created (PostgreSQL) or rolled (SQLite)
+    db = AuditLog._meta.db
+    month = current_month()
+    changed = 0
+    if _postgres(db):
+        if not await _is_partitioned(db):
+            logger.error("%s is not partitioned yet; run `aerich upgrade`", AUDIT_TABLE)
+            return 0
+        existing = set(await _postgres_partitions(db))
+        for ahead in range(1, AUDIT_PARTITIONS_AHEAD + 1):
+            if month_table(add_months(month, ahead)) not in existing:
+                await _add_postgres_partition(db, add_months(month, ahead))
+                changed += 1
+        return changed
+
+    # Late events for a closed month (spill replays, imports) are picked up by the next pass
+    oldest = await _oldest(db)
+    while oldest is not None and month_start(oldest) < month:
+        await _roll_month(db, month_start(oldest))
+        changed += 1
+        oldest = await _oldest(db)
+    return changed
+
+# Cold archive: one gzip NDJSON file per month
+
+def archived_months() -> List[date]:
+    if not AUDIT_ARCHIVE_DIR.is_dir():
+        return []
+    matches = [_ARCHIVE_FILE.match(path.name) for path in AUDIT_ARCHIVE_DIR.iterdir()]
+    return sorted(date(int(m.group(1)), int(m.group(2)), 1) for m in matches if m)
+
+def _write_rows(out, rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        out.write(json.dumps(_to_python(row), default=str) + "\n")
+
+def _append_archive(part: Path, path: Path) -> None:
+    # Gzip members concatenate, so rows archived late for a month are appended to its file
+    if not path.exists():
+        part.rename(path)
+        return
+    with part.open("rb") as source, path.open("ab") as target:
+        shutil.copyfileobj(source, target)
+    part.unlink()
+
+async def months_to_archive() -> List[date]:
+    db = AuditLog._meta.db
+    cutoff = add_months(current_month(), -(AUDIT_HOT_MONTHS - 1))
+    months = set(month for month in await rolled_months(db) if month < cutoff)
+    oldest = await _oldest(db)
+    month = month_start(oldest) if oldest is not None else cutoff
+    while month < cutoff:
+        months.add(month)
+        month = add_months(month, 1)
+    return sorted(months)
+
+async def archive_month(month: date) -> int:
+    # Exports the month to its archive file, then removes it from the database; returns the rows moved
+    db = AuditLog._meta.db
+    since, until = month_bounds(month)
+    tables = [AUDIT_TABLE]
+    if month in await rolled_months(db):
+        tables.insert(0, month_table(month))
+
+    AUDIT_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    path = archive_path(month)
+    part = path.with_name(path.name + ".part")
+    written = 0
+    with gzip.open(part, "wt", encoding="utf-8") as out:
+        for table in tables:
+            last_id = 0
+            while True:
+                params, param = _sql_params(db)
+                rows = await db.execute_query_dict(
+                    f'SELECT {", ".join(COLUMNS)} FROM "{table}" '
+                    f"WHERE created_at >= {param(since)} AND created_at < {param(until)} AND id > {param(last_id)} "
+                    f"ORDER BY id LIMIT {ARCHIVE_CHUNK_SIZE}",
+                    params
+                )
+                if not rows:
+                    break
+                await asyncio.to_thread(_write_rows, out, rows)
+                written += len(rows)
+                last_id = rows[-1]["id"]
+    if not written:
+        part.unlink()
+        return 0
+    await asyncio.to_thread(_append_archive, part, path)
+
+    # Only removed once the archive file is complete; a crash in between leaves duplicates, which reads skip
+    params, param = _sql_params(db)
+    if _postgres(db):
+        if month_table(month) in await _postgres_partitions(db):
+            await db.execute_query(f'ALTER TABLE "{AUDIT_TABLE}" DETACH PARTITION "{month_table(month)}"')
+    await db.execute_query(f'DROP TABLE IF EXISTS "{month_table(month)}"')
+    await db.execute_query(
+        f'DELETE FROM "{AUDIT_TABLE}" WHERE created_at >= {param(since)} AND created_at < {param(until)}', params
+    )
+    return written
+
+def purge_archives() -> int:
+    # Past retention the archive files go too; returns how many were deleted
+    cutoff = add_months(current_month(), -12 * AUDIT_RETENTION_YEARS)
+    expired = [month for month in archived_months() if month < cutoff]
+    for month in expired:
+        archive_path(month).unlink()
+    return len(expired)
+
+# Reads across the live table, rolled months and the archive
+
+def _row_filter(
+    filters: Dict[str, Any],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[List[Any]]
+) -> Callable[[Dict[str, Any]], bool]:
+    def matches(row: Dict[str, Any]) -> bool:
+        if any(row.get(key) != value for key, value in filters.items()):
+            return False
+        created_at = datetime.fromisoformat(row["created_at"])
+        if (since is not None and created_at < since) or (until is not None and created_at >= until):
+            return False
+        return cursor is None or (created_at, row["id"]) > tuple(cursor)
+    return matches
+
+def _read_archive(path: Path, matches: Callable[[Dict[str, Any]], bool], wanted: Optional[int]) -> List[Dict[str, Any]]:
+    rows: Dict[int, Dict[str, Any]] = {}
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            row = json.loads(line)
+            if matches(row):
+                rows[row["id"]] = row
+    found = sorted((_to_python(row) for row in rows.values()), key=lambda row: (row["created_at"], row["id"]))
+    return found[:wanted] if wanted is not None else found
+
+async def _read_month_table(
+    db,
+    month: date,
+    filters: Dict[str, Any],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[List[Any]],
+    wanted: Optional[int]
+) -> List[Dict[str, Any]]:
+    params, param = _sql_params(db)
+    clauses = [f"{column} = {param(value)}" for column, value in filters.items()]
+    if since is not None:
+        clauses.append(f"created_at >= {param(since)}")
+    if until is not None:
+        clauses.append(f"created_at < {param(until)}")
+    if cursor is not None:
+        created_at, last_id = cursor
+        clauses.append(f"(created_at > {param(created_at)} OR (created_at = {param(created_at)} AND id > {param(last_id)}))")
+    sql = f'SELECT {", ".join(COLUMNS)} FROM "{month_table(month)}"'
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at, id"
+    if wanted is not None:
+        sql += f" LIMIT {param(wanted)}"
+    return [_to_python(row) for row in await db.execute_query_dict(sql, params)]
+
+async def query_audit_logs(
+    filters: Dict[str, Any],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    skip: int = 0,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    search_archive: bool = False
+) -> List[AuditLog_Pydantic]:
+    # Only months the date range reaches are read. PostgreSQL prunes its own partitions; on SQLite the rolled
+    # month tables are picked here. Archived months are searched when a date range is given or search_archive is set.
+    since, until = day_bounds(start_date, end_date)
+    query = AuditLog.filter(**filters, **date_range("created_at", start_date, end_date))
+
+    db = AuditLog._choose_db()
+    month_tables = _overlapping(await rolled_months(db), since, until)
+    archives = _overlapping(archived_months(), since, until) if start_date or end_date or search_archive else []
+    if not month_tables and not archives:
+        return await serialize_queryset(AuditLog_Pydantic, paginate(query, skip, limit, after))
+
+    # Several sources: each returns its first rows in (created_at, id) order and the pages are merged
+    cursor = decode_cursor(after, AuditLog) if after else None
+    if after is None:
+        wanted = skip + limit if limit is not None else None
+        live = query.order_by(*DEFAULT_CURSOR_KEYS)
+        live = live.limit(wanted) if wanted is not None else live
+    else:
+        skip, wanted = 0, limit or DEFAULT_PAGE_SIZE
+        live = paginate(query, 0, wanted, after)
+    rows = await live.values(*AuditLog_Pydantic.model_fields)
+    for month in month_tables:
+        rows += await _read_month_table(db, month, filters, since, until, cursor, wanted)
+    matches = _row_filter(filters, since, until, cursor)
+    for month in archives:
+        rows += await asyncio.to_thread(_read_archive, archive_path(month), matches, wanted)
+
+    rows.sort(key=lambda row: (row["created_at"], row["id"]))
+    rows = rows[skip:wanted] if wanted is not None else rows[skip:]
+    return [AuditLog_Pydantic.model_validate({name: row[name] for name in AuditLog_Pydantic.model_fields}) for row in rows]
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from backend.models.tortoise_models import Equipment, Equipment_Pydantic, EquipmentIn_Pydantic
 from tortoise.exceptions import DoesNotExist
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
 from datetime import date
 
 async def create_equipment(equipment: EquipmentIn_Pydantic) -> Equipment_Pydantic:
@@ -19,7 +21,8 @@ async def get_all_equipment(
     limit: int = 100,
     status: Optional[str] = None,
     type: Optional[str] = None,
-    room_id: Optional[int] = None
+    room_id: Optional[int] = None,
+    after: Optional[str] = None
 ) -> List[Equipment_Pydantic]:
     query = Equipment.all()
     
@@ -30,8 +33,7 @@ async def get_all_equipment(
     if room_id:
         query = query.filter(room_id=room_id)
     
-    equipment = await query.offset(skip).limit(limit)
-    return [await Equipment_Pydantic.from_tortoise_orm(e) for e in equipment]
+    return await serialize_queryset(Equipment_Pydantic, paginate(query, skip, limit, after))
 
 async def update_equipment(equipment_id: int, equipment: EquipmentIn_Pydantic) -> Optional[Equipment_Pydantic]:
     try:
@@ -56,11 +58,7 @@ async def get_equipment_by_serial(serial_number: str) -> Optional[Equipment_Pyda
 
 async def get_equipment_needing_maintenance() -> List[Equipment_Pydantic]:
     today = date.today()
-    equipment = await Equipment.filter(
-        next_calibration_date__lte=today
-    ).prefetch_related('maintenance_records')
-    return [await Equipment_Pydantic.from_tortoise_orm(e) for e in equipment]
+    return await serialize_queryset(Equipment_Pydantic, Equipment.filter(next_calibration_date__lte=today))
 
 async def get_equipment_by_room(room_id: int) -> List[Equipment_Pydantic]:
-    equipment = await Equipment.filter(room_id=room_id)
-    return [await Equipment_Pydantic.from_tortoise_orm(e) for e in equipment] 
\ No newline at end of file
+    return await serialize_queryset(Equipment_Pydantic, Equipment.filter(room_id=room_id)) 
\ No newline at end of file
@@ -0,0 +1,23 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+from tortoise import timezone
+
+def day_bounds(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    # Inclusive dates as a half-open [since, until) timestamp range, midnights in the configured timezone
+    since = timezone.make_aware(datetime.combine(start_date, time.min)) if start_date else None
+    until = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min)) if end_date else None
+    return since, until
+
+def date_range(field: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, datetime]:
+    # Filter kwargs for a datetime column. `field__date__gte` wraps the column in a date cast,
+    # which no index can serve; comparing the bare column keeps range scans on the index.
+    since, until = day_bounds(start_date, end_date)
+    filters = {}
+    if since is not None:
+        filters[f"{field}__gte"] = since
+    if until is not None:
+        filters[f"{field}__lt"] = until
+    return filters
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from backend.models.tortoise_models import ImageAnnotation, ImageAnnotation_Pydantic, ImageAnnotationIn_Pydantic
 from tortoise.exceptions import DoesNotExist
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
 from datetime import datetime
 
 async def create_annotation(annotation: ImageAnnotationIn_Pydantic) -> ImageAnnotation_Pydantic:
@@ -21,7 +23,8 @@ async def get_all_annotations(
     created_by: Optional[int] = None,
     type: Optional[str] = None,
     status: Optional[str] = None,
-    is_ai_generated: Optional[bool] = None
+    is_ai_generated: Optional[bool] = None,
+    after: Optional[str] = None
 ) -> List[ImageAnnotation_Pydantic]:
     query = ImageAnnotation.all()
     
@@ -36,8 +39,7 @@ async def get_all_annotations(
     if is_ai_generated is not None:
         query = query.filter(is_ai_generated=is_ai_generated)
     
-    annotations = await query.offset(skip).limit(limit)
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations]
+    return await serialize_queryset(ImageAnnotation_Pydantic, paginate(query, skip, limit, after))
 
 async def update_annotation(annotation_id: int, annotation: ImageAnnotationIn_Pydantic) -> Optional[ImageAnnotation_Pydantic]:
     try:
@@ -61,20 +63,16 @@ async def delete_annotation(annotation_id: int) -> bool:
         return False
 
 async def get_study_annotations(study_id: int) -> List[ImageAnnotation_Pydantic]:
-    annotations = await ImageAnnotation.filter(study_id=study_id).order_by('-created_at')
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations]
+    return await serialize_queryset(ImageAnnotation_Pydantic, ImageAnnotation.filter(study_id=study_id).order_by('-created_at'))
 
 async def get_user_annotations(user_id: int) -> List[ImageAnnotation_Pydantic]:
-    annotations = await ImageAnnotation.filter(created_by_id=user_id).order_by('-created_at')
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations]
+    return await serialize_queryset(ImageAnnotation_Pydantic, ImageAnnotation.filter(created_by_id=user_id).order_by('-created_at'))
 
 async def get_annotations_by_type(type: str) -> List[ImageAnnotation_Pydantic]:
-    annotations = await ImageAnnotation.filter(type=type).order_by('-created_at')
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations]
+    return await serialize_queryset(ImageAnnotation_Pydantic, ImageAnnotation.filter(type=type).order_by('-created_at'))
 
 async def get_annotations_by_status(status: str) -> List[ImageAnnotation_Pydantic]:
-    annotations = await ImageAnnotation.filter(status=status).order_by('-created_at')
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations]
+    return await serialize_queryset(ImageAnnotation_Pydantic, ImageAnnotation.filter(status=status).order_by('-created_at'))
 
 async def review_annotation(
     annotation_id: int,
@@ -94,5 +92,4 @@ async def review_annotation(
         return None
 
 async def get_ai_generated_annotations() -> List[ImageAnnotation_Pydantic]:
-    annotations = await ImageAnnotation.filter(is_ai_generated=True).order_by('-created_at')
-    return [await ImageAnnotation_Pydantic.from_tortoise_orm(a) for a in annotations] 
\ No newline at end of file
+    return await serialize_queryset(ImageAnnotation_Pydantic, ImageAnnotation.filter(is_ai_generated=True).order_by('-created_at')) 
\ No newline at end of file
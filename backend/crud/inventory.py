@@ -0,0 +1,231 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+from tortoise import timezone
+from tortoise.expressions import F, Subquery
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+from backend.models.tortoise_models import (
+    Supply, SupplyStatus, InventoryTransaction, InventoryTransaction_Pydantic, TransactionType,
+    InventoryAlert, AlertType, Study
+)
+from backend.schemas.inventory import InventoryTransactionCreate, StudySupplyIssue
+
+# Direction each transaction type moves stock in; adjustments carry their own sign
+STOCK_DIRECTION = {
+    TransactionType.RECEIVED: 1,
+    TransactionType.RETURNED: 1,
+    TransactionType.ADJUSTED: 1,
+    TransactionType.ISSUED: -1,
+    TransactionType.EXPIRED: -1,
+    TransactionType.DAMAGED: -1,
+}
+# Statuses set by hand that stock movements leave alone
+MANUAL_STATUSES = (SupplyStatus.DISCONTINUED, SupplyStatus.ON_ORDER)
+# Alert types kept up to date automatically; recalls and custom alerts are raised by hand
+EVALUATED_ALERT_TYPES = (AlertType.LOW_STOCK, AlertType.EXPIRING, AlertType.EXPIRED)
+EXPIRING_SOON_DAYS = 30
+
+class InsufficientQuantity(ValueError):
+    def __init__(self, supply_id: int):
+        super().__init__(f"Insufficient quantity for supply {supply_id}")
+        self.supply_id = supply_id
+
+class SupplyNotFound(LookupError):
+    def __init__(self, supply_ids: Sequence[int]):
+        super().__init__(f"Supply not found: {', '.join(str(i) for i in supply_ids)}")
+        self.supply_ids = list(supply_ids)
+
+class IssueRejected(ValueError):
+    def __init__(self, problems: List[dict]):
+        super().__init__("Supply issue rejected")
+        self.problems = problems
+
+def stock_status(current_quantity: Decimal, minimum_quantity: Decimal) -> SupplyStatus:
+    if current_quantity <= 0:
+        return SupplyStatus.OUT_OF_STOCK
+    if current_quantity <= minimum_quantity:
+        return SupplyStatus.LOW_STOCK
+    return SupplyStatus.IN_STOCK
+
+def stock_delta(transaction: InventoryTransactionCreate) -> Decimal:
+    if transaction.transaction_type != TransactionType.ADJUSTED and transaction.quantity <= 0:
+        raise ValueError("Quantity must be positive")
+    return STOCK_DIRECTION[transaction.transaction_type] * transaction.quantity
+
+async def refresh_supply_status(supply_ids: Sequence[int]) -> Dict[int, SupplyStatus]:
+    # Recomputes the stock status of the given supplies with one read and one update per status
+    rows = await Supply.filter(id__in=list(supply_ids)).exclude(status__in=MANUAL_STATUSES).values(
+        "id", "current_quantity", "minimum_quantity", "status"
+    )
+    changed: Dict[SupplyStatus, List[int]] = {}
+    statuses = {}
+    for row in rows:
+        status = stock_status(row["current_quantity"], row["minimum_quantity"])
+        statuses[row["id"]] = status
+        if status != row["status"]:
+            changed.setdefault(status, []).append(row["id"])
+    for status, ids in changed.items():
+        await Supply.filter(id__in=ids).update(status=status)
+    return statuses
+
+def desired_alerts(supply: dict, today: date) -> Dict[AlertType, str]:
+    # The alerts a supply should have right now, with their messages
+    if supply["status"] == SupplyStatus.DISCONTINUED:
+        return {}
+    alerts = {}
+    if supply["current_quantity"] <= supply["minimum_quantity"]:
+        alerts[AlertType.LOW_STOCK] = (
+            f"{supply['name']} is low on stock: {supply['current_quantity']:f} {supply['unit_of_measure']} "
+            f"left, minimum {supply['minimum_quantity']:f}"
+        )
+    expiration_date = supply["expiration_date"]
+    if expiration_date is not None and expiration_date < today:
+        alerts[AlertType.EXPIRED] = f"{supply['name']} expired on {expiration_date}"
+    elif expiration_date is not None and expiration_date <= today + timedelta(days=EXPIRING_SOON_DAYS):
+        alerts[AlertType.EXPIRING] = f"{supply['name']} expires on {expiration_date}"
+    return alerts
+
+async def evaluate_supply_alerts(
+    supply_ids: Sequence[int],
+    alert_types: Sequence[AlertType] = EVALUATED_ALERT_TYPES,
+    today: Optional[date] = None
+) -> Tuple[int, int]:
+    # Opens missing alerts and resolves ones whose condition has cleared, for the given supplies only.
+    # An alert stays open (even once acknowledged) until resolved, so each supply has at most one per type.
+    if not supply_ids:
+        return 0, 0
+    today = today or date.today()
+    supplies = await Supply.filter(id__in=list(supply_ids)).values(
+        "id", "name", "status", "current_quantity", "minimum_quantity", "unit_of_measure",
+        "expiration_date", "department_id"
+    )
+    open_alerts = await InventoryAlert.filter(
+        supply_id__in=list(supply_ids), alert_type__in=list(alert_types), resolved_at__isnull=True
+    ).values("id", "supply_id", "alert_type")
+    existing = {(alert["supply_id"], alert["alert_type"]): alert["id"] for alert in open_alerts}
+
+    to_open = []
+    keep = set()
+    for supply in supplies:
+        for alert_type, message in desired_alerts(supply, today).items():
+            if alert_type not in alert_types:
+                continue
+            if (supply["id"], alert_type) in existing:
+                keep.add(existing[(supply["id"], alert_type)])
+            else:
+                to_open.append(InventoryAlert(
+                    supply_id=supply["id"],
+                    alert_type=alert_type,
+                    message=message,
+                    department_id=supply["department_id"],
+                ))
+    to_resolve = [alert_id for alert_id in existing.values() if alert_id not in keep]
+
+    if to_resolve:
+        await InventoryAlert.filter(id__in=to_resolve).update(is_active=False, resolved_at=timezone.now())
+    if to_open:
+        await InventoryAlert.bulk_create(to_open)
+    return len(to_open), len(to_resolve)
+
+def with_open_alert(query: QuerySet, alert_types: Sequence[AlertType]) -> QuerySet:
+    # Narrows a Supply query through the indexed set of open alerts instead of re-checking every row
+    return query.filter(id__in=Subquery(
+        InventoryAlert.filter(alert_type__in=list(alert_types), resolved_at__isnull=True).values("supply_id")
+    ))
+
+async def sweep_supply_ids(today: Optional[date] = None) -> List[int]:
+    # Supplies whose alerts may need to change without a stock movement: expiry dates coming into
+    # range, stock already short (e.g. rows loaded directly), and every open alert
+    today = today or date.today()
+    horizon = today + timedelta(days=EXPIRING_SOON_DAYS)
+    expiring = await Supply.filter(expiration_date__lte=horizon).values_list("id", flat=True)
+    short = await Supply.annotate(
+        headroom=F("current_quantity") - F("minimum_quantity")
+    ).filter(headroom__lte=0).values_list("id", flat=True)
+    alerted = await InventoryAlert.filter(
+        alert_type__in=list(EVALUATED_ALERT_TYPES), resolved_at__isnull=True
+    ).values_list("supply_id", flat=True)
+    return sorted(set(expiring) | set(short) | set(alerted))
+
+async def apply_transactions(transactions: List[InventoryTransactionCreate]) -> List[InventoryTransaction_Pydantic]:
+    # All lines succeed or none do. Stock moves through conditional updates, so concurrent issues
+    # can never take a supply below zero or overwrite each other's counts.
+    deltas = [stock_delta(transaction) for transaction in transactions]
+    supply_ids = sorted({transaction.supply_id for transaction in transactions})
+    now = timezone.now()
+
+    async with in_transaction("default"):
+        found = set(await Supply.filter(id__in=supply_ids).values_list("id", flat=True))
+        missing = [supply_id for supply_id in supply_ids if supply_id not in found]
+        if missing:
+            raise SupplyNotFound(missing)
+
+        # Net change per supply, applied in id order so concurrent batches lock rows in the same order
+        net: Dict[int, Decimal] = {}
+        for transaction, delta in zip(transactions, deltas):
+            net[transaction.supply_id] = net.get(transaction.supply_id, Decimal(0)) + delta
+        for supply_id in supply_ids:
+            delta = net[supply_id]
+            query = Supply.filter(id=supply_id)
+            if delta < 0:
+                # Compared as an expression so SQLite, which stores decimals as text, compares numbers
+                query = query.annotate(remaining=F("current_quantity") + delta).filter(remaining__gte=0)
+            if not await query.update(current_quantity=F("current_quantity") + delta):
+                raise InsufficientQuantity(supply_id)
+
+        created = []
+        for transaction in transactions:
+            created.append(await InventoryTransaction.create(
+                **{**transaction.dict(), "transaction_date": transaction.transaction_date or now}
+            ))
+        await refresh_supply_status(supply_ids)
+    return [await InventoryTransaction_Pydantic.from_tortoise_orm(transaction) for transaction in created]
+
+async def issue_for_study(study_id: int, issue: StudySupplyIssue) -> Optional[List[InventoryTransaction_Pydantic]]:
+    # Every supply used in a procedure, checked with one read and applied as one batch
+    study = await Study.filter(id=study_id).values("id", "room__department_id")
+    if not study:
+        return None
+
+    supply_ids = {item.supply_id for item in issue.items}
+    supplies = {
+        supply["id"]: supply
+        for supply in await Supply.filter(id__in=list(supply_ids)).values(
+            "id", "status", "expiration_date", "current_quantity"
+        )
+    }
+    requested: Dict[int, Decimal] = {}
+    for item in issue.items:
+        requested[item.supply_id] = requested.get(item.supply_id, Decimal(0)) + item.quantity
+
+    problems = []
+    today = date.today()
+    for supply_id, quantity in requested.items():
+        supply = supplies.get(supply_id)
+        if supply is None:
+            problems.append({"supply_id": supply_id, "error": "Supply not found"})
+        elif supply["status"] == SupplyStatus.DISCONTINUED:
+            problems.append({"supply_id": supply_id, "error": "Supply is discontinued"})
+        elif supply["expiration_date"] is not None and supply["expiration_date"] < today:
+            problems.append({"supply_id": supply_id, "error": "Supply has expired"})
+        elif supply["current_quantity"] < quantity:
+            problems.append({"supply_id": supply_id, "error": "Insufficient quantity"})
+    if problems:
+        raise IssueRejected(problems)
+
+    department_id = issue.department_id or study[0]["room__department_id"]
+    return await apply_transactions([
+        InventoryTransactionCreate(
+            supply_id=item.supply_id,
+            transaction_type=TransactionType.ISSUED,
+            quantity=item.quantity,
+            transaction_date=issue.transaction_date,
+            reference_number=issue.reference_number,
+            study_id=study_id,
+            notes=item.notes,
+            performed_by_id=issue.performed_by_id,
+            department_id=department_id,
+        )
+        for item in issue.items
+    ])
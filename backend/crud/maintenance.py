@@ -1,6 +1,8 @@
 from typing import List, Optional
 from backend.models.tortoise_models import MaintenanceRecord, MaintenanceRecord_Pydantic, MaintenanceRecordIn_Pydantic
 from tortoise.exceptions import DoesNotExist
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
 from datetime import date
 
 async def create_maintenance_record(maintenance: MaintenanceRecordIn_Pydantic) -> MaintenanceRecord_Pydantic:
@@ -20,7 +22,8 @@ async def get_all_maintenance_records(
     equipment_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    after: Optional[str] = None
 ) -> List[MaintenanceRecord_Pydantic]:
     query = MaintenanceRecord.all()
     
@@ -33,8 +36,7 @@ async def get_all_maintenance_records(
     if end_date:
         query = query.filter(date__lte=end_date)
     
-    maintenance_records = await query.offset(skip).limit(limit)
-    return [await MaintenanceRecord_Pydantic.from_tortoise_orm(m) for m in maintenance_records]
+    return await serialize_queryset(MaintenanceRecord_Pydantic, paginate(query, skip, limit, after))
 
 async def update_maintenance_record(
     maintenance_id: int,
@@ -54,17 +56,15 @@ async def delete_maintenance_record(maintenance_id: int) -> bool:
         return False
 
 async def get_equipment_maintenance_history(equipment_id: int) -> List[MaintenanceRecord_Pydantic]:
-    maintenance_records = await MaintenanceRecord.filter(equipment_id=equipment_id).order_by('-date')
-    return [await MaintenanceRecord_Pydantic.from_tortoise_orm(m) for m in maintenance_records]
+    return await serialize_queryset(MaintenanceRecord_Pydantic, MaintenanceRecord.filter(equipment_id=equipment_id).order_by('-date'))
 
 async def get_upcoming_maintenance() -> List[MaintenanceRecord_Pydantic]:
     today = date.today()
-    maintenance_records = await MaintenanceRecord.filter(
+    maintenance_records = MaintenanceRecord.filter(
         next_maintenance_date__gte=today,
         status='scheduled'
     ).order_by('next_maintenance_date')
-    return [await MaintenanceRecord_Pydantic.from_tortoise_orm(m) for m in maintenance_records]
+    return await serialize_queryset(MaintenanceRecord_Pydantic, maintenance_records)
 
 async def get_maintenance_by_status(status: str) -> List[MaintenanceRecord_Pydantic]:
-    maintenance_records = await MaintenanceRecord.filter(status=status)
-    return [await MaintenanceRecord_Pydantic.from_tortoise_orm(m) for m in maintenance_records] 
\ No newline at end of file
+    return await serialize_queryset(MaintenanceRecord_Pydantic, MaintenanceRecord.filter(status=status)) 
\ No newline at end of file
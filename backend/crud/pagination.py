@@ -0,0 +1,71 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+DEFAULT_CURSOR_KEYS = ("created_at", "id")
+DEFAULT_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, model, keys: Sequence[str] = DEFAULT_CURSOR_KEYS) -> List[Any]:
+    # Anything that does not decode to one valid value per key is the client's error, not ours
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort keys")
+        decoded = []
+        for key, value in zip(keys, values):
+            field = model._meta.fields_map[key.lstrip("-")]
+            if value is None and not field.null:
+                raise ValueError(f"{key} cannot be null")
+            decoded.append(field.to_python_value(value))
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return decoded
+
+def keyset_filter(keys: Sequence[str], values: Sequence[Any]) -> Q:
+    # (k1, k2) > (v1, v2)  ==  k1 > v1 OR (k1 = v1 AND k2 > v2), flipped for "-key" columns
+    clauses = []
+    for i, key in enumerate(keys):
+        name = key.lstrip("-")
+        operator = "lt" if key.startswith("-") else "gt"
+        equal = {k.lstrip("-"): v for k, v in zip(keys[:i], values[:i])}
+        clauses.append(Q(**equal, **{f"{name}__{operator}": values[i]}))
+    return Q(*clauses, join_type="OR")
+
+def paginate(
+    queryset: QuerySet,
+    skip: int = 0,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    keys: Sequence[str] = DEFAULT_CURSOR_KEYS
+) -> QuerySet:
+    # Offset mode stays the default; passing `after` (empty for the first page) switches to keyset mode
+    if after is None:
+        if skip:
+            queryset = queryset.offset(skip)
+        return queryset.limit(limit) if limit is not None else queryset
+
+    queryset = queryset.order_by(*keys)
+    if after:
+        queryset = queryset.filter(keyset_filter(keys, decode_cursor(after, queryset.model, keys)))
+    return queryset.limit(limit or DEFAULT_PAGE_SIZE)
+
+def set_next_cursor(
+    response: Response,
+    items: List[Any],
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    keys: Sequence[str] = DEFAULT_CURSOR_KEYS
+) -> None:
+    if after is None or not items or len(items) < (limit or DEFAULT_PAGE_SIZE):
+        return
+    last = items[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, key.lstrip("-")) for key in keys])
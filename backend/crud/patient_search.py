@@ -0,0 +1,58 @@
+from datetime import date
+from typing import Dict, List, Optional
+from backend.models.tortoise_models import Patient, Patient_Pydantic, normalize_name
+from backend.crud.serialization import serialize_queryset
+
+NAME_ORDER = ("last_name_search", "first_name_search")
+
+def prefix_range(field: str, prefix: str) -> Dict[str, str]:
+    # field >= "smi" AND field < "smj" walks the index, unlike LIKE '%smi%'
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return {f"{field}__gte": prefix, f"{field}__lt": upper}
+
+async def search_patients(
+    q: Optional[str] = None,
+    date_of_birth: Optional[date] = None,
+    limit: int = 10
+) -> List[Patient_Pydantic]:
+    base = Patient.all()
+    if date_of_birth:
+        base = base.filter(date_of_birth=date_of_birth)
+
+    terms = normalize_name((q or "").replace(",", " ")).split()
+    if not terms:
+        if not date_of_birth:
+            return []
+        queries = [base.order_by(*NAME_ORDER)]
+    elif len(terms) == 1:
+        mrn = q.strip()
+        term = terms[0]
+        queries = [
+            # An exact MRN wins, then MRN prefixes, then name prefixes
+            base.filter(medical_record_number=mrn),
+            base.filter(**prefix_range("medical_record_number", mrn)).order_by("medical_record_number"),
+            base.filter(**prefix_range("last_name_search", term)).order_by(*NAME_ORDER),
+            base.filter(**prefix_range("first_name_search", term)).order_by("first_name_search", "last_name_search"),
+        ]
+    else:
+        # "smith jo", "smith, jo" and "jo smith" all find Jo Smith
+        head, rest = terms[0], " ".join(terms[1:])
+        queries = [
+            base.filter(**prefix_range("last_name_search", head), **prefix_range("first_name_search", rest))
+                .order_by(*NAME_ORDER),
+            base.filter(**prefix_range("first_name_search", head), **prefix_range("last_name_search", rest))
+                .order_by(*NAME_ORDER),
+        ]
+
+    # Each branch is a short index range scan; stop as soon as the list is full
+    seen = set()
+    patients = []
+    for query in queries:
+        for patient in await serialize_queryset(Patient_Pydantic, query.limit(limit)):
+            if patient.id in seen:
+                continue
+            seen.add(patient.id)
+            patients.append(patient)
+            if len(patients) >= limit:
+                return patients
+    return patients
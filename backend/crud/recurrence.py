@@ -0,0 +1,210 @@
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+from backend.models.tortoise_models import ScheduleException
+
+# Subset of RFC 5545 RRULE used for staff rosters, e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;UNTIL=20251231"
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+# Older rows only carry a free-text recurrence_pattern
+LEGACY_PATTERNS = {"daily": "FREQ=DAILY", "weekly": "FREQ=WEEKLY", "monthly": "FREQ=MONTHLY", "yearly": "FREQ=YEARLY"}
+EXCEPTION_FIELDS = ("schedule_id", "original_date", "is_cancelled", "new_date", "start_time", "end_time", "status", "notes")
+# COUNT rules are walked from the first occurrence, so keep them bounded
+MAX_COUNT = 1000
+
+class RecurrenceRule:
+    def __init__(
+        self,
+        freq: str,
+        interval: int = 1,
+        count: Optional[int] = None,
+        until: Optional[date] = None,
+        by_day: Optional[List[int]] = None,
+        by_month_day: Optional[int] = None
+    ):
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.by_day = by_day
+        self.by_month_day = by_month_day
+
+def _number(value: str, part: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{part} must be a whole number")
+
+def parse_rrule(rule: str) -> RecurrenceRule:
+    parts = {}
+    for part in rule.strip().removeprefix("RRULE:").split(";"):
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid recurrence rule part: {part!r}")
+        parts[key.strip().upper()] = value.strip().upper()
+
+    freq = parts.pop("FREQ", None)
+    if freq not in FREQUENCIES:
+        raise ValueError("Recurrence rule needs FREQ=DAILY, WEEKLY, MONTHLY or YEARLY")
+    interval = _number(parts.pop("INTERVAL", "1"), "INTERVAL")
+    count = _number(parts.pop("COUNT"), "COUNT") if "COUNT" in parts else None
+    until = None
+    if "UNTIL" in parts:
+        try:
+            until = datetime.strptime(parts.pop("UNTIL")[:8], "%Y%m%d").date()
+        except ValueError:
+            raise ValueError("UNTIL must be a date such as 20251231")
+    by_day = None
+    if "BYDAY" in parts:
+        try:
+            by_day = sorted({WEEKDAYS[day] for day in parts.pop("BYDAY").split(",")})
+        except KeyError:
+            raise ValueError("BYDAY takes plain weekdays such as MO,WE,FR")
+    by_month_day = _number(parts.pop("BYMONTHDAY"), "BYMONTHDAY") if "BYMONTHDAY" in parts else None
+
+    if parts:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(parts))}")
+    if interval < 1 or (count is not None and not 1 <= count <= MAX_COUNT):
+        raise ValueError(f"INTERVAL must be positive and COUNT between 1 and {MAX_COUNT}")
+    if by_day is not None and freq != "WEEKLY":
+        raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+    if by_month_day is not None and (freq != "MONTHLY" or not 1 <= by_month_day <= 31):
+        raise ValueError("BYMONTHDAY must be 1-31 and is only supported with FREQ=MONTHLY")
+    return RecurrenceRule(freq, interval, count, until, by_day, by_month_day)
+
+def schedule_rule(recurrence_rule: Optional[str], recurrence_pattern: Optional[str] = None) -> Optional[RecurrenceRule]:
+    if recurrence_rule:
+        return parse_rrule(recurrence_rule)
+    legacy = LEGACY_PATTERNS.get((recurrence_pattern or "").strip().lower())
+    return parse_rrule(legacy) if legacy else None
+
+def _add_months(start: date, months: int, day: int) -> Optional[date]:
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    month += 1
+    # Months without that day are skipped, as RFC 5545 does
+    if day > calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, day)
+
+def _periods(dtstart: date, rule: RecurrenceRule, skip: int) -> Iterator[Tuple[date, List[date]]]:
+    # Yields (period start, candidate dates) for each period, starting `skip` periods after the first
+    k = skip
+    if rule.freq == "DAILY":
+        while True:
+            day = dtstart + timedelta(days=k * rule.interval)
+            yield day, [day]
+            k += 1
+    elif rule.freq == "WEEKLY":
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        weekdays = rule.by_day or [dtstart.weekday()]
+        while True:
+            week = week_start + timedelta(weeks=k * rule.interval)
+            yield week, [week + timedelta(days=weekday) for weekday in weekdays]
+            k += 1
+    elif rule.freq == "MONTHLY":
+        day = rule.by_month_day or dtstart.day
+        first = dtstart.replace(day=1)
+        while True:
+            occurrence = _add_months(first, k * rule.interval, day)
+            yield _add_months(first, k * rule.interval, 1), [occurrence] if occurrence else []
+            k += 1
+    else:
+        while True:
+            year = dtstart.year + k * rule.interval
+            if dtstart.month == 2 and dtstart.day == 29 and not calendar.isleap(year):
+                yield date(year, 1, 1), []
+            else:
+                yield date(year, 1, 1), [dtstart.replace(year=year)]
+            k += 1
+
+def _periods_before(dtstart: date, rule: RecurrenceRule, window_start: date) -> int:
+    # Whole periods that end before the window; only safe to skip when nothing is being counted
+    if rule.count is not None or window_start <= dtstart:
+        return 0
+    days = (window_start - dtstart).days
+    if rule.freq == "DAILY":
+        return days // rule.interval
+    if rule.freq == "WEEKLY":
+        return max(((window_start - (dtstart - timedelta(days=dtstart.weekday()))).days // 7) // rule.interval, 0)
+    if rule.freq == "MONTHLY":
+        months = (window_start.year - dtstart.year) * 12 + window_start.month - dtstart.month
+        return max(months // rule.interval - 1, 0)
+    return max((window_start.year - dtstart.year) // rule.interval - 1, 0)
+
+def occurrences(dtstart: date, rule: RecurrenceRule, window_start: date, window_end: date) -> Iterator[date]:
+    # Lazily yields occurrence dates within [window_start, window_end]; nothing before dtstart counts
+    last = min(window_end, rule.until) if rule.until else window_end
+    produced = 0
+    for period_start, period in _periods(dtstart, rule, _periods_before(dtstart, rule, window_start)):
+        if period_start > last:
+            return
+        for day in period:
+            if day < dtstart:
+                continue
+            if day > last:
+                return
+            produced += 1
+            if day >= window_start:
+                yield day
+            if rule.count is not None and produced >= rule.count:
+                return
+
+def last_occurrence(dtstart: date, rule: RecurrenceRule) -> Optional[date]:
+    # Used to bound a series in the database; None means it never ends
+    if rule.count is None:
+        return rule.until
+    end = rule.until or date.max - timedelta(days=366)
+    result = None
+    for day in occurrences(dtstart, rule, dtstart, end):
+        result = day
+    return result
+
+def expand_series(
+    series: List[Dict],
+    exceptions: List[Dict],
+    window_start: date,
+    window_end: date
+) -> List[Tuple[Dict, date]]:
+    # Turns series rows into (row, occurrence date) pairs, applying cancellations and overrides.
+    # Exceptions should cover occurrences originally in the window and ones moved into it.
+    by_occurrence = {(e["schedule_id"], e["original_date"]): e for e in exceptions}
+    expanded = []
+    for row in series:
+        rule = schedule_rule(row.get("recurrence_rule"), row.get("recurrence_pattern"))
+        if rule is None:
+            # Flagged as recurring without a rule we understand; it stays a single schedule
+            if window_start <= row["date"] <= window_end:
+                expanded.append((row, row["date"]))
+            continue
+        for day in occurrences(row["date"], rule, window_start, window_end):
+            if (row["id"], day) not in by_occurrence:
+                expanded.append((row, day))
+
+    rows = {row["id"]: row for row in series}
+    for exception in exceptions:
+        row = rows.get(exception["schedule_id"])
+        day = exception["new_date"] or exception["original_date"]
+        if row is None or exception["is_cancelled"] or not window_start <= day <= window_end:
+            continue
+        overrides = {k: exception[k] for k in ("start_time", "end_time", "status", "notes") if exception[k] is not None}
+        expanded.append(({**row, **overrides}, day))
+    return expanded
+
+async def load_occurrences(query: QuerySet, window_start: date, window_end: date, *fields: str) -> List[Tuple[Dict, date]]:
+    # Series rows from `query` that can reach the window, expanded in memory with their exceptions
+    series = await query.filter(
+        Q(recurrence_end__isnull=True) | Q(recurrence_end__gte=window_start),
+        is_recurring=True,
+        date__lte=window_end,
+    ).values(*{"id", "date", "recurrence_rule", "recurrence_pattern", *fields})
+    if not series:
+        return []
+    exceptions = await ScheduleException.filter(
+        Q(original_date__gte=window_start, original_date__lte=window_end)
+        | Q(new_date__gte=window_start, new_date__lte=window_end),
+        schedule_id__in=[row["id"] for row in series],
+    ).values(*EXCEPTION_FIELDS)
+    return expand_series(series, exceptions, window_start, window_end)
@@ -1,10 +1,17 @@
 from typing import List, Optional
 from backend.models.tortoise_models import Report, Report_Pydantic, ReportIn_Pydantic
 from tortoise.exceptions import DoesNotExist
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
+from backend.crud.filters import date_range
+from backend.crud.report_search import index_report
+from backend.crud.worklist import refresh_worklist
 from datetime import date, datetime
 
 async def create_report(report: ReportIn_Pydantic) -> Report_Pydantic:
     report_obj = await Report.create(**report.dict(exclude_unset=True))
+    await index_report(report_obj.id)
+    await refresh_worklist([report_obj.study_id])
     return await Report_Pydantic.from_tortoise_orm(report_obj)
 
 async def get_report(report_id: int) -> Optional[Report_Pydantic]:
@@ -22,7 +29,8 @@ async def get_all_reports(
     radiologist_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    after: Optional[str] = None
 ) -> List[Report_Pydantic]:
     query = Report.all()
     
@@ -34,24 +42,27 @@ async def get_all_reports(
         query = query.filter(radiologist_id=radiologist_id)
     if status:
         query = query.filter(status=status)
-    if start_date:
-        query = query.filter(created_at__gte=start_date)
-    if end_date:
-        query = query.filter(created_at__lte=end_date)
+    query = query.filter(**date_range("created_at", start_date, end_date))
     
-    reports = await query.offset(skip).limit(limit)
-    return [await Report_Pydantic.from_tortoise_orm(r) for r in reports]
+    return await serialize_queryset(Report_Pydantic, paginate(query, skip, limit, after))
 
 async def update_report(report_id: int, report: ReportIn_Pydantic) -> Optional[Report_Pydantic]:
     try:
+        # The report may move to another study, so both are refreshed
+        study_ids = await Report.filter(id=report_id).values_list("study_id", flat=True)
         await Report.filter(id=report_id).update(**report.dict(exclude_unset=True))
+        await index_report(report_id)
+        await refresh_worklist([*study_ids, *await Report.filter(id=report_id).values_list("study_id", flat=True)])
         return await get_report(report_id)
     except DoesNotExist:
         return None
 
 async def delete_report(report_id: int) -> bool:
     try:
+        study_ids = await Report.filter(id=report_id).values_list("study_id", flat=True)
+        # The search index entry goes with the row (a trigger on SQLite, the row's own column on PostgreSQL)
         await Report.filter(id=report_id).delete()
+        await refresh_worklist(study_ids)
         return True
     except DoesNotExist:
         return False
@@ -64,20 +75,16 @@ async def get_study_report(study_id: int) -> Optional[Report_Pydantic]:
         return None
 
 async def get_patient_reports(patient_id: int) -> List[Report_Pydantic]:
-    reports = await Report.filter(patient_id=patient_id).order_by('-created_at')
-    return [await Report_Pydantic.from_tortoise_orm(r) for r in reports]
+    return await serialize_queryset(Report_Pydantic, Report.filter(patient_id=patient_id).order_by('-created_at'))
 
 async def get_radiologist_reports(radiologist_id: int) -> List[Report_Pydantic]:
-    reports = await Report.filter(radiologist_id=radiologist_id).order_by('-created_at')
-    return [await Report_Pydantic.from_tortoise_orm(r) for r in reports]
+    return await serialize_queryset(Report_Pydantic, Report.filter(radiologist_id=radiologist_id).order_by('-created_at'))
 
 async def get_reports_by_status(status: str) -> List[Report_Pydantic]:
-    reports = await Report.filter(status=status)
-    return [await Report_Pydantic.from_tortoise_orm(r) for r in reports]
+    return await serialize_queryset(Report_Pydantic, Report.filter(status=status))
 
 async def get_critical_findings_reports() -> List[Report_Pydantic]:
-    reports = await Report.filter(critical_findings=True)
-    return [await Report_Pydantic.from_tortoise_orm(r) for r in reports]
+    return await serialize_queryset(Report_Pydantic, Report.filter(critical_findings=True))
 
 async def sign_report(report_id: int, signed_by: str) -> Optional[Report_Pydantic]:
     try:
@@ -86,6 +93,8 @@ async def sign_report(report_id: int, signed_by: str) -> Optional[Report_Pydanti
             signed_at=datetime.now(),
             signed_by=signed_by
         )
+        await index_report(report_id)
+        await refresh_worklist(await Report.filter(id=report_id).values_list("study_id", flat=True))
         return await get_report(report_id)
     except DoesNotExist:
         return None 
\ No newline at end of file
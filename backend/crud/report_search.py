@@ -0,0 +1,148 @@
+import html
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+from backend.models.tortoise_models import Report, Report_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.filters import day_bounds
+
+# Searchable report text, most significant first; the weights rank impression hits above findings, and so on
+SEARCH_COLUMNS = ("impression", "findings", "clinical_indication", "follow_up_recommendations")
+SQLITE_WEIGHTS = (4.0, 2.0, 1.0, 1.0)
+POSTGRES_WEIGHTS = ("A", "B", "C", "C")
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# Snippets are marked up by the database with control characters, then HTML-escaped before the tags go in
+_SENTINEL_START = "\x02"
+_SENTINEL_END = "\x03"
+
+_TERM = re.compile(r"\w+\*?", re.UNICODE)
+
+def _dialect(db) -> str:
+    return db.capabilities.dialect
+
+def _postgres_vector() -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+        for column, weight in zip(SEARCH_COLUMNS, POSTGRES_WEIGHTS)
+    )
+
+async def ensure_report_search_index() -> None:
+    # The index lives outside the ORM models: an FTS5 table on SQLite, a tsvector column with GIN on PostgreSQL
+    db = Report._meta.db
+    if _dialect(db) == "postgres":
+        await db.execute_script(
+            "ALTER TABLE reports ADD COLUMN IF NOT EXISTS search_vector tsvector;"
+            "CREATE INDEX IF NOT EXISTS idx_reports_search_vector ON reports USING GIN (search_vector);"
+        )
+        await db.execute_query(f"UPDATE reports SET search_vector = {_postgres_vector()} WHERE search_vector IS NULL")
+        return
+
+    await db.execute_script(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS report_search USING fts5("
+        f"{', '.join(SEARCH_COLUMNS)}, tokenize='porter unicode61');"
+    )
+    # Reports deleted by a cascade from their study or patient leave the index too
+    await db.execute_script(
+        "CREATE TRIGGER IF NOT EXISTS report_search_delete AFTER DELETE ON reports "
+        "BEGIN DELETE FROM report_search WHERE rowid = old.id; END;"
+    )
+    # Backfill reports written before the index existed, and drop entries for reports deleted before the trigger
+    await db.execute_query(
+        f"INSERT INTO report_search(rowid, {', '.join(SEARCH_COLUMNS)}) "
+        f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM reports "
+        f"WHERE id NOT IN (SELECT rowid FROM report_search)"
+    )
+    await db.execute_query("DELETE FROM report_search WHERE rowid NOT IN (SELECT id FROM reports)")
+
+async def index_report(report_id: int) -> None:
+    db = Report._meta.db
+    if _dialect(db) == "postgres":
+        await db.execute_query(f"UPDATE reports SET search_vector = {_postgres_vector()} WHERE id = $1", [report_id])
+        return
+    await db.execute_query("DELETE FROM report_search WHERE rowid = ?", [report_id])
+    await db.execute_query(
+        f"INSERT INTO report_search(rowid, {', '.join(SEARCH_COLUMNS)}) "
+        f"SELECT id, {', '.join(SEARCH_COLUMNS)} FROM reports WHERE id = ?",
+        [report_id]
+    )
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    # Report text is untrusted; only the highlight tags are markup
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_SENTINEL_START, HIGHLIGHT_START).replace(_SENTINEL_END, HIGHLIGHT_END)
+
+def _fts5_query(text: str) -> str:
+    # Every word must match; a trailing * keeps its prefix meaning, anything else FTS5 would parse is dropped
+    terms = []
+    for term in _TERM.findall(text):
+        word = term.rstrip("*")
+        terms.append(f'"{word}"*' if term.endswith("*") else f'"{word}"')
+    return " ".join(terms)
+
+async def search_reports(
+    text: str,
+    skip: int = 0,
+    limit: int = 20,
+    status: Optional[str] = None,
+    radiologist_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> List[Dict[str, Any]]:
+    db = Report._choose_db()
+    postgres = _dialect(db) == "postgres"
+    params: List[Any] = []
+
+    def param(value: Any) -> str:
+        params.append(value)
+        return f"${len(params)}" if postgres else "?"
+
+    if postgres:
+        query = param(text)
+        options = param(f"StartSel={_SENTINEL_START}, StopSel={_SENTINEL_END}, MaxFragments=3, MaxWords=20, MinWords=5")
+        sql = (
+            f"SELECT r.id, ts_rank_cd(r.search_vector, q) AS score, "
+            f"ts_headline('english', concat_ws(' ... ', {', '.join('r.' + c for c in SEARCH_COLUMNS)}), q, {options}) AS snippet "
+            f"FROM reports r, websearch_to_tsquery('english', {query}) q "
+            f"WHERE r.search_vector @@ q"
+        )
+    else:
+        match = _fts5_query(text)
+        if not match:
+            return []
+        weights = ", ".join(str(w) for w in SQLITE_WEIGHTS)
+        sql = (
+            f"SELECT r.id, -bm25(report_search, {weights}) AS score, "
+            f"snippet(report_search, -1, {param(_SENTINEL_START)}, {param(_SENTINEL_END)}, ' ... ', 20) AS snippet "
+            f"FROM report_search JOIN reports r ON r.id = report_search.rowid "
+            f"WHERE report_search MATCH {param(match)}"
+        )
+
+    if status:
+        sql += f" AND r.status = {param(status)}"
+    if radiologist_id:
+        sql += f" AND r.radiologist_id = {param(radiologist_id)}"
+    if patient_id:
+        sql += f" AND r.patient_id = {param(patient_id)}"
+    since, until = day_bounds(start_date, end_date)
+    if since:
+        sql += f" AND r.created_at >= {param(since)}"
+    if until:
+        sql += f" AND r.created_at < {param(until)}"
+    sql += f" ORDER BY score DESC, r.id DESC LIMIT {param(limit)} OFFSET {param(skip)}"
+
+    rows = await db.execute_query_dict(sql, params)
+    if not rows:
+        return []
+
+    reports = {
+        report.id: report
+        for report in await serialize_queryset(Report_Pydantic, Report.filter(id__in=[row["id"] for row in rows]))
+    }
+    return [
+        {"report": reports[row["id"]], "rank": row["score"], "snippet": _highlight(row["snippet"])}
+        for row in rows
+        if row["id"] in reports
+    ]
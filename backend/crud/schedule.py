@@ -1,13 +1,35 @@
 from typing import List, Optional
-from backend.models.tortoise_models import Schedule, Schedule_Pydantic, ScheduleIn_Pydantic
+from backend.models.tortoise_models import (
+    Schedule, Schedule_Pydantic, ScheduleException, ScheduleException_Pydantic
+)
 from tortoise.exceptions import DoesNotExist
-from datetime import date, time, datetime
-from tortoise.expressions import Q
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
+from backend.crud.recurrence import schedule_rule, occurrences, last_occurrence, load_occurrences
+from backend.schemas.schedule import ScheduleCreate, ScheduleExceptionCreate
+from datetime import date
+from tortoise.transactions import in_transaction
 
-async def create_schedule(schedule: ScheduleIn_Pydantic) -> Schedule_Pydantic:
-    schedule_obj = await Schedule.create(**schedule.dict(exclude_unset=True))
+def schedule_values(schedule: ScheduleCreate) -> dict:
+    # A recurring schedule is stored once; recurrence_end bounds which range queries have to expand it.
+    # Raises ValueError for a rule that cannot be expanded.
+    values = schedule.dict(exclude_unset=True)
+    rule = schedule_rule(schedule.recurrence_rule, schedule.recurrence_pattern)
+    if rule is not None:
+        values["is_recurring"] = True
+    values["recurrence_end"] = last_occurrence(schedule.date, rule) if rule is not None else None
+    return values
+
+async def create_schedule(schedule: ScheduleCreate) -> Schedule_Pydantic:
+    schedule_obj = await Schedule.create(**schedule_values(schedule))
     return await Schedule_Pydantic.from_tortoise_orm(schedule_obj)
 
+async def create_schedules(schedules: List[ScheduleCreate]) -> int:
+    rows = [Schedule(**schedule_values(schedule)) for schedule in schedules]
+    async with in_transaction("default"):
+        await Schedule.bulk_create(rows)
+    return len(schedules)
+
 async def get_schedule(schedule_id: int) -> Optional[Schedule_Pydantic]:
     try:
         schedule = await Schedule.get(id=schedule_id)
@@ -22,7 +44,8 @@ async def get_all_schedules(
     department_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
-    end_date: Optional[date] = None
+    end_date: Optional[date] = None,
+    after: Optional[str] = None
 ) -> List[Schedule_Pydantic]:
     query = Schedule.all()
     
@@ -37,15 +60,31 @@ async def get_all_schedules(
     if end_date:
         query = query.filter(date__lte=end_date)
     
-    schedules = await query.offset(skip).limit(limit)
-    return [await Schedule_Pydantic.from_tortoise_orm(s) for s in schedules]
+    return await serialize_queryset(Schedule_Pydantic, paginate(query, skip, limit, after))
 
-async def update_schedule(schedule_id: int, schedule: ScheduleIn_Pydantic) -> Optional[Schedule_Pydantic]:
-    try:
-        await Schedule.filter(id=schedule_id).update(**schedule.dict(exclude_unset=True))
-        return await get_schedule(schedule_id)
-    except DoesNotExist:
+async def merge_schedule(schedule_id: int, schedule: ScheduleCreate) -> Optional[ScheduleCreate]:
+    # The row an update would leave: fields the request leaves out keep their stored values
+    stored = await Schedule.get_or_none(id=schedule_id)
+    if stored is None:
+        return None
+    values = {field: getattr(stored, field) for field in ScheduleCreate.model_fields}
+    return ScheduleCreate(**{**values, **schedule.dict(exclude_unset=True)})
+
+async def update_schedule(schedule_id: int, schedule: ScheduleCreate) -> Optional[Schedule_Pydantic]:
+    merged = await merge_schedule(schedule_id, schedule)
+    if merged is None:
         return None
+    await Schedule.filter(id=schedule_id).update(**schedule_values(merged))
+    # Exceptions for occurrences the resulting rule no longer produces are dropped
+    rule = schedule_rule(merged.recurrence_rule, merged.recurrence_pattern)
+    exceptions = await ScheduleException.filter(schedule_id=schedule_id).values("id", "original_date")
+    stale = [
+        e["id"] for e in exceptions
+        if rule is None or not any(occurrences(merged.date, rule, e["original_date"], e["original_date"]))
+    ]
+    if stale:
+        await ScheduleException.filter(id__in=stale).delete()
+    return await get_schedule(schedule_id)
 
 async def delete_schedule(schedule_id: int) -> bool:
     try:
@@ -55,41 +94,61 @@ async def delete_schedule(schedule_id: int) -> bool:
         return False
 
 async def get_user_schedules(user_id: int) -> List[Schedule_Pydantic]:
-    schedules = await Schedule.filter(user_id=user_id).order_by('date', 'start_time')
-    return [await Schedule_Pydantic.from_tortoise_orm(s) for s in schedules]
+    return await serialize_queryset(Schedule_Pydantic, Schedule.filter(user_id=user_id).order_by('date', 'start_time'))
 
 async def get_department_schedules(department_id: int) -> List[Schedule_Pydantic]:
-    schedules = await Schedule.filter(department_id=department_id).order_by('date', 'start_time')
-    return [await Schedule_Pydantic.from_tortoise_orm(s) for s in schedules]
+    return await serialize_queryset(Schedule_Pydantic, Schedule.filter(department_id=department_id).order_by('date', 'start_time'))
 
-async def get_schedules_by_date_range(start_date: date, end_date: date) -> List[Schedule_Pydantic]:
-    schedules = await Schedule.filter(
-        date__gte=start_date,
-        date__lte=end_date
-    ).order_by('date', 'start_time')
-    return [await Schedule_Pydantic.from_tortoise_orm(s) for s in schedules]
+async def get_schedules_by_date_range(
+    start_date: date,
+    end_date: date,
+    user_id: Optional[int] = None,
+    department_id: Optional[int] = None
+) -> List[Schedule_Pydantic]:
+    query = Schedule.all()
+    if user_id:
+        query = query.filter(user_id=user_id)
+    if department_id:
+        query = query.filter(department_id=department_id)
+
+    # One-off schedules come straight from the table, recurring ones are expanded for just this window
+    schedules = await serialize_queryset(
+        Schedule_Pydantic,
+        query.filter(is_recurring=False, date__gte=start_date, date__lte=end_date)
+    )
+    for row, day in await load_occurrences(query, start_date, end_date, *Schedule_Pydantic.model_fields):
+        schedules.append(Schedule_Pydantic.model_validate({**row, "date": day}))
+    schedules.sort(key=lambda s: (s.date, s.start_time.replace(tzinfo=None), s.id))
+    return schedules
 
 async def get_schedules_by_status(status: str) -> List[Schedule_Pydantic]:
-    schedules = await Schedule.filter(status=status).order_by('date', 'start_time')
-    return [await Schedule_Pydantic.from_tortoise_orm(s) for s in schedules]
-
-async def check_schedule_conflict(
-    user_id: int,
-    date: date,
-    start_time: time,
-    end_time: time,
-    exclude_schedule_id: Optional[int] = None
-) -> bool:
-    query = Schedule.filter(
-        user_id=user_id,
-        date=date
-    ).filter(
-        Q(start_time__lte=start_time, end_time__gt=start_time) |
-        Q(start_time__lt=end_time, end_time__gte=end_time) |
-        Q(start_time__gte=start_time, end_time__lte=end_time)
+    return await serialize_queryset(Schedule_Pydantic, Schedule.filter(status=status).order_by('date', 'start_time'))
+
+async def get_schedule_exceptions(schedule_id: int) -> List[ScheduleException_Pydantic]:
+    return await serialize_queryset(
+        ScheduleException_Pydantic,
+        ScheduleException.filter(schedule_id=schedule_id).order_by('original_date')
     )
-    
-    if exclude_schedule_id:
-        query = query.exclude(id=exclude_schedule_id)
-    
-    return await query.exists() 
\ No newline at end of file
+
+async def create_schedule_exception(
+    schedule_id: int,
+    exception: ScheduleExceptionCreate
+) -> Optional[ScheduleException_Pydantic]:
+    schedule = await Schedule.get_or_none(id=schedule_id)
+    if schedule is None:
+        return None
+    rule = schedule_rule(schedule.recurrence_rule, schedule.recurrence_pattern)
+    if rule is None or not any(occurrences(schedule.date, rule, exception.original_date, exception.original_date)):
+        raise ValueError(f"{exception.original_date} is not an occurrence of this schedule")
+
+    # One exception per occurrence; posting again replaces it
+    exception_obj, _ = await ScheduleException.update_or_create(
+        defaults=exception.dict(exclude={"original_date"}),
+        schedule_id=schedule_id,
+        original_date=exception.original_date,
+    )
+    return await ScheduleException_Pydantic.from_tortoise_orm(exception_obj)
+
+async def delete_schedule_exception(schedule_id: int, exception_id: int) -> bool:
+    deleted = await ScheduleException.filter(id=exception_id, schedule_id=schedule_id).delete()
+    return deleted > 0
@@ -0,0 +1,121 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from tortoise.expressions import Q
+from backend.models.tortoise_models import Schedule, ScheduleStatus
+from backend.schemas.schedule import ScheduleCreate, ScheduleConflict, ScheduleConflictResult
+from backend.crud.recurrence import schedule_rule, occurrences, load_occurrences
+
+# Resources a schedule can hold, as (name, column)
+RESOURCES = (("user", "user_id"), ("room", "room_id"), ("equipment", "equipment_id"))
+# No shift lasts a full day, which bounds how early an overlapping interval can start
+MAX_SHIFT = timedelta(days=1)
+# Recurring proposals are checked this far ahead of their first occurrence
+RECURRENCE_HORIZON = timedelta(days=365)
+
+def schedule_interval(day: date, start_time: time, end_time: time) -> Tuple[datetime, datetime]:
+    # Wall-clock times; the ORM may hand them back tz-aware. An end at or before the start runs past midnight
+    start = datetime.combine(day, start_time.replace(tzinfo=None))
+    end = datetime.combine(day, end_time.replace(tzinfo=None))
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
+class IntervalIndex:
+    # Half-open [start, end) intervals kept sorted by start, one list per resource
+    def __init__(self):
+        self._intervals: Dict[Tuple[str, int], list] = defaultdict(list)
+
+    def add(self, key: Tuple[str, int], start: datetime, end: datetime, ref: tuple) -> None:
+        insort(self._intervals[key], (start, end, ref))
+
+    def overlapping(self, key: Tuple[str, int], start: datetime, end: datetime) -> List[tuple]:
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return []
+        lo = bisect_left(intervals, (start - MAX_SHIFT,))
+        hi = bisect_left(intervals, (end,))
+        return [ref for _, interval_end, ref in intervals[lo:hi] if interval_end > start]
+
+def _proposal_days(proposal: ScheduleCreate) -> List[date]:
+    rule = schedule_rule(proposal.recurrence_rule, proposal.recurrence_pattern)
+    if rule is None:
+        return [proposal.date]
+    return list(occurrences(proposal.date, rule, proposal.date, proposal.date + RECURRENCE_HORIZON))
+
+def _resource_keys(values) -> Iterable[Tuple[str, int]]:
+    for name, column in RESOURCES:
+        resource_id = values[column] if isinstance(values, dict) else getattr(values, column)
+        if resource_id is not None:
+            yield name, resource_id
+
+async def find_schedule_conflicts(
+    proposals: Sequence[ScheduleCreate],
+    exclude_schedule_ids: Sequence[int] = ()
+) -> List[ScheduleConflictResult]:
+    active = [(i, p) for i, p in enumerate(proposals) if p.status != ScheduleStatus.CANCELLED]
+    if not active:
+        return []
+
+    # Stored schedules that could touch the batch are loaded for all of its resources at once,
+    # with recurring series expanded over the same window
+    resource_filters = []
+    for _, column in RESOURCES:
+        ids = {getattr(p, column) for _, p in active if getattr(p, column) is not None}
+        if ids:
+            resource_filters.append(Q(**{f"{column}__in": ids}))
+    proposal_days = {i: _proposal_days(p) for i, p in active}
+    days = [day for ds in proposal_days.values() for day in ds]
+    if not days:
+        return []
+    window_start = min(days) - timedelta(days=1)
+    window_end = max(days) + timedelta(days=1)
+    query = Schedule.filter(Q(*resource_filters, join_type="OR"))
+    if exclude_schedule_ids:
+        query = query.exclude(id__in=list(exclude_schedule_ids))
+    fields = ("id", "date", "start_time", "end_time", "status", *(column for _, column in RESOURCES))
+    rows = await query.filter(
+        is_recurring=False,
+        date__gte=window_start,
+        date__lte=window_end,
+    ).exclude(status=ScheduleStatus.CANCELLED).values(*fields)
+    occurrences_in_window = [(row, row["date"]) for row in rows]
+    occurrences_in_window += await load_occurrences(query, window_start, window_end, *fields)
+
+    index = IntervalIndex()
+    for row, day in occurrences_in_window:
+        if row["status"] == ScheduleStatus.CANCELLED:
+            continue
+        start, end = schedule_interval(day, row["start_time"], row["end_time"])
+        for key in _resource_keys(row):
+            index.add(key, start, end, ("schedule", row["id"]))
+
+    # Each proposal is checked against stored schedules and the proposals before it
+    results = []
+    for i, proposal in active:
+        conflicts = {}
+        for day in proposal_days[i]:
+            start, end = schedule_interval(day, proposal.start_time, proposal.end_time)
+            for key in _resource_keys(proposal):
+                for kind, ref_id in index.overlapping(key, start, end):
+                    conflicts.setdefault((key, kind, ref_id), ScheduleConflict(
+                        resource=key[0],
+                        resource_id=key[1],
+                        schedule_id=ref_id if kind == "schedule" else None,
+                        proposal_index=ref_id if kind == "proposal" else None,
+                    ))
+        for day in proposal_days[i]:
+            start, end = schedule_interval(day, proposal.start_time, proposal.end_time)
+            for key in _resource_keys(proposal):
+                index.add(key, start, end, ("proposal", i))
+        if conflicts:
+            results.append(ScheduleConflictResult(index=i, conflicts=list(conflicts.values())))
+    return results
+
+async def check_schedule_conflict(
+    schedule: ScheduleCreate,
+    exclude_schedule_id: Optional[int] = None
+) -> List[ScheduleConflict]:
+    results = await find_schedule_conflicts([schedule], [exclude_schedule_id] if exclude_schedule_id else ())
+    return results[0].conflicts if results else []
@@ -0,0 +1,15 @@
+from typing import List, Type
+from tortoise.contrib.pydantic import PydanticModel
+from tortoise.queryset import QuerySet
+
+async def serialize_queryset(pydantic_model: Type[PydanticModel], queryset: QuerySet) -> List[PydanticModel]:
+    orig_model = pydantic_model.model_config["orig_model"]
+    field_names = list(pydantic_model.model_fields)
+
+    # Relations need model instances, so let tortoise prefetch them once for the whole page
+    if any(name in orig_model._meta.fetch_fields for name in field_names):
+        return await pydantic_model.from_queryset(queryset)
+
+    # Plain columns only: fetch the page as rows and validate them in a single pass
+    rows = await queryset.values(*field_names)
+    return [pydantic_model.model_validate(row) for row in rows]
@@ -0,0 +1,233 @@
+import math
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+from tortoise import timezone
+from tortoise.expressions import Q
+from backend.models.tortoise_models import (
+    Appointment, AppointmentStatus, Equipment, EquipmentStatus, MaintenanceRecord, MaintenanceStatus,
+    RoomStatus, Schedule, ScheduleStatus, Study, StudyStatus
+)
+from backend.crud.recurrence import load_occurrences
+from backend.crud.schedule_conflicts import schedule_interval
+from backend.schemas.appointment import AvailableSlot
+
+# Availability is tracked as one bit per 5 minutes, one int per resource per day
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+# Offered start times are aligned to this many minutes
+SLOT_STEP_MINUTES = 15
+STEP_MASK = sum(1 << i for i in range(0, SLOTS_PER_DAY, SLOT_STEP_MINUTES // SLOT_MINUTES))
+# Length assumed for appointments and studies that do not record one
+DEFAULT_DURATION_MINUTES = 30
+
+BOOKABLE_ROOM_STATUSES = (RoomStatus.AVAILABLE, RoomStatus.OCCUPIED)
+ACTIVE_STUDY_STATUSES = (StudyStatus.SCHEDULED, StudyStatus.IN_PROGRESS)
+BLOCKING_MAINTENANCE_STATUSES = (MaintenanceStatus.SCHEDULED, MaintenanceStatus.IN_PROGRESS)
+# Staff on these entries are unavailable even where another entry puts them on shift
+OFF_DUTY_STATUSES = (ScheduleStatus.ON_LEAVE, ScheduleStatus.BREAK)
+SCHEDULE_FIELDS = ("id", "user_id", "date", "start_time", "end_time", "status", "room_id", "equipment_id", "department_id")
+
+def wall_clock(value: datetime) -> datetime:
+    # Shifts are wall-clock times in the configured time zone; stored bookings are instants
+    return timezone.make_naive(value) if timezone.is_aware(value) else value
+
+class DayBitmaps:
+    # Slot bitmaps keyed by (resource, day); bit i covers minutes [5i, 5i + 5)
+    def __init__(self):
+        self.bits: Dict[Tuple[tuple, date], int] = defaultdict(int)
+
+    def mark(self, key: tuple, start: datetime, end: datetime) -> None:
+        # Partly covered slots count as covered; intervals past midnight carry into the next day
+        start, end = wall_clock(start), wall_clock(end)
+        day = start.date()
+        while datetime.combine(day, time.min) < end:
+            day_start = datetime.combine(day, time.min)
+            first = max(math.floor((start - day_start).total_seconds() / 60 / SLOT_MINUTES), 0)
+            last = min(math.ceil((end - day_start).total_seconds() / 60 / SLOT_MINUTES), SLOTS_PER_DAY)
+            if last > first:
+                self.bits[(key, day)] |= ((1 << (last - first)) - 1) << first
+            day += timedelta(days=1)
+
+    def mark_day(self, key: tuple, day: date) -> None:
+        self.bits[(key, day)] = FULL_DAY
+
+    def get(self, key: tuple, day: date) -> int:
+        return self.bits.get((key, day), 0)
+
+def fitting_starts(free: int, length: int) -> int:
+    # Bit i stays set when slots i .. i + length - 1 are all free; doubles the span each step
+    fits, span = free, 1
+    while span < length:
+        step = min(span, length - span)
+        fits &= fits >> step
+        span += step
+    return fits
+
+def _gap_around(free: int, first: int, length: int) -> int:
+    # Free slots left on either side of a booking at `first`, the smaller of the two
+    busy = (FULL_DAY & ~free) | (1 << SLOTS_PER_DAY)
+    after = busy >> (first + length)
+    after = (after & -after).bit_length() - 1
+    before = first - (busy & ((1 << first) - 1)).bit_length()
+    return min(before, after)
+
+async def _staff_bitmaps(
+    equipment: List[dict],
+    window_start: date,
+    window_end: date
+) -> Dict[Tuple[int, date], Dict[int, int]]:
+    # Available bits per user for each (equipment, day). A shift covers its equipment, its room,
+    # or its whole department when it names neither; leave and breaks are taken out.
+    coverage = (
+        Q(equipment_id__in=[eq["id"] for eq in equipment])
+        | Q(room_id__in=list({eq["room_id"] for eq in equipment}))
+        | Q(room_id__isnull=True, equipment_id__isnull=True,
+            department_id__in=list({eq["room__department_id"] for eq in equipment}))
+    )
+    # Night shifts from the day before can run into the window
+    first_day = window_start - timedelta(days=1)
+
+    async def occurrences_for(query):
+        rows = await query.filter(is_recurring=False, date__gte=first_day, date__lte=window_end).values(*SCHEDULE_FIELDS)
+        return [(row, row["date"]) for row in rows] + await load_occurrences(query, first_day, window_end, *SCHEDULE_FIELDS)
+
+    on_duty = DayBitmaps()
+    users = set()
+    for row, day in await occurrences_for(Schedule.filter(coverage)):
+        if row["status"] != ScheduleStatus.SCHEDULED:
+            continue
+        if row["equipment_id"] is not None:
+            target = ("equipment", row["equipment_id"])
+        elif row["room_id"] is not None:
+            target = ("room", row["room_id"])
+        else:
+            target = ("department", row["department_id"])
+        on_duty.mark((row["user_id"], target), *schedule_interval(day, row["start_time"], row["end_time"]))
+        users.add(row["user_id"])
+
+    off_duty = DayBitmaps()
+    if users:
+        for row, day in await occurrences_for(Schedule.filter(user_id__in=list(users))):
+            if row["status"] in OFF_DUTY_STATUSES:
+                off_duty.mark(row["user_id"], *schedule_interval(day, row["start_time"], row["end_time"]))
+
+    targets = defaultdict(list)
+    for eq in equipment:
+        for target in (("equipment", eq["id"]), ("room", eq["room_id"]), ("department", eq["room__department_id"])):
+            targets[target].append(eq["id"])
+    staff: Dict[Tuple[int, date], Dict[int, int]] = defaultdict(dict)
+    for ((user_id, target), day), bits in on_duty.bits.items():
+        available = bits & ~off_duty.get(user_id, day)
+        for eq_id in targets[target]:
+            users_on = staff[(eq_id, day)]
+            users_on[user_id] = users_on.get(user_id, 0) | available
+    return staff
+
+async def _busy_bitmaps(equipment: List[dict], window_start: date, window_end: date) -> DayBitmaps:
+    equipment_ids = [eq["id"] for eq in equipment]
+    room_ids = list({eq["room_id"] for eq in equipment})
+    uses_resource = Q(equipment_id__in=equipment_ids) | Q(room_id__in=room_ids)
+    since = timezone.make_aware(datetime.combine(window_start - timedelta(days=1), time.min))
+    until = timezone.make_aware(datetime.combine(window_end + timedelta(days=1), time.min))
+
+    busy = DayBitmaps()
+    appointments = await Appointment.filter(
+        uses_resource, scheduled_time__gte=since, scheduled_time__lt=until
+    ).exclude(status=AppointmentStatus.CANCELLED).values("room_id", "equipment_id", "scheduled_time", "duration_minutes")
+    studies = await Study.filter(
+        uses_resource, status__in=ACTIVE_STUDY_STATUSES, study_date__gte=since, study_date__lt=until
+    ).values("room_id", "equipment_id", scheduled_time="study_date")
+    for booking in (*appointments, *studies):
+        start = booking["scheduled_time"]
+        end = start + timedelta(minutes=booking.get("duration_minutes") or DEFAULT_DURATION_MINUTES)
+        if booking["room_id"] is not None:
+            busy.mark(("room", booking["room_id"]), start, end)
+        if booking["equipment_id"] is not None:
+            busy.mark(("equipment", booking["equipment_id"]), start, end)
+
+    # Planned maintenance takes the equipment out for the whole day
+    maintenance = await MaintenanceRecord.filter(
+        equipment_id__in=equipment_ids,
+        status__in=BLOCKING_MAINTENANCE_STATUSES,
+        date__gte=window_start,
+        date__lte=window_end,
+    ).values("equipment_id", "date")
+    for record in maintenance:
+        busy.mark_day(("equipment", record["equipment_id"]), record["date"])
+    return busy
+
+async def find_available_slots(
+    duration_minutes: int,
+    start_date: date,
+    end_date: date,
+    equipment_type: Optional[str] = None,
+    equipment_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    require_staff: bool = True,
+    limit: int = 10,
+    not_before: Optional[datetime] = None
+) -> List[AvailableSlot]:
+    query = Equipment.filter(status=EquipmentStatus.ACTIVE, room__status__in=BOOKABLE_ROOM_STATUSES)
+    if equipment_type:
+        query = query.filter(type__iexact=equipment_type)
+    if equipment_id:
+        query = query.filter(id=equipment_id)
+    if department_id:
+        query = query.filter(room__department_id=department_id)
+    equipment = await query.order_by("id").values("id", "room_id", "next_calibration_date", "room__department_id")
+    if not equipment:
+        return []
+
+    busy = await _busy_bitmaps(equipment, start_date, end_date)
+    staff_by_day = await _staff_bitmaps(equipment, start_date, end_date) if require_staff else {}
+    length = math.ceil(duration_minutes / SLOT_MINUTES)
+    not_before = wall_clock(not_before or timezone.now())
+
+    # Days are searched in order, so the first days that yield enough slots settle the answer
+    slots = []
+    day = start_date
+    while day <= end_date and len(slots) < limit:
+        day_start = datetime.combine(day, time.min)
+        day_mask = FULL_DAY
+        if not_before > day_start:
+            day_mask &= FULL_DAY << math.ceil((not_before - day_start).total_seconds() / 60 / SLOT_MINUTES)
+
+        candidates = []
+        for eq in equipment:
+            # Equipment past its calibration date is not offered
+            if eq["next_calibration_date"] is not None and eq["next_calibration_date"] < day:
+                continue
+            free = day_mask & ~busy.get(("room", eq["room_id"]), day) & ~busy.get(("equipment", eq["id"]), day)
+            staff = staff_by_day.get((eq["id"], day), {})
+            if require_staff:
+                # One person has to cover the whole slot; shifts of different staff are not stitched together
+                starts = reduce(or_, (fitting_starts(free & bits, length) for bits in staff.values()), 0)
+                free &= reduce(or_, staff.values(), 0)
+            else:
+                starts = fitting_starts(free, length)
+
+            starts &= STEP_MASK
+            while starts:
+                lowest = starts & -starts
+                first = lowest.bit_length() - 1
+                starts ^= lowest
+                candidates.append((first, _gap_around(free, first, length), eq, staff))
+
+        # Earliest first; at the same time, the machine whose free gap the slot fills most tightly wins
+        candidates.sort(key=lambda c: (c[0], c[1], c[2]["id"]))
+        for first, _, eq, staff in candidates[:limit - len(slots)]:
+            slot_mask = ((1 << length) - 1) << first
+            start = day_start + timedelta(minutes=first * SLOT_MINUTES)
+            slots.append(AvailableSlot(
+                start=timezone.make_aware(start),
+                end=timezone.make_aware(start + timedelta(minutes=duration_minutes)),
+                room_id=eq["room_id"],
+                equipment_id=eq["id"],
+                staff_ids=sorted(user_id for user_id, bits in staff.items() if bits & slot_mask == slot_mask),
+            ))
+        day += timedelta(days=1)
+    return slots
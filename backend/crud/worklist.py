@@ -0,0 +1,125 @@
+from typing import Iterable, List, Optional
+from tortoise.transactions import in_transaction
+from backend.models.tortoise_models import (
+    Report, ReportStatus, Study, StudyStatus, WorklistEntry, WorklistEntry_Pydantic
+)
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate
+
+# Reading order: most urgent first, then oldest
+WORKLIST_KEYS = ("priority_rank", "study_date", "study_id")
+PRIORITY_RANKS = {"stat": 0, "urgent": 1, "high": 2, "normal": 3, "routine": 3, "low": 4}
+DEFAULT_PRIORITY_RANK = PRIORITY_RANKS["normal"]
+# A study is on the worklist once acquired, until its report leaves these statuses
+READABLE_STUDY_STATUSES = (StudyStatus.COMPLETED, StudyStatus.REPORTED)
+OPEN_REPORT_STATUSES = (ReportStatus.DRAFT, ReportStatus.PENDING_REVIEW, ReportStatus.REJECTED)
+REFRESH_BATCH_SIZE = 500
+
+STUDY_FIELDS = {
+    "study_id": "id",
+    "patient_id": "patient_id",
+    "patient_first_name": "patient__first_name",
+    "patient_last_name": "patient__last_name",
+    "medical_record_number": "patient__medical_record_number",
+    "referring_physician_id": "referring_physician_id",
+    "physician_first_name": "referring_physician__first_name",
+    "physician_last_name": "referring_physician__last_name",
+    "room_id": "room_id",
+    "room_name": "room__name",
+    "department_id": "room__department_id",
+    "modality": "equipment__type",
+    "study_type": "study_type",
+    "study_date": "study_date",
+    "study_status": "status",
+    "priority": "priority",
+}
+
+def _entry(study: dict, report: Optional[dict]) -> Optional[WorklistEntry]:
+    if study["study_status"] not in READABLE_STUDY_STATUSES:
+        return None
+    if report is None:
+        # Acquired but nobody has started reading it; a reported study without a report row stays off
+        if study["study_status"] != StudyStatus.COMPLETED:
+            return None
+    elif report["status"] not in OPEN_REPORT_STATUSES:
+        return None
+    priority = (study["priority"] or "normal").lower()
+    return WorklistEntry(
+        study_id=study["study_id"],
+        patient_id=study["patient_id"],
+        patient_name=f"{study['patient_last_name']}, {study['patient_first_name']}",
+        medical_record_number=study["medical_record_number"],
+        referring_physician_id=study["referring_physician_id"],
+        referring_physician_name=f"{study['physician_first_name']} {study['physician_last_name']}",
+        room_id=study["room_id"],
+        room_name=study["room_name"],
+        department_id=study["department_id"],
+        modality=study["modality"].upper(),
+        study_type=study["study_type"],
+        study_date=study["study_date"],
+        study_status=study["study_status"],
+        priority=priority,
+        priority_rank=PRIORITY_RANKS.get(priority, DEFAULT_PRIORITY_RANK),
+        report_id=report["id"] if report else None,
+        report_status=report["status"] if report else None,
+        radiologist_id=report["radiologist_id"] if report else None,
+        critical_findings=report["critical_findings"] if report else False,
+    )
+
+async def refresh_worklist(study_ids: Iterable[int]) -> None:
+    # Recomputes the entries for these studies in one read of studies and one of reports
+    study_ids = sorted(set(study_ids))
+    for i in range(0, len(study_ids), REFRESH_BATCH_SIZE):
+        batch = study_ids[i:i + REFRESH_BATCH_SIZE]
+        studies = await Study.filter(id__in=batch).values(**STUDY_FIELDS)
+        # The latest report of a study is the one being worked on
+        reports = {}
+        for report in await Report.filter(study_id__in=batch).order_by("id").values(
+            "id", "study_id", "status", "radiologist_id", "critical_findings"
+        ):
+            reports[report["study_id"]] = report
+        entries = [entry for entry in (_entry(s, reports.get(s["study_id"])) for s in studies) if entry]
+        async with in_transaction("default"):
+            await WorklistEntry.filter(study_id__in=batch).delete()
+            if entries:
+                await WorklistEntry.bulk_create(entries)
+
+async def refresh_worklist_where(**filters) -> None:
+    # For changes to the patient, physician, room or equipment shown on existing entries
+    await refresh_worklist(await WorklistEntry.filter(**filters).values_list("study_id", flat=True))
+
+async def rebuild_worklist() -> int:
+    # Full pass over every study that can be on the worklist; returns the entries written
+    study_ids = set(await Study.filter(status=StudyStatus.COMPLETED).values_list("id", flat=True))
+    study_ids.update(await Report.filter(status__in=OPEN_REPORT_STATUSES).values_list("study_id", flat=True))
+    study_ids.update(await WorklistEntry.all().values_list("study_id", flat=True))
+    await refresh_worklist(study_ids)
+    return await WorklistEntry.all().count()
+
+async def get_worklist(
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    after: Optional[str] = None,
+    modality: Optional[str] = None,
+    priority: Optional[str] = None,
+    radiologist_id: Optional[int] = None,
+    unassigned: Optional[bool] = None,
+    report_status: Optional[ReportStatus] = None,
+    department_id: Optional[int] = None
+) -> List[WorklistEntry_Pydantic]:
+    query = WorklistEntry.all()
+    if modality:
+        query = query.filter(modality=modality.upper())
+    if priority:
+        query = query.filter(priority=priority.lower())
+    if radiologist_id:
+        query = query.filter(radiologist_id=radiologist_id)
+    if unassigned is not None:
+        query = query.filter(radiologist_id__isnull=unassigned)
+    if report_status:
+        query = query.filter(report_status=report_status)
+    if department_id:
+        query = query.filter(department_id=department_id)
+    if after is None:
+        query = query.order_by(*WORKLIST_KEYS)
+    return await serialize_queryset(WorklistEntry_Pydantic, paginate(query, skip, limit, after, keys=WORKLIST_KEYS))
@@ -1,17 +1,4 @@
-import os
-from dotenv import load_dotenv
-from tortoise import Tortoise
+# Kept for older imports; the single source of database configuration is tortoise_config
+from backend.database.tortoise_config import DB_URL, TORTOISE_ORM, init_db, close_db
 
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-async def init_db():
-    await Tortoise.init(
-        db_url=DATABASE_URL,
-        modules={"models": ["backend.models.tortoise_models"]}
-    )
-    await Tortoise.generate_schemas()
-
-async def close_db():
-    await Tortoise.close_connections() 
\ No newline at end of file
+DATABASE_URL = DB_URL
@@ -0,0 +1,121 @@
+import logging
+from typing import Dict, List, Sequence, Tuple, Type
+from tortoise import Tortoise
+from tortoise.indexes import Index
+from tortoise.models import Model
+
+logger = logging.getLogger(__name__)
+
+# Filter combinations issued by the CRUD layer and routers, keyed by table.
+# Equality columns come first; the last column is the one used for ranges or ordering.
+FILTER_PATHS: Dict[str, List[Tuple[str, ...]]] = {
+    "studies": [
+        ("status",), ("status", "study_date"), ("study_date",),
+        ("patient_id", "study_date"), ("referring_physician_id", "study_date"),
+        ("room_id", "study_date"), ("equipment_id", "study_date"),
+    ],
+    "equipment": [("status",), ("type",), ("room_id",), ("next_calibration_date",), ("serial_number",)],
+    "maintenance_records": [("equipment_id", "date"), ("status", "next_maintenance_date"), ("date",)],
+    "reports": [
+        ("status",), ("status", "created_at"), ("critical_findings",), ("study_id",),
+        ("patient_id", "created_at"), ("radiologist_id", "created_at"), ("created_at",),
+    ],
+    "worklist": [
+        ("priority_rank", "study_date"), ("radiologist_id", "priority_rank", "study_date"),
+        ("modality", "priority_rank", "study_date"), ("department_id", "priority_rank", "study_date"),
+        ("priority", "study_date"), ("patient_id",), ("referring_physician_id",), ("room_id",),
+    ],
+    "schedules": [
+        ("user_id", "date"), ("user_id", "date", "start_time"), ("department_id", "date"),
+        ("room_id", "date"), ("equipment_id", "date"), ("status", "date"), ("date",), ("is_recurring", "date"),
+    ],
+    "schedule_exceptions": [("schedule_id", "original_date"), ("new_date",)],
+    "image_annotations": [
+        ("study_id", "created_at"), ("created_by_id", "created_at"), ("type", "created_at"),
+        ("status", "created_at"), ("is_ai_generated", "created_at"),
+    ],
+    "technologists": [("department_id",), ("specialization",), ("status",)],
+    "insurances": [("patient_id",)],
+    "medical_history": [("patient_id",), ("patient_id", "diagnosis_date")],
+    "allergies": [("patient_id",), ("patient_id", "is_active")],
+    "billings": [("patient_id",), ("patient_id", "is_paid"), ("study_id",), ("billing_date",)],
+    "payments": [("billing_id",), ("status",), ("payment_date",)],
+    "quality_controls": [("status",), ("study_id",), ("equipment_id",), ("report_id",), ("created_at",)],
+    "protocol_templates": [
+        ("is_active",), ("category", "is_active"), ("equipment_type", "is_active"),
+        ("department_id", "is_active"),
+    ],
+    "supplies": [("department_id",), ("category",), ("status",), ("expiration_date",)],
+    "inventory_transactions": [
+        ("supply_id",), ("supply_id", "transaction_date"), ("department_id", "transaction_date"),
+        ("transaction_date",),
+    ],
+    "inventory_alerts": [
+        ("is_active",), ("is_active", "alert_type"), ("supply_id",), ("department_id",),
+        ("supply_id", "alert_type", "resolved_at"), ("alert_type", "resolved_at"),
+        ("alert_type", "resolved_at", "department_id"),
+    ],
+    "audit_logs": [
+        ("created_at",), ("user_id",), ("user_id", "module"), ("user_id", "created_at"),
+        ("module", "created_at"), ("resource_type", "resource_id"),
+    ],
+    "compliance_records": [("status", "due_date"), ("department_id",)],
+    "incident_reports": [("status",), ("department_id",), ("incident_date",)],
+    "documents": [("department_id",), ("category",), ("created_at",), ("expiration_date",), ("checksum",)],
+    "document_versions": [("document_id",), ("checksum",)],
+    "document_shares": [("shared_with_id", "is_active"), ("shared_by_id", "is_active")],
+    "rooms": [("department_id",)],
+    "appointments": [("patient_id", "scheduled_time"), ("room_id", "scheduled_time"), ("equipment_id", "scheduled_time")],
+    "patients": [
+        ("medical_record_number",), ("last_name_search", "first_name_search"),
+        ("first_name_search", "last_name_search"), ("date_of_birth", "last_name_search"), ("date_of_birth",),
+    ],
+    "users": [("email",), ("role",)],
+    "outbound_emails": [("status", "next_attempt_at"), ("status", "locked_until")],
+}
+
+def _column(model: Type[Model], field_name: str) -> str:
+    field = model._meta.fields_map[field_name]
+    return field.source_field or field_name
+
+def model_indexes(model: Type[Model]) -> List[Tuple[str, ...]]:
+    indexes = []
+    for field_name, field in model._meta.fields_map.items():
+        if field_name in model._meta.db_fields and (field.pk or field.unique or field.index):
+            indexes.append((_column(model, field_name),))
+    for together in (*model._meta.unique_together, *model._meta.indexes):
+        field_names = together.fields if isinstance(together, Index) else together
+        indexes.append(tuple(_column(model, name) for name in field_names))
+    return indexes
+
+def supports(index: Sequence[str], path: Sequence[str]) -> bool:
+    # Equality columns may appear in any order, but must lead the index ahead of the range column
+    n = len(path)
+    if len(index) < n:
+        return False
+    return set(index[:n - 1]) == set(path[:-1]) and index[n - 1] == path[-1]
+
+def find_unindexed_filter_paths() -> List[Tuple[str, Tuple[str, ...]]]:
+    models = {
+        model._meta.db_table: model
+        for app in Tortoise.apps.values()
+        for model in app.values()
+    }
+    missing = []
+    for table, paths in FILTER_PATHS.items():
+        model = models.get(table)
+        if model is None:
+            missing.extend((table, path) for path in paths)
+            continue
+        indexes = model_indexes(model)
+        for path in paths:
+            columns = tuple(_column(model, name) if name in model._meta.fields_map else name for name in path)
+            if not any(supports(index, columns) for index in indexes):
+                missing.append((table, path))
+    return missing
+
+def report_unindexed_filter_paths() -> List[Tuple[str, Tuple[str, ...]]]:
+    missing = find_unindexed_filter_paths()
+    for table, path in missing:
+        logger.warning("No index supports filtering %s on (%s)", table, ", ".join(path))
+    return missing
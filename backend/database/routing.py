@@ -0,0 +1,61 @@
+import itertools
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from backend.database.tortoise_config import REPLICA_CONNECTIONS, READ_YOUR_WRITES_WINDOW
+
+READ_PRIMARY_HEADER = "X-Read-Primary"
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Anything outside a read-only request (startup, scripts, mutations) stays on the primary
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+_replicas = itertools.cycle(REPLICA_CONNECTIONS)
+
+class ReplicaRouter:
+    def db_for_read(self, model):
+        if REPLICA_CONNECTIONS and _read_from_replica.get():
+            return next(_replicas)
+        return None
+
+    def db_for_write(self, model):
+        # None falls back to the model's default connection, i.e. the primary
+        return None
+
+def _pinned_to_primary(headers: dict) -> bool:
+    if headers.get(READ_PRIMARY_HEADER.lower().encode()) in (b"1", b"true"):
+        return True
+    cookie = SimpleCookie(headers.get(b"cookie", b"").decode("latin-1"))
+    morsel = cookie.get(READ_PRIMARY_COOKIE)
+    try:
+        return morsel is not None and float(morsel.value) > time.time()
+    except ValueError:
+        return False
+
+# Sends the reads of GET requests to replicas and pins a client to the primary right after it writes
+class ReadReplicaMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REPLICA_CONNECTIONS:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in READ_ONLY_METHODS:
+            token = _read_from_replica.set(not _pinned_to_primary(dict(scope["headers"])))
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _read_from_replica.reset(token)
+            return
+
+        # Give the client a short window in which its own follow-up reads see the write
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + READ_YOUR_WRITES_WINDOW
+                cookie = f"{READ_PRIMARY_COOKIE}={until:.3f}; Max-Age={int(READ_YOUR_WRITES_WINDOW) + 1}; Path=/; HttpOnly"
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,19 +1,88 @@
-from tortoise import Tortoise
+import logging
+import time
+from typing import List
+from aerich.models import Aerich
+from tortoise import Tortoise, connections
+from tortoise.exceptions import OperationalError
+from tortoise.utils import generate_schema_for_client
+from tortoise.backends.base.config_generator import expand_db_url
 from dotenv import load_dotenv
 import os
 from pathlib import Path
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# "development" falls back to the local SQLite file; any other environment requires PostgreSQL
+APP_ENV = os.getenv("APP_ENV", "development")
+
+# Schemas are managed by the aerich migrations in backend/migrations (`aerich upgrade`). Generating tables
+# directly is only for throwaway databases: a database created that way cannot take later migrations.
+GENERATE_SCHEMAS = os.getenv("GENERATE_SCHEMAS", "false").lower() in ("1", "true", "yes")
+MIGRATIONS_DIR = Path(__file__).parent.parent / "migrations" / "models"
+
 # Get the absolute path for the database file
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db.sqlite3")
-DB_URL = f"sqlite://{DB_PATH}"
+SQLITE_URL = f"sqlite://{DB_PATH}"
+
+# Files written at runtime (document blobs, audit spill and archive) default to <repository>/data, outside the package
+DATA_DIR = Path(os.getenv("DATA_DIR", Path(__file__).resolve().parents[2] / "data"))
+
+# asyncpg pool tuning, only applied to PostgreSQL connections
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))
+# Connections are recycled after this many queries or seconds idle
+DB_POOL_MAX_QUERIES = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
+DB_POOL_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", "300"))
+
+# Comma separated read replica URLs; GET requests read from these in turn
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Seconds a client keeps reading from the primary after one of its writes
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
+def _postgres_url() -> str:
+    return "postgres://{user}:{password}@{host}:{port}/{database}".format(
+        user=os.getenv("DATABASE_USER", "postgres"),
+        password=quote(os.getenv("DATABASE_PASSWORD", ""), safe=""),
+        host=os.getenv("DATABASE_HOST", "localhost"),
+        port=os.getenv("DATABASE_PORT", "5432"),
+        database=os.getenv("DATABASE_NAME", "radiology_db"),
+    )
+
+def _resolve_db_url() -> str:
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+    if APP_ENV == "development":
+        return SQLITE_URL
+    return _postgres_url()
+
+def build_connection(url: str) -> dict:
+    connection = expand_db_url(url)
+    if connection["engine"] == "tortoise.backends.asyncpg":
+        connection["credentials"].update({
+            "minsize": DB_POOL_MIN_SIZE,
+            "maxsize": DB_POOL_MAX_SIZE,
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": DB_COMMAND_TIMEOUT,
+            "max_queries": DB_POOL_MAX_QUERIES,
+            "max_inactive_connection_lifetime": DB_POOL_MAX_INACTIVE_LIFETIME,
+        })
+    return connection
+
+DB_URL = _resolve_db_url()
+REPLICA_CONNECTIONS = [f"replica_{i}" for i in range(len(DATABASE_REPLICA_URLS))]
 
 TORTOISE_ORM = {
     "connections": {
-        "default": DB_URL
+        "default": build_connection(DB_URL),
+        **{name: build_connection(url) for name, url in zip(REPLICA_CONNECTIONS, DATABASE_REPLICA_URLS)},
     },
     "apps": {
         "models": {
@@ -21,11 +90,32 @@ TORTOISE_ORM = {
             "default_connection": "default",
         },
     },
+    "routers": ["backend.database.routing.ReplicaRouter"],
 }
 
+async def pending_migrations() -> List[str]:
+    # Migration files aerich has not applied to the default connection, oldest first
+    versions = sorted((path.name for path in MIGRATIONS_DIR.glob("*.py")), key=lambda name: int(name.split("_", 1)[0]))
+    try:
+        applied = set(await Aerich.filter(app="models").values_list("version", flat=True))
+    except OperationalError:
+        applied = set()
+    return [version for version in versions if version not in applied]
+
 async def init_db():
+    started = time.perf_counter()
     await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
+    logger.info("Startup phase orm_init took %.1f ms", (time.perf_counter() - started) * 1000)
+
+    if GENERATE_SCHEMAS:
+        started = time.perf_counter()
+        # Replicas receive the schema through replication
+        await generate_schema_for_client(connections.get("default"), safe=True)
+        logger.info("Startup phase generate_schemas took %.1f ms", (time.perf_counter() - started) * 1000)
+    else:
+        pending = await pending_migrations()
+        if pending:
+            logger.error("Database schema is %d migration(s) behind, up to %s; run `aerich upgrade`", len(pending), pending[-1])
 
 async def close_db():
-    await Tortoise.close_connections() 
\ No newline at end of file
+    await Tortoise.close_connections()
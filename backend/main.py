@@ -1,15 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from tortoise.contrib.fastapi import register_tortoise
-from backend.database.tortoise_config import init_db, close_db, DB_URL
+from fastapi.responses import JSONResponse
+from tortoise.exceptions import DoesNotExist, IntegrityError
+from backend.database.tortoise_config import init_db, close_db
+from backend.crud.pagination import NEXT_CURSOR_HEADER
+from backend.database.indexes import report_unindexed_filter_paths
+from backend.crud.report_search import ensure_report_search_index
+from backend.database.routing import ReadReplicaMiddleware
+from backend.services.passwords import password_hasher
+from backend.services.principals import principal_cache
+from backend.services.mailer import mail_queue
+from backend.services.inventory_alerts import alert_engine
+from backend.services.audit import audit_sink
+from backend.services.audit_archive import audit_archiver
+from backend.services.audit_middleware import AuditMiddleware, audit_routes
+from backend.models.tortoise_models import AuditModule
 from backend.routers import (
     patients, appointments, referring_physicians, studies,
     maintenance, users, auth, rooms, departments, equipment,
     report, schedule, image_annotation, technologists, insurances,
     medical_history, allergies, billing, payment, quality_control, protocol_template,
-    inventory, audit, document
+    inventory, audit, document, worklist
 )
 import os
+import time
+import logging
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -17,6 +32,8 @@ from pathlib import Path
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Radiology Information System API")
 
 # CORS middleware configuration
@@ -33,8 +50,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Read replica routing; a no-op unless DATABASE_REPLICA_URLS is set
+app.add_middleware(ReadReplicaMiddleware)
+
+# Access to patient data is audited automatically; events are queued after the response is sent
+app.add_middleware(AuditMiddleware)
+audit_routes(patients.router, AuditModule.PATIENT, "patient")
+audit_routes(medical_history.router, AuditModule.PATIENT, "medical_history")
+audit_routes(allergies.router, AuditModule.PATIENT, "allergy")
+audit_routes(insurances.router, AuditModule.PATIENT, "insurance")
+audit_routes(studies.router, AuditModule.STUDY, "study")
+audit_routes(report.router, AuditModule.REPORT, "report")
+audit_routes(document.router, AuditModule.DOCUMENT, "document")
+audit_routes(worklist.router, AuditModule.STUDY, "worklist")
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(patients.router)
@@ -60,24 +92,60 @@ app.include_router(protocol_template.router)
 app.include_router(inventory.router)
 app.include_router(audit.router)
 app.include_router(document.router)
+app.include_router(worklist.router)
 
-# Register Tortoise ORM
-register_tortoise(
-    app,
-    db_url=DB_URL,
-    modules={"models": ["backend.models.tortoise_models"]},
-    generate_schemas=True,
-    add_exception_handlers=True,
-)
+# Same responses register_tortoise used to install for ORM errors
+@app.exception_handler(DoesNotExist)
+async def does_not_exist_handler(request: Request, exc: DoesNotExist):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    return JSONResponse(
+        status_code=422,
+        content={"detail": [{"loc": [], "msg": str(exc), "type": "IntegrityError"}]},
+    )
 
 @app.on_event("startup")
 async def startup():
+    started = time.perf_counter()
     await init_db()
 
+    phase_started = time.perf_counter()
+    await ensure_report_search_index()
+    logger.info("Startup phase report_search_index took %.1f ms", (time.perf_counter() - phase_started) * 1000)
+
+    phase_started = time.perf_counter()
+    report_unindexed_filter_paths()
+    logger.info("Startup phase index_check took %.1f ms", (time.perf_counter() - phase_started) * 1000)
+
+    await audit_sink.start()
+    mail_queue.start()
+    alert_engine.start()
+    audit_archiver.start()
+
+    logger.info("Startup complete in %.1f ms", (time.perf_counter() - started) * 1000)
+
 @app.on_event("shutdown")
 async def shutdown():
+    await mail_queue.stop()
+    await alert_engine.stop()
+    await audit_archiver.stop()
+    # Last, so audit events from the other shutdown steps are written too
+    await audit_sink.stop()
     await close_db()
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Radiology Information System API"}
\ No newline at end of file
+    return {"message": "Welcome to Radiology Information System API"}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "password_hashing": password_hasher.stats(),
+        "principal_cache": principal_cache.stats(),
+        "mail_queue": mail_queue.stats(),
+        "inventory_alerts": alert_engine.stats(),
+        "audit": audit_sink.stats(),
+        "audit_archive": audit_archiver.stats(),
+    }
\ No newline at end of file
@@ -0,0 +1,989 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "departments" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(100) NOT NULL UNIQUE,
+    "description" TEXT,
+    "status" VARCHAR(17) NOT NULL  DEFAULT 'active' /* ACTIVE: active\nINACTIVE: inactive\nUNDER_MAINTENANCE: under_maintenance */,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE TABLE IF NOT EXISTS "patients" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "first_name" VARCHAR(100) NOT NULL,
+    "last_name" VARCHAR(100) NOT NULL,
+    "date_of_birth" DATE NOT NULL,
+    "gender" VARCHAR(6) NOT NULL  /* MALE: male\nFEMALE: female\nOTHER: other */,
+    "phone_number" VARCHAR(20),
+    "email" VARCHAR(100)  UNIQUE,
+    "address" TEXT,
+    "medical_record_number" VARCHAR(50) NOT NULL UNIQUE,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE TABLE IF NOT EXISTS "appointments" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "scheduled_time" TIMESTAMP NOT NULL,
+    "type" VARCHAR(12) NOT NULL  /* CONSULTATION: consultation\nSCAN: scan\nFOLLOW_UP: follow_up\nOTHER: other */,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled */,
+    "reason" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "insurances" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "provider_name" VARCHAR(100) NOT NULL,
+    "policy_number" VARCHAR(50) NOT NULL,
+    "group_number" VARCHAR(50),
+    "coverage_type" VARCHAR(50) NOT NULL,
+    "start_date" DATE NOT NULL,
+    "end_date" DATE,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'active' /* ACTIVE: active\nEXPIRED: expired\nCANCELLED: cancelled\nPENDING: pending */,
+    "is_primary" INT NOT NULL  DEFAULT 1,
+    "copay_amount" VARCHAR(40),
+    "deductible_amount" VARCHAR(40),
+    "coverage_percentage" INT,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "referring_physicians" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "first_name" VARCHAR(50) NOT NULL,
+    "last_name" VARCHAR(50) NOT NULL,
+    "specialization" VARCHAR(100) NOT NULL,
+    "contact_number" VARCHAR(20),
+    "email" VARCHAR(100)  UNIQUE,
+    "address" TEXT,
+    "hospital_affiliation" VARCHAR(100),
+    "license_number" VARCHAR(50) NOT NULL UNIQUE,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE TABLE IF NOT EXISTS "rooms" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(100) NOT NULL,
+    "capacity" INT NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'available' /* AVAILABLE: available\nOCCUPIED: occupied\nMAINTENANCE: maintenance\nINACTIVE: inactive */,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "equipment" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(100) NOT NULL,
+    "type" VARCHAR(50) NOT NULL,
+    "model" VARCHAR(100) NOT NULL,
+    "serial_number" VARCHAR(100) NOT NULL UNIQUE,
+    "purchase_date" DATE NOT NULL,
+    "warranty_expiry" DATE NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'active' /* ACTIVE: active\nMAINTENANCE: maintenance\nREPAIR: repair\nRETIRED: retired\nRESERVED: reserved */,
+    "manufacturer" VARCHAR(100),
+    "installation_date" DATE,
+    "last_calibration_date" DATE,
+    "next_calibration_date" DATE,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "room_id" INT NOT NULL REFERENCES "rooms" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "maintenance_records" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "description" TEXT NOT NULL,
+    "performed_by" VARCHAR(100) NOT NULL,
+    "cost" VARCHAR(40) NOT NULL,
+    "date" DATE NOT NULL,
+    "last_maintenance_date" DATE NOT NULL,
+    "next_maintenance_date" DATE NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nFAILED: failed */,
+    "maintenance_type" VARCHAR(50) NOT NULL,
+    "parts_replaced" TEXT,
+    "technician_notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "equipment_id" INT NOT NULL REFERENCES "equipment" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "studies" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "study_date" TIMESTAMP NOT NULL,
+    "study_type" VARCHAR(100) NOT NULL,
+    "priority" VARCHAR(20) NOT NULL  DEFAULT 'normal',
+    "notes" TEXT,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nREPORTED: reported */,
+    "report" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "equipment_id" INT NOT NULL REFERENCES "equipment" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "referring_physician_id" INT NOT NULL REFERENCES "referring_physicians" ("id") ON DELETE CASCADE,
+    "room_id" INT NOT NULL REFERENCES "rooms" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "technologists" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "first_name" VARCHAR(100) NOT NULL,
+    "last_name" VARCHAR(100) NOT NULL,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "role" VARCHAR(50) NOT NULL,
+    "specialization" VARCHAR(100) NOT NULL,
+    "npi" VARCHAR(50)  UNIQUE,
+    "license" VARCHAR(50) NOT NULL UNIQUE,
+    "profile_pic" TEXT,
+    "affiliation" VARCHAR(100) NOT NULL,
+    "years_of_experience" INT NOT NULL,
+    "status" VARCHAR(10) NOT NULL  DEFAULT 'active' /* ACTIVE: active\nINACTIVE: inactive\nON_LEAVE: on_leave\nTERMINATED: terminated */,
+    "phone_number" VARCHAR(20),
+    "address" TEXT,
+    "certifications" JSON,
+    "shift_preference" VARCHAR(50),
+    "emergency_contact" JSON,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_login" TIMESTAMP,
+    "notes" TEXT,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "users" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(255) NOT NULL,
+    "email" VARCHAR(255) NOT NULL UNIQUE,
+    "password_hash" VARCHAR(255) NOT NULL,
+    "role" VARCHAR(19) NOT NULL  /* ADMIN: admin\nRADIOLOGIST: radiologist\nTECHNICIAN: technician\nRECEPTIONIST: receptionist\nREFERRING_PHYSICIAN: referring_physician */,
+    "phone" VARCHAR(20),
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_login" TIMESTAMP,
+    "department" VARCHAR(100),
+    "specialization" VARCHAR(100),
+    "license_number" VARCHAR(50)
+);
+        CREATE TABLE IF NOT EXISTS "allergies" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "allergen" VARCHAR(100) NOT NULL,
+    "reaction" TEXT NOT NULL,
+    "severity" VARCHAR(16) NOT NULL  DEFAULT 'moderate' /* MILD: mild\nMODERATE: moderate\nSEVERE: severe\nLIFE_THREATENING: life_threatening */,
+    "onset_date" DATE,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_reaction_date" DATE,
+    "treatment" TEXT,
+    "cross_reactions" JSON,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "reported_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "audit_logs" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "action" VARCHAR(8) NOT NULL  /* CREATE: create\nREAD: read\nUPDATE: update\nDELETE: delete\nLOGIN: login\nLOGOUT: logout\nEXPORT: export\nIMPORT: import\nAPPROVE: approve\nREJECT: reject\nSHARE: share\nDOWNLOAD: download\nPRINT: print */,
+    "module" VARCHAR(9) NOT NULL  /* PATIENT: patient\nSTUDY: study\nREPORT: report\nUSER: user\nEQUIPMENT: equipment\nINVENTORY: inventory\nBILLING: billing\nSYSTEM: system\nDOCUMENT: document */,
+    "description" TEXT NOT NULL,
+    "ip_address" VARCHAR(50),
+    "user_agent" TEXT,
+    "resource_id" INT,
+    "resource_type" VARCHAR(100),
+    "old_values" JSON,
+    "new_values" JSON,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "billings" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "amount" VARCHAR(40) NOT NULL,
+    "description" TEXT NOT NULL,
+    "billing_date" DATE NOT NULL,
+    "due_date" DATE NOT NULL,
+    "is_paid" INT NOT NULL  DEFAULT 0,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "insurance_id" INT REFERENCES "insurances" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "compliance_records" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT NOT NULL,
+    "regulation" VARCHAR(200) NOT NULL,
+    "requirement" TEXT NOT NULL,
+    "status" VARCHAR(14) NOT NULL  DEFAULT 'pending_review' /* COMPLIANT: compliant\nNON_COMPLIANT: non_compliant\nPENDING_REVIEW: pending_review\nNEEDS_ACTION: needs_action\nEXEMPT: exempt */,
+    "due_date" DATE,
+    "completion_date" DATE,
+    "evidence" JSON,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "assigned_to_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "documents" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT,
+    "category" VARCHAR(11) NOT NULL  /* REPORT: report\nPOLICY: policy\nPROCEDURE: procedure\nFORM: form\nTEMPLATE: template\nCONTRACT: contract\nCERTIFICATE: certificate\nTRAINING: training\nCOMPLIANCE: compliance\nOTHER: other */,
+    "status" VARCHAR(8) NOT NULL  DEFAULT 'draft' /* DRAFT: draft\nREVIEW: review\nAPPROVED: approved\nARCHIVED: archived\nEXPIRED: expired */,
+    "file_path" TEXT NOT NULL,
+    "file_type" VARCHAR(50) NOT NULL,
+    "file_size" INT NOT NULL,
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "expiration_date" DATE,
+    "tags" JSON,
+    "metadata" JSON,
+    "is_public" INT NOT NULL  DEFAULT 0,
+    "access_control" JSON,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "parent_document_id" INT REFERENCES "documents" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "document_shares" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "permission" VARCHAR(20) NOT NULL,
+    "expires_at" TIMESTAMP,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "document_id" INT NOT NULL REFERENCES "documents" ("id") ON DELETE CASCADE,
+    "shared_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "shared_with_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "document_versions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version_number" VARCHAR(20) NOT NULL,
+    "file_path" TEXT NOT NULL,
+    "file_size" INT NOT NULL,
+    "changes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "is_current" INT NOT NULL  DEFAULT 0,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "document_id" INT NOT NULL REFERENCES "documents" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "image_annotations" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "annotation_data" TEXT NOT NULL,
+    "type" VARCHAR(11) NOT NULL  /* MEASUREMENT: measurement\nMARKER: marker\nREGION: region\nTEXT: text\nSHAPE: shape\nCUSTOM: custom */,
+    "status" VARCHAR(8) NOT NULL  DEFAULT 'draft' /* DRAFT: draft\nFINAL: final\nREVIEWED: reviewed\nREJECTED: rejected */,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "reviewed_at" TIMESTAMP,
+    "version" INT NOT NULL  DEFAULT 1,
+    "is_ai_generated" INT NOT NULL  DEFAULT 0,
+    "confidence_score" REAL,
+    "coordinates" JSON,
+    "metadata" JSON,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "reviewed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "incident_reports" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT NOT NULL,
+    "severity" VARCHAR(8) NOT NULL  /* LOW: low\nMEDIUM: medium\nHIGH: high\nCRITICAL: critical */,
+    "status" VARCHAR(19) NOT NULL  DEFAULT 'reported' /* REPORTED: reported\nUNDER_INVESTIGATION: under_investigation\nRESOLVED: resolved\nCLOSED: closed\nREOPENED: reopened */,
+    "incident_date" TIMESTAMP NOT NULL,
+    "resolution_date" TIMESTAMP,
+    "resolution_notes" TEXT,
+    "affected_patients" JSON,
+    "affected_studies" JSON,
+    "corrective_actions" TEXT,
+    "preventive_measures" TEXT,
+    "attachments" JSON,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "assigned_to_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "reported_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "medical_history" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "condition" VARCHAR(200) NOT NULL,
+    "diagnosis_date" DATE NOT NULL,
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'active' /* ACTIVE: active\nRESOLVED: resolved\nCHRONIC: chronic\nIN_REMISSION: in_remission */,
+    "icd_code" VARCHAR(20),
+    "severity" VARCHAR(50),
+    "treatment" TEXT,
+    "medications" JSON,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "diagnosed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "payments" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "amount" VARCHAR(40) NOT NULL,
+    "payment_date" DATE NOT NULL,
+    "payment_method" VARCHAR(14) NOT NULL  /* CASH: cash\nCREDIT_CARD: credit_card\nDEBIT_CARD: debit_card\nINSURANCE: insurance\nBANK_TRANSFER: bank_transfer\nONLINE_PAYMENT: online_payment */,
+    "status" VARCHAR(18) NOT NULL  DEFAULT 'pending' /* PENDING: pending\nCOMPLETED: completed\nFAILED: failed\nREFUNDED: refunded\nPARTIALLY_REFUNDED: partially_refunded */,
+    "transaction_id" VARCHAR(100),
+    "receipt_number" VARCHAR(100),
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "billing_id" INT NOT NULL REFERENCES "billings" ("id") ON DELETE CASCADE,
+    "processed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "protocol_templates" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(200) NOT NULL,
+    "category" VARCHAR(16) NOT NULL  /* CT: ct\nMRI: mri\nXRAY: xray\nULTRASOUND: ultrasound\nNUCLEAR_MEDICINE: nuclear_medicine\nINTERVENTIONAL: interventional\nGENERAL: general */,
+    "description" TEXT NOT NULL,
+    "equipment_type" VARCHAR(100) NOT NULL,
+    "protocol_steps" JSON NOT NULL,
+    "parameters" JSON NOT NULL,
+    "contraindications" TEXT,
+    "preparation_instructions" TEXT,
+    "post_procedure_instructions" TEXT,
+    "estimated_duration" INT,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "attachments" JSON,
+    "notes" TEXT,
+    "quality_requirements" JSON,
+    "radiation_dose" JSON,
+    "safety_guidelines" TEXT,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "reports" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "clinical_indication" TEXT NOT NULL,
+    "findings" TEXT NOT NULL,
+    "impression" TEXT NOT NULL,
+    "status" VARCHAR(14) NOT NULL  DEFAULT 'draft' /* DRAFT: draft\nPENDING_REVIEW: pending_review\nAPPROVED: approved\nREJECTED: rejected\nSIGNED: signed\nAMENDED: amended */,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "signed_at" TIMESTAMP,
+    "signed_by" VARCHAR(100),
+    "is_ai_generated" INT NOT NULL  DEFAULT 0,
+    "pdf_path" TEXT,
+    "template_used" VARCHAR(100),
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "additional_notes" TEXT,
+    "follow_up_recommendations" TEXT,
+    "critical_findings" INT NOT NULL  DEFAULT 0,
+    "report_number" VARCHAR(50) NOT NULL UNIQUE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "radiologist_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "quality_controls" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "type" VARCHAR(10) NOT NULL  /* EQUIPMENT: equipment\nIMAGE: image\nREPORT: report\nPROCEDURE: procedure\nSAFETY: safety\nCOMPLIANCE: compliance */,
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'pending' /* PENDING: pending\nIN_PROGRESS: in_progress\nPASSED: passed\nFAILED: failed\nNEEDS_REVIEW: needs_review\nAPPROVED: approved\nREJECTED: rejected */,
+    "description" TEXT NOT NULL,
+    "findings" TEXT,
+    "corrective_actions" TEXT,
+    "review_date" DATE,
+    "review_notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "due_date" DATE,
+    "priority" VARCHAR(20) NOT NULL  DEFAULT 'normal',
+    "attachments" JSON,
+    "metrics" JSON,
+    "equipment_id" INT REFERENCES "equipment" ("id") ON DELETE CASCADE,
+    "performed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "report_id" INT REFERENCES "reports" ("id") ON DELETE CASCADE,
+    "reviewed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "schedules" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "date" DATE NOT NULL,
+    "start_time" TIME NOT NULL,
+    "end_time" TIME NOT NULL,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled\nON_LEAVE: on_leave\nBREAK: break */,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "notes" TEXT,
+    "is_recurring" INT NOT NULL  DEFAULT 0,
+    "recurrence_pattern" VARCHAR(50),
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "supplies" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "name" VARCHAR(200) NOT NULL,
+    "category" VARCHAR(14) NOT NULL  /* CONTRAST_AGENT: contrast_agent\nMEDICATION: medication\nCONSUMABLE: consumable\nEQUIPMENT_PART: equipment_part\nOTHER: other */,
+    "description" TEXT,
+    "manufacturer" VARCHAR(200),
+    "supplier" VARCHAR(200),
+    "unit_of_measure" VARCHAR(50) NOT NULL,
+    "current_quantity" VARCHAR(40) NOT NULL,
+    "minimum_quantity" VARCHAR(40) NOT NULL,
+    "maximum_quantity" VARCHAR(40) NOT NULL,
+    "unit_price" VARCHAR(40) NOT NULL,
+    "lot_number" VARCHAR(100),
+    "expiration_date" DATE,
+    "storage_location" VARCHAR(200),
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'in_stock' /* IN_STOCK: in_stock\nLOW_STOCK: low_stock\nOUT_OF_STOCK: out_of_stock\nDISCONTINUED: discontinued\nON_ORDER: on_order */,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "inventory_alerts" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "alert_type" VARCHAR(9) NOT NULL  /* LOW_STOCK: low_stock\nEXPIRING: expiring\nEXPIRED: expired\nRECALL: recall\nCUSTOM: custom */,
+    "message" TEXT NOT NULL,
+    "is_active" INT NOT NULL  DEFAULT 1,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "acknowledged_at" TIMESTAMP,
+    "acknowledged_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "supply_id" INT NOT NULL REFERENCES "supplies" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "inventory_transactions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "transaction_type" VARCHAR(8) NOT NULL  /* RECEIVED: received\nISSUED: issued\nADJUSTED: adjusted\nRETURNED: returned\nEXPIRED: expired\nDAMAGED: damaged */,
+    "quantity" VARCHAR(40) NOT NULL,
+    "transaction_date" TIMESTAMP NOT NULL,
+    "reference_number" VARCHAR(100),
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "performed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT REFERENCES "studies" ("id") ON DELETE CASCADE,
+    "supply_id" INT NOT NULL REFERENCES "supplies" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSON NOT NULL
+);"""
+    return """
+        CREATE TABLE IF NOT EXISTS "departments" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL UNIQUE,
+    "description" TEXT,
+    "status" VARCHAR(17) NOT NULL  DEFAULT 'active',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        COMMENT ON COLUMN "departments"."status" IS 'ACTIVE: active\nINACTIVE: inactive\nUNDER_MAINTENANCE: under_maintenance';
+        CREATE TABLE IF NOT EXISTS "patients" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "first_name" VARCHAR(100) NOT NULL,
+    "last_name" VARCHAR(100) NOT NULL,
+    "date_of_birth" DATE NOT NULL,
+    "gender" VARCHAR(6) NOT NULL,
+    "phone_number" VARCHAR(20),
+    "email" VARCHAR(100)  UNIQUE,
+    "address" TEXT,
+    "medical_record_number" VARCHAR(50) NOT NULL UNIQUE,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        COMMENT ON COLUMN "patients"."gender" IS 'MALE: male\nFEMALE: female\nOTHER: other';
+        CREATE TABLE IF NOT EXISTS "appointments" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "scheduled_time" TIMESTAMPTZ NOT NULL,
+    "type" VARCHAR(12) NOT NULL,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled',
+    "reason" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "appointments"."type" IS 'CONSULTATION: consultation\nSCAN: scan\nFOLLOW_UP: follow_up\nOTHER: other';
+        COMMENT ON COLUMN "appointments"."status" IS 'SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled';
+        CREATE TABLE IF NOT EXISTS "insurances" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "provider_name" VARCHAR(100) NOT NULL,
+    "policy_number" VARCHAR(50) NOT NULL,
+    "group_number" VARCHAR(50),
+    "coverage_type" VARCHAR(50) NOT NULL,
+    "start_date" DATE NOT NULL,
+    "end_date" DATE,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'active',
+    "is_primary" BOOL NOT NULL  DEFAULT True,
+    "copay_amount" DECIMAL(10,2),
+    "deductible_amount" DECIMAL(10,2),
+    "coverage_percentage" INT,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "insurances"."status" IS 'ACTIVE: active\nEXPIRED: expired\nCANCELLED: cancelled\nPENDING: pending';
+        CREATE TABLE IF NOT EXISTS "referring_physicians" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "first_name" VARCHAR(50) NOT NULL,
+    "last_name" VARCHAR(50) NOT NULL,
+    "specialization" VARCHAR(100) NOT NULL,
+    "contact_number" VARCHAR(20),
+    "email" VARCHAR(100)  UNIQUE,
+    "address" TEXT,
+    "hospital_affiliation" VARCHAR(100),
+    "license_number" VARCHAR(50) NOT NULL UNIQUE,
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE TABLE IF NOT EXISTS "rooms" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL,
+    "capacity" INT NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'available',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "rooms"."status" IS 'AVAILABLE: available\nOCCUPIED: occupied\nMAINTENANCE: maintenance\nINACTIVE: inactive';
+        CREATE TABLE IF NOT EXISTS "equipment" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(100) NOT NULL,
+    "type" VARCHAR(50) NOT NULL,
+    "model" VARCHAR(100) NOT NULL,
+    "serial_number" VARCHAR(100) NOT NULL UNIQUE,
+    "purchase_date" DATE NOT NULL,
+    "warranty_expiry" DATE NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'active',
+    "manufacturer" VARCHAR(100),
+    "installation_date" DATE,
+    "last_calibration_date" DATE,
+    "next_calibration_date" DATE,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "room_id" INT NOT NULL REFERENCES "rooms" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "equipment"."status" IS 'ACTIVE: active\nMAINTENANCE: maintenance\nREPAIR: repair\nRETIRED: retired\nRESERVED: reserved';
+        CREATE TABLE IF NOT EXISTS "maintenance_records" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "description" TEXT NOT NULL,
+    "performed_by" VARCHAR(100) NOT NULL,
+    "cost" DECIMAL(10,2) NOT NULL,
+    "date" DATE NOT NULL,
+    "last_maintenance_date" DATE NOT NULL,
+    "next_maintenance_date" DATE NOT NULL,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'scheduled',
+    "maintenance_type" VARCHAR(50) NOT NULL,
+    "parts_replaced" TEXT,
+    "technician_notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "equipment_id" INT NOT NULL REFERENCES "equipment" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "maintenance_records"."status" IS 'SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nFAILED: failed';
+        CREATE TABLE IF NOT EXISTS "studies" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "study_date" TIMESTAMPTZ NOT NULL,
+    "study_type" VARCHAR(100) NOT NULL,
+    "priority" VARCHAR(20) NOT NULL  DEFAULT 'normal',
+    "notes" TEXT,
+    "status" VARCHAR(11) NOT NULL  DEFAULT 'scheduled',
+    "report" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "equipment_id" INT NOT NULL REFERENCES "equipment" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "referring_physician_id" INT NOT NULL REFERENCES "referring_physicians" ("id") ON DELETE CASCADE,
+    "room_id" INT NOT NULL REFERENCES "rooms" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "studies"."status" IS 'SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nREPORTED: reported';
+        CREATE TABLE IF NOT EXISTS "technologists" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "first_name" VARCHAR(100) NOT NULL,
+    "last_name" VARCHAR(100) NOT NULL,
+    "email" VARCHAR(100) NOT NULL UNIQUE,
+    "role" VARCHAR(50) NOT NULL,
+    "specialization" VARCHAR(100) NOT NULL,
+    "npi" VARCHAR(50)  UNIQUE,
+    "license" VARCHAR(50) NOT NULL UNIQUE,
+    "profile_pic" TEXT,
+    "affiliation" VARCHAR(100) NOT NULL,
+    "years_of_experience" INT NOT NULL,
+    "status" VARCHAR(10) NOT NULL  DEFAULT 'active',
+    "phone_number" VARCHAR(20),
+    "address" TEXT,
+    "certifications" JSONB,
+    "shift_preference" VARCHAR(50),
+    "emergency_contact" JSONB,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_login" TIMESTAMPTZ,
+    "notes" TEXT,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "technologists"."status" IS 'ACTIVE: active\nINACTIVE: inactive\nON_LEAVE: on_leave\nTERMINATED: terminated';
+        CREATE TABLE IF NOT EXISTS "users" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(255) NOT NULL,
+    "email" VARCHAR(255) NOT NULL UNIQUE,
+    "password_hash" VARCHAR(255) NOT NULL,
+    "role" VARCHAR(19) NOT NULL,
+    "phone" VARCHAR(20),
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_login" TIMESTAMPTZ,
+    "department" VARCHAR(100),
+    "specialization" VARCHAR(100),
+    "license_number" VARCHAR(50)
+);
+        COMMENT ON COLUMN "users"."role" IS 'ADMIN: admin\nRADIOLOGIST: radiologist\nTECHNICIAN: technician\nRECEPTIONIST: receptionist\nREFERRING_PHYSICIAN: referring_physician';
+        CREATE TABLE IF NOT EXISTS "allergies" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "allergen" VARCHAR(100) NOT NULL,
+    "reaction" TEXT NOT NULL,
+    "severity" VARCHAR(16) NOT NULL  DEFAULT 'moderate',
+    "onset_date" DATE,
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "last_reaction_date" DATE,
+    "treatment" TEXT,
+    "cross_reactions" JSONB,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "reported_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "allergies"."severity" IS 'MILD: mild\nMODERATE: moderate\nSEVERE: severe\nLIFE_THREATENING: life_threatening';
+        CREATE TABLE IF NOT EXISTS "audit_logs" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "action" VARCHAR(8) NOT NULL,
+    "module" VARCHAR(9) NOT NULL,
+    "description" TEXT NOT NULL,
+    "ip_address" VARCHAR(50),
+    "user_agent" TEXT,
+    "resource_id" INT,
+    "resource_type" VARCHAR(100),
+    "old_values" JSONB,
+    "new_values" JSONB,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "audit_logs"."action" IS 'CREATE: create\nREAD: read\nUPDATE: update\nDELETE: delete\nLOGIN: login\nLOGOUT: logout\nEXPORT: export\nIMPORT: import\nAPPROVE: approve\nREJECT: reject\nSHARE: share\nDOWNLOAD: download\nPRINT: print';
+        COMMENT ON COLUMN "audit_logs"."module" IS 'PATIENT: patient\nSTUDY: study\nREPORT: report\nUSER: user\nEQUIPMENT: equipment\nINVENTORY: inventory\nBILLING: billing\nSYSTEM: system\nDOCUMENT: document';
+        CREATE TABLE IF NOT EXISTS "billings" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "amount" DECIMAL(10,2) NOT NULL,
+    "description" TEXT NOT NULL,
+    "billing_date" DATE NOT NULL,
+    "due_date" DATE NOT NULL,
+    "is_paid" BOOL NOT NULL  DEFAULT False,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "insurance_id" INT REFERENCES "insurances" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "compliance_records" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT NOT NULL,
+    "regulation" VARCHAR(200) NOT NULL,
+    "requirement" TEXT NOT NULL,
+    "status" VARCHAR(14) NOT NULL  DEFAULT 'pending_review',
+    "due_date" DATE,
+    "completion_date" DATE,
+    "evidence" JSONB,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "assigned_to_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "compliance_records"."status" IS 'COMPLIANT: compliant\nNON_COMPLIANT: non_compliant\nPENDING_REVIEW: pending_review\nNEEDS_ACTION: needs_action\nEXEMPT: exempt';
+        CREATE TABLE IF NOT EXISTS "documents" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT,
+    "category" VARCHAR(11) NOT NULL,
+    "status" VARCHAR(8) NOT NULL  DEFAULT 'draft',
+    "file_path" TEXT NOT NULL,
+    "file_type" VARCHAR(50) NOT NULL,
+    "file_size" INT NOT NULL,
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "expiration_date" DATE,
+    "tags" JSONB,
+    "metadata" JSONB,
+    "is_public" BOOL NOT NULL  DEFAULT False,
+    "access_control" JSONB,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "parent_document_id" INT REFERENCES "documents" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "documents"."category" IS 'REPORT: report\nPOLICY: policy\nPROCEDURE: procedure\nFORM: form\nTEMPLATE: template\nCONTRACT: contract\nCERTIFICATE: certificate\nTRAINING: training\nCOMPLIANCE: compliance\nOTHER: other';
+        COMMENT ON COLUMN "documents"."status" IS 'DRAFT: draft\nREVIEW: review\nAPPROVED: approved\nARCHIVED: archived\nEXPIRED: expired';
+        CREATE TABLE IF NOT EXISTS "document_shares" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "permission" VARCHAR(20) NOT NULL,
+    "expires_at" TIMESTAMPTZ,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "document_id" INT NOT NULL REFERENCES "documents" ("id") ON DELETE CASCADE,
+    "shared_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "shared_with_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "document_versions" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version_number" VARCHAR(20) NOT NULL,
+    "file_path" TEXT NOT NULL,
+    "file_size" INT NOT NULL,
+    "changes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "is_current" BOOL NOT NULL  DEFAULT False,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "document_id" INT NOT NULL REFERENCES "documents" ("id") ON DELETE CASCADE
+);
+        CREATE TABLE IF NOT EXISTS "image_annotations" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "annotation_data" TEXT NOT NULL,
+    "type" VARCHAR(11) NOT NULL,
+    "status" VARCHAR(8) NOT NULL  DEFAULT 'draft',
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "reviewed_at" TIMESTAMPTZ,
+    "version" INT NOT NULL  DEFAULT 1,
+    "is_ai_generated" BOOL NOT NULL  DEFAULT False,
+    "confidence_score" DOUBLE PRECISION,
+    "coordinates" JSONB,
+    "metadata" JSONB,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "reviewed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "image_annotations"."type" IS 'MEASUREMENT: measurement\nMARKER: marker\nREGION: region\nTEXT: text\nSHAPE: shape\nCUSTOM: custom';
+        COMMENT ON COLUMN "image_annotations"."status" IS 'DRAFT: draft\nFINAL: final\nREVIEWED: reviewed\nREJECTED: rejected';
+        CREATE TABLE IF NOT EXISTS "incident_reports" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "title" VARCHAR(200) NOT NULL,
+    "description" TEXT NOT NULL,
+    "severity" VARCHAR(8) NOT NULL,
+    "status" VARCHAR(19) NOT NULL  DEFAULT 'reported',
+    "incident_date" TIMESTAMPTZ NOT NULL,
+    "resolution_date" TIMESTAMPTZ,
+    "resolution_notes" TEXT,
+    "affected_patients" JSONB,
+    "affected_studies" JSONB,
+    "corrective_actions" TEXT,
+    "preventive_measures" TEXT,
+    "attachments" JSONB,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "assigned_to_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "reported_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "incident_reports"."severity" IS 'LOW: low\nMEDIUM: medium\nHIGH: high\nCRITICAL: critical';
+        COMMENT ON COLUMN "incident_reports"."status" IS 'REPORTED: reported\nUNDER_INVESTIGATION: under_investigation\nRESOLVED: resolved\nCLOSED: closed\nREOPENED: reopened';
+        CREATE TABLE IF NOT EXISTS "medical_history" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "condition" VARCHAR(200) NOT NULL,
+    "diagnosis_date" DATE NOT NULL,
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'active',
+    "icd_code" VARCHAR(20),
+    "severity" VARCHAR(50),
+    "treatment" TEXT,
+    "medications" JSONB,
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "diagnosed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "medical_history"."status" IS 'ACTIVE: active\nRESOLVED: resolved\nCHRONIC: chronic\nIN_REMISSION: in_remission';
+        CREATE TABLE IF NOT EXISTS "payments" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "amount" DECIMAL(10,2) NOT NULL,
+    "payment_date" DATE NOT NULL,
+    "payment_method" VARCHAR(14) NOT NULL,
+    "status" VARCHAR(18) NOT NULL  DEFAULT 'pending',
+    "transaction_id" VARCHAR(100),
+    "receipt_number" VARCHAR(100),
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "billing_id" INT NOT NULL REFERENCES "billings" ("id") ON DELETE CASCADE,
+    "processed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "payments"."payment_method" IS 'CASH: cash\nCREDIT_CARD: credit_card\nDEBIT_CARD: debit_card\nINSURANCE: insurance\nBANK_TRANSFER: bank_transfer\nONLINE_PAYMENT: online_payment';
+        COMMENT ON COLUMN "payments"."status" IS 'PENDING: pending\nCOMPLETED: completed\nFAILED: failed\nREFUNDED: refunded\nPARTIALLY_REFUNDED: partially_refunded';
+        CREATE TABLE IF NOT EXISTS "protocol_templates" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(200) NOT NULL,
+    "category" VARCHAR(16) NOT NULL,
+    "description" TEXT NOT NULL,
+    "equipment_type" VARCHAR(100) NOT NULL,
+    "protocol_steps" JSONB NOT NULL,
+    "parameters" JSONB NOT NULL,
+    "contraindications" TEXT,
+    "preparation_instructions" TEXT,
+    "post_procedure_instructions" TEXT,
+    "estimated_duration" INT,
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "attachments" JSONB,
+    "notes" TEXT,
+    "quality_requirements" JSONB,
+    "radiation_dose" JSONB,
+    "safety_guidelines" TEXT,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "protocol_templates"."category" IS 'CT: ct\nMRI: mri\nXRAY: xray\nULTRASOUND: ultrasound\nNUCLEAR_MEDICINE: nuclear_medicine\nINTERVENTIONAL: interventional\nGENERAL: general';
+        CREATE TABLE IF NOT EXISTS "reports" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "clinical_indication" TEXT NOT NULL,
+    "findings" TEXT NOT NULL,
+    "impression" TEXT NOT NULL,
+    "status" VARCHAR(14) NOT NULL  DEFAULT 'draft',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "signed_at" TIMESTAMPTZ,
+    "signed_by" VARCHAR(100),
+    "is_ai_generated" BOOL NOT NULL  DEFAULT False,
+    "pdf_path" TEXT,
+    "template_used" VARCHAR(100),
+    "version" VARCHAR(20) NOT NULL  DEFAULT '1.0',
+    "additional_notes" TEXT,
+    "follow_up_recommendations" TEXT,
+    "critical_findings" BOOL NOT NULL  DEFAULT False,
+    "report_number" VARCHAR(50) NOT NULL UNIQUE,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE,
+    "radiologist_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT NOT NULL REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "reports"."status" IS 'DRAFT: draft\nPENDING_REVIEW: pending_review\nAPPROVED: approved\nREJECTED: rejected\nSIGNED: signed\nAMENDED: amended';
+        CREATE TABLE IF NOT EXISTS "quality_controls" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "type" VARCHAR(10) NOT NULL,
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'pending',
+    "description" TEXT NOT NULL,
+    "findings" TEXT,
+    "corrective_actions" TEXT,
+    "review_date" DATE,
+    "review_notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "due_date" DATE,
+    "priority" VARCHAR(20) NOT NULL  DEFAULT 'normal',
+    "attachments" JSONB,
+    "metrics" JSONB,
+    "equipment_id" INT REFERENCES "equipment" ("id") ON DELETE CASCADE,
+    "performed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "report_id" INT REFERENCES "reports" ("id") ON DELETE CASCADE,
+    "reviewed_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "quality_controls"."type" IS 'EQUIPMENT: equipment\nIMAGE: image\nREPORT: report\nPROCEDURE: procedure\nSAFETY: safety\nCOMPLIANCE: compliance';
+        COMMENT ON COLUMN "quality_controls"."status" IS 'PENDING: pending\nIN_PROGRESS: in_progress\nPASSED: passed\nFAILED: failed\nNEEDS_REVIEW: needs_review\nAPPROVED: approved\nREJECTED: rejected';
+        CREATE TABLE IF NOT EXISTS "schedules" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "date" DATE NOT NULL,
+    "start_time" TIMETZ NOT NULL,
+    "end_time" TIMETZ NOT NULL,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled',
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "notes" TEXT,
+    "is_recurring" BOOL NOT NULL  DEFAULT False,
+    "recurrence_pattern" VARCHAR(50),
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "schedules"."status" IS 'SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled\nON_LEAVE: on_leave\nBREAK: break';
+        CREATE TABLE IF NOT EXISTS "supplies" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "name" VARCHAR(200) NOT NULL,
+    "category" VARCHAR(14) NOT NULL,
+    "description" TEXT,
+    "manufacturer" VARCHAR(200),
+    "supplier" VARCHAR(200),
+    "unit_of_measure" VARCHAR(50) NOT NULL,
+    "current_quantity" DECIMAL(10,2) NOT NULL,
+    "minimum_quantity" DECIMAL(10,2) NOT NULL,
+    "maximum_quantity" DECIMAL(10,2) NOT NULL,
+    "unit_price" DECIMAL(10,2) NOT NULL,
+    "lot_number" VARCHAR(100),
+    "expiration_date" DATE,
+    "storage_location" VARCHAR(200),
+    "status" VARCHAR(12) NOT NULL  DEFAULT 'in_stock',
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "created_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "updated_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "supplies"."category" IS 'CONTRAST_AGENT: contrast_agent\nMEDICATION: medication\nCONSUMABLE: consumable\nEQUIPMENT_PART: equipment_part\nOTHER: other';
+        COMMENT ON COLUMN "supplies"."status" IS 'IN_STOCK: in_stock\nLOW_STOCK: low_stock\nOUT_OF_STOCK: out_of_stock\nDISCONTINUED: discontinued\nON_ORDER: on_order';
+        CREATE TABLE IF NOT EXISTS "inventory_alerts" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "alert_type" VARCHAR(9) NOT NULL,
+    "message" TEXT NOT NULL,
+    "is_active" BOOL NOT NULL  DEFAULT True,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "acknowledged_at" TIMESTAMPTZ,
+    "acknowledged_by_id" INT REFERENCES "users" ("id") ON DELETE CASCADE,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "supply_id" INT NOT NULL REFERENCES "supplies" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "inventory_alerts"."alert_type" IS 'LOW_STOCK: low_stock\nEXPIRING: expiring\nEXPIRED: expired\nRECALL: recall\nCUSTOM: custom';
+        CREATE TABLE IF NOT EXISTS "inventory_transactions" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "transaction_type" VARCHAR(8) NOT NULL,
+    "quantity" DECIMAL(10,2) NOT NULL,
+    "transaction_date" TIMESTAMPTZ NOT NULL,
+    "reference_number" VARCHAR(100),
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT NOT NULL REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "performed_by_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE,
+    "study_id" INT REFERENCES "studies" ("id") ON DELETE CASCADE,
+    "supply_id" INT NOT NULL REFERENCES "supplies" ("id") ON DELETE CASCADE
+);
+        COMMENT ON COLUMN "inventory_transactions"."transaction_type" IS 'RECEIVED: received\nISSUED: issued\nADJUSTED: adjusted\nRETURNED: returned\nEXPIRED: expired\nDAMAGED: damaged';
+        CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSONB NOT NULL
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
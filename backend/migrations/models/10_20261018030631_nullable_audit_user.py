@@ -0,0 +1,65 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        PRAGMA foreign_keys=OFF;
+        CREATE TABLE "audit_logs_new" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "action" VARCHAR(8) NOT NULL  /* CREATE: create\nREAD: read\nUPDATE: update\nDELETE: delete\nLOGIN: login\nLOGOUT: logout\nEXPORT: export\nIMPORT: import\nAPPROVE: approve\nREJECT: reject\nSHARE: share\nDOWNLOAD: download\nPRINT: print */,
+    "module" VARCHAR(9) NOT NULL  /* PATIENT: patient\nSTUDY: study\nREPORT: report\nUSER: user\nEQUIPMENT: equipment\nINVENTORY: inventory\nBILLING: billing\nSYSTEM: system\nDOCUMENT: document */,
+    "description" TEXT NOT NULL,
+    "ip_address" VARCHAR(50),
+    "user_agent" TEXT,
+    "resource_id" INT,
+    "resource_type" VARCHAR(100),
+    "old_values" JSON,
+    "new_values" JSON,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        INSERT INTO "audit_logs_new" ("id", "action", "module", "description", "ip_address", "user_agent", "resource_id", "resource_type", "old_values", "new_values", "created_at", "department_id", "user_id") SELECT "id", "action", "module", "description", "ip_address", "user_agent", "resource_id", "resource_type", "old_values", "new_values", "created_at", "department_id", "user_id" FROM "audit_logs";
+        DROP TABLE "audit_logs";
+        ALTER TABLE "audit_logs_new" RENAME TO "audit_logs";
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_created_bdaee3" ON "audit_logs" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_00c50b" ON "audit_logs" ("user_id", "module");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_fe717c" ON "audit_logs" ("user_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_module_3c7403" ON "audit_logs" ("module", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_resourc_8748b7" ON "audit_logs" ("resource_type", "resource_id");
+        PRAGMA foreign_keys=ON;"""
+    return """
+        ALTER TABLE "audit_logs" ALTER COLUMN "user_id" DROP NOT NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        PRAGMA foreign_keys=OFF;
+        CREATE TABLE "audit_logs_new" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "action" VARCHAR(8) NOT NULL  /* CREATE: create\nREAD: read\nUPDATE: update\nDELETE: delete\nLOGIN: login\nLOGOUT: logout\nEXPORT: export\nIMPORT: import\nAPPROVE: approve\nREJECT: reject\nSHARE: share\nDOWNLOAD: download\nPRINT: print */,
+    "module" VARCHAR(9) NOT NULL  /* PATIENT: patient\nSTUDY: study\nREPORT: report\nUSER: user\nEQUIPMENT: equipment\nINVENTORY: inventory\nBILLING: billing\nSYSTEM: system\nDOCUMENT: document */,
+    "description" TEXT NOT NULL,
+    "ip_address" VARCHAR(50),
+    "user_agent" TEXT,
+    "resource_id" INT,
+    "resource_type" VARCHAR(100),
+    "old_values" JSON,
+    "new_values" JSON,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        INSERT INTO "audit_logs_new" ("id", "action", "module", "description", "ip_address", "user_agent", "resource_id", "resource_type", "old_values", "new_values", "created_at", "department_id", "user_id") SELECT "id", "action", "module", "description", "ip_address", "user_agent", "resource_id", "resource_type", "old_values", "new_values", "created_at", "department_id", "user_id" FROM "audit_logs";
+        DROP TABLE "audit_logs";
+        ALTER TABLE "audit_logs_new" RENAME TO "audit_logs";
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_created_bdaee3" ON "audit_logs" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_00c50b" ON "audit_logs" ("user_id", "module");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_fe717c" ON "audit_logs" ("user_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_module_3c7403" ON "audit_logs" ("module", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_resourc_8748b7" ON "audit_logs" ("resource_type", "resource_id");
+        PRAGMA foreign_keys=ON;"""
+    return """
+        ALTER TABLE "audit_logs" ALTER COLUMN "user_id" SET NOT NULL;"""
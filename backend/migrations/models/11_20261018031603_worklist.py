@@ -0,0 +1,74 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "worklist" (
+    "patient_id" INT NOT NULL,
+    "patient_name" VARCHAR(201) NOT NULL,
+    "medical_record_number" VARCHAR(50) NOT NULL,
+    "referring_physician_id" INT NOT NULL,
+    "referring_physician_name" VARCHAR(101) NOT NULL,
+    "room_id" INT NOT NULL,
+    "room_name" VARCHAR(100) NOT NULL,
+    "department_id" INT NOT NULL,
+    "modality" VARCHAR(100) NOT NULL,
+    "study_type" VARCHAR(100) NOT NULL,
+    "study_date" TIMESTAMP NOT NULL,
+    "study_status" VARCHAR(11) NOT NULL  /* SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nREPORTED: reported */,
+    "priority" VARCHAR(20) NOT NULL,
+    "priority_rank" INT NOT NULL,
+    "report_id" INT,
+    "report_status" VARCHAR(14)   /* DRAFT: draft\nPENDING_REVIEW: pending_review\nAPPROVED: approved\nREJECTED: rejected\nSIGNED: signed\nAMENDED: amended */,
+    "radiologist_id" INT,
+    "critical_findings" INT NOT NULL  DEFAULT 0,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "study_id" INT NOT NULL  PRIMARY KEY REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        CREATE INDEX IF NOT EXISTS "idx_worklist_priorit_410310" ON "worklist" ("priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_radiolo_6d0d36" ON "worklist" ("radiologist_id", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_modalit_cf1f01" ON "worklist" ("modality", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_departm_f54fb5" ON "worklist" ("department_id", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_priorit_1a3cee" ON "worklist" ("priority", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_patient_9f8c4b" ON "worklist" ("patient_id");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_referri_a2571f" ON "worklist" ("referring_physician_id");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_room_id_e5b4bf" ON "worklist" ("room_id");"""
+    return """
+        CREATE TABLE IF NOT EXISTS "worklist" (
+    "patient_id" INT NOT NULL,
+    "patient_name" VARCHAR(201) NOT NULL,
+    "medical_record_number" VARCHAR(50) NOT NULL,
+    "referring_physician_id" INT NOT NULL,
+    "referring_physician_name" VARCHAR(101) NOT NULL,
+    "room_id" INT NOT NULL,
+    "room_name" VARCHAR(100) NOT NULL,
+    "department_id" INT NOT NULL,
+    "modality" VARCHAR(100) NOT NULL,
+    "study_type" VARCHAR(100) NOT NULL,
+    "study_date" TIMESTAMPTZ NOT NULL,
+    "study_status" VARCHAR(11) NOT NULL,
+    "priority" VARCHAR(20) NOT NULL,
+    "priority_rank" INT NOT NULL,
+    "report_id" INT,
+    "report_status" VARCHAR(14),
+    "radiologist_id" INT,
+    "critical_findings" BOOL NOT NULL  DEFAULT False,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "study_id" INT NOT NULL  PRIMARY KEY REFERENCES "studies" ("id") ON DELETE CASCADE
+);
+        CREATE INDEX IF NOT EXISTS "idx_worklist_priorit_410310" ON "worklist" ("priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_radiolo_6d0d36" ON "worklist" ("radiologist_id", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_modalit_cf1f01" ON "worklist" ("modality", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_departm_f54fb5" ON "worklist" ("department_id", "priority_rank", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_priorit_1a3cee" ON "worklist" ("priority", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_patient_9f8c4b" ON "worklist" ("patient_id");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_referri_a2571f" ON "worklist" ("referring_physician_id");
+        CREATE INDEX IF NOT EXISTS "idx_worklist_room_id_e5b4bf" ON "worklist" ("room_id");
+        COMMENT ON COLUMN "worklist"."study_status" IS 'SCHEDULED: scheduled\nIN_PROGRESS: in_progress\nCOMPLETED: completed\nCANCELLED: cancelled\nREPORTED: reported';
+        COMMENT ON COLUMN "worklist"."report_status" IS 'DRAFT: draft\nPENDING_REVIEW: pending_review\nAPPROVED: approved\nREJECTED: rejected\nSIGNED: signed\nAMENDED: amended';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "worklist";"""
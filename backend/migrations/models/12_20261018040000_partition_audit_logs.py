@@ -0,0 +1,67 @@
+from datetime import date, datetime, timezone
+from tortoise import BaseDBAsyncClient
+
+# PostgreSQL only: audit_logs becomes a table partitioned by month on created_at. SQLite databases keep the
+# plain table and the archiver rolls closed months out of it instead.
+INDEXES = (
+    ("created_at",),
+    ("user_id", "module"),
+    ("user_id", "created_at"),
+    ("module", "created_at"),
+    ("resource_type", "resource_id"),
+)
+# aerich runs whatever script is returned, and asyncpg fails on an empty one
+NO_SQL = "SELECT 1;"
+
+
+def _index_statements(table: str) -> str:
+    return "\n".join(
+        f'        CREATE INDEX IF NOT EXISTS "{table}_{"_".join(columns)}" ON "{table}" ({", ".join(columns)});'
+        for columns in INDEXES
+    )
+
+
+async def _partitioned(db: BaseDBAsyncClient) -> bool:
+    _, rows = await db.execute_query("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')")
+    return bool(rows)
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Databases partitioned at startup by earlier releases are left as they are
+    if db.capabilities.dialect != "postgres" or await _partitioned(db):
+        return NO_SQL
+    # The existing table becomes the partition holding everything before next month, and a default partition
+    # catches rows no monthly partition covers until the archiver creates it. Partition keys must be part of
+    # the primary key, so the legacy key gives way to the parent's (id, created_at).
+    today = datetime.now(timezone.utc)
+    boundary = date(today.year + today.month // 12, today.month % 12 + 1, 1)
+    return f"""
+        ALTER TABLE "audit_logs" RENAME TO "audit_logs_legacy";
+        ALTER TABLE "audit_logs_legacy" DROP CONSTRAINT "audit_logs_pkey";
+        CREATE TABLE "audit_logs" (LIKE "audit_logs_legacy" INCLUDING DEFAULTS) PARTITION BY RANGE ("created_at");
+        ALTER TABLE "audit_logs" ADD PRIMARY KEY ("id", "created_at");
+        ALTER TABLE "audit_logs" ADD FOREIGN KEY ("department_id") REFERENCES "departments" ("id") ON DELETE CASCADE;
+        ALTER TABLE "audit_logs" ADD FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE CASCADE;
+        ALTER SEQUENCE "audit_logs_id_seq" OWNED BY "audit_logs"."id";
+{_index_statements("audit_logs")}
+        ALTER TABLE "audit_logs" ATTACH PARTITION "audit_logs_legacy" FOR VALUES FROM (MINVALUE) TO ('{boundary} 00:00:00+00');
+        CREATE TABLE "audit_logs_default" PARTITION OF "audit_logs" DEFAULT;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect != "postgres" or not await _partitioned(db):
+        return NO_SQL
+    return """
+        CREATE TABLE "audit_logs_plain" (LIKE "audit_logs" INCLUDING DEFAULTS);
+        INSERT INTO "audit_logs_plain" SELECT * FROM "audit_logs";
+        ALTER SEQUENCE "audit_logs_id_seq" OWNED BY "audit_logs_plain"."id";
+        DROP TABLE "audit_logs" CASCADE;
+        ALTER TABLE "audit_logs_plain" RENAME TO "audit_logs";
+        ALTER TABLE "audit_logs" ADD PRIMARY KEY ("id");
+        ALTER TABLE "audit_logs" ADD FOREIGN KEY ("department_id") REFERENCES "departments" ("id") ON DELETE CASCADE;
+        ALTER TABLE "audit_logs" ADD FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON DELETE CASCADE;
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_created_bdaee3" ON "audit_logs" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_00c50b" ON "audit_logs" ("user_id", "module");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_fe717c" ON "audit_logs" ("user_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_module_3c7403" ON "audit_logs" ("module", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_resourc_8748b7" ON "audit_logs" ("resource_type", "resource_id");"""
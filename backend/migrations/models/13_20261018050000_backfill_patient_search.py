@@ -0,0 +1,36 @@
+import unicodedata
+from tortoise import BaseDBAsyncClient
+
+# Migration 5 added the normalized name columns blank, which hides every existing patient from the typeahead.
+# The normalization is copied from the model so this migration keeps producing what it did when it shipped.
+BATCH_SIZE = 1000
+# aerich runs whatever script is returned, and asyncpg fails on an empty one
+NO_SQL = "SELECT 1;"
+
+
+def _normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "postgres":
+        update = 'UPDATE "patients" SET "first_name_search" = $1, "last_name_search" = $2 WHERE "id" = $3'
+    else:
+        update = 'UPDATE "patients" SET "first_name_search" = ?, "last_name_search" = ? WHERE "id" = ?'
+    last_id = 0
+    while True:
+        rows = await db.execute_query_dict(
+            f'SELECT "id", "first_name", "last_name" FROM "patients" WHERE "id" > {last_id} '
+            f'AND ("first_name_search" = \'\' OR "last_name_search" = \'\') ORDER BY "id" LIMIT {BATCH_SIZE}'
+        )
+        if not rows:
+            return NO_SQL
+        await db.execute_many(update, [
+            [_normalize(row["first_name"]), _normalize(row["last_name"]), row["id"]] for row in rows
+        ])
+        last_id = rows[-1]["id"]
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return NO_SQL
@@ -0,0 +1,12 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Messages that can no longer be sent do not need their bodies, which may hold live reset links
+    return """
+        UPDATE "outbound_emails" SET "body" = '' WHERE "status" IN ('sent', 'failed');"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        SELECT 1;"""
@@ -0,0 +1,163 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_allergies_patient_a9dece" ON "allergies" ("patient_id", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_appointment_patient_3db369" ON "appointments" ("patient_id", "scheduled_time");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_00c50b" ON "audit_logs" ("user_id", "module");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_user_id_fe717c" ON "audit_logs" ("user_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_resourc_8748b7" ON "audit_logs" ("resource_type", "resource_id");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_created_bdaee3" ON "audit_logs" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_audit_logs_module_3c7403" ON "audit_logs" ("module", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_billings_billing_576e62" ON "billings" ("billing_date");
+        CREATE INDEX IF NOT EXISTS "idx_billings_patient_72fbd3" ON "billings" ("patient_id", "is_paid");
+        CREATE INDEX IF NOT EXISTS "idx_billings_study_i_3bfc6d" ON "billings" ("study_id");
+        CREATE INDEX IF NOT EXISTS "idx_compliance__status_e9b4c1" ON "compliance_records" ("status", "due_date");
+        CREATE INDEX IF NOT EXISTS "idx_compliance__departm_af294d" ON "compliance_records" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_documents_expirat_87f18b" ON "documents" ("expiration_date");
+        CREATE INDEX IF NOT EXISTS "idx_documents_categor_b49d81" ON "documents" ("category");
+        CREATE INDEX IF NOT EXISTS "idx_documents_created_55f5d9" ON "documents" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_documents_departm_634fb8" ON "documents" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_document_sh_shared__e2cd26" ON "document_shares" ("shared_by_id", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_document_sh_shared__6c4e17" ON "document_shares" ("shared_with_id", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_document_ve_documen_7ea779" ON "document_versions" ("document_id");
+        CREATE INDEX IF NOT EXISTS "idx_equipment_next_ca_a6ff64" ON "equipment" ("next_calibration_date");
+        CREATE INDEX IF NOT EXISTS "idx_equipment_room_id_7f88f9" ON "equipment" ("room_id");
+        CREATE INDEX IF NOT EXISTS "idx_equipment_type_7a9011" ON "equipment" ("type");
+        CREATE INDEX IF NOT EXISTS "idx_equipment_status_a7c610" ON "equipment" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_image_annot_type_ab8166" ON "image_annotations" ("type", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_image_annot_study_i_da603f" ON "image_annotations" ("study_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_image_annot_is_ai_g_639a69" ON "image_annotations" ("is_ai_generated", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_image_annot_status_fb9e6b" ON "image_annotations" ("status", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_image_annot_created_d6122e" ON "image_annotations" ("created_by_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_incident_re_inciden_220fb6" ON "incident_reports" ("incident_date");
+        CREATE INDEX IF NOT EXISTS "idx_incident_re_status_3497ef" ON "incident_reports" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_incident_re_departm_ba5768" ON "incident_reports" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_insurances_patient_aeeda5" ON "insurances" ("patient_id");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_is_acti_26d69f" ON "inventory_alerts" ("is_active", "alert_type");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_supply__af0084" ON "inventory_alerts" ("supply_id");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_departm_a33f2b" ON "inventory_alerts" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_t_supply__cb74ce" ON "inventory_transactions" ("supply_id", "transaction_date");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_t_departm_dc5b6e" ON "inventory_transactions" ("department_id", "transaction_date");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_t_transac_8b645c" ON "inventory_transactions" ("transaction_date");
+        CREATE INDEX IF NOT EXISTS "idx_maintenance_date_ebd2b3" ON "maintenance_records" ("date");
+        CREATE INDEX IF NOT EXISTS "idx_maintenance_status_c26636" ON "maintenance_records" ("status", "next_maintenance_date");
+        CREATE INDEX IF NOT EXISTS "idx_maintenance_equipme_e03408" ON "maintenance_records" ("equipment_id", "date");
+        CREATE INDEX IF NOT EXISTS "idx_medical_his_patient_9047bf" ON "medical_history" ("patient_id", "diagnosis_date");
+        CREATE INDEX IF NOT EXISTS "idx_payments_payment_6c264b" ON "payments" ("payment_date");
+        CREATE INDEX IF NOT EXISTS "idx_payments_billing_d6889e" ON "payments" ("billing_id");
+        CREATE INDEX IF NOT EXISTS "idx_payments_status_c133d1" ON "payments" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_protocol_te_equipme_797ce6" ON "protocol_templates" ("equipment_type", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_protocol_te_departm_38cf4b" ON "protocol_templates" ("department_id", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_protocol_te_is_acti_787b1e" ON "protocol_templates" ("is_active");
+        CREATE INDEX IF NOT EXISTS "idx_protocol_te_categor_4904ea" ON "protocol_templates" ("category", "is_active");
+        CREATE INDEX IF NOT EXISTS "idx_quality_con_study_i_246c1e" ON "quality_controls" ("study_id");
+        CREATE INDEX IF NOT EXISTS "idx_quality_con_equipme_0409fd" ON "quality_controls" ("equipment_id");
+        CREATE INDEX IF NOT EXISTS "idx_quality_con_report__9159a7" ON "quality_controls" ("report_id");
+        CREATE INDEX IF NOT EXISTS "idx_quality_con_created_d35a5e" ON "quality_controls" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_quality_con_status_7a6f2c" ON "quality_controls" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_reports_critica_9d6da7" ON "reports" ("critical_findings");
+        CREATE INDEX IF NOT EXISTS "idx_reports_study_i_9942d1" ON "reports" ("study_id");
+        CREATE INDEX IF NOT EXISTS "idx_reports_patient_2d266c" ON "reports" ("patient_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_reports_status_f77ae6" ON "reports" ("status", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_reports_created_9f0ca0" ON "reports" ("created_at");
+        CREATE INDEX IF NOT EXISTS "idx_reports_radiolo_bc102b" ON "reports" ("radiologist_id", "created_at");
+        CREATE INDEX IF NOT EXISTS "idx_rooms_departm_36e13c" ON "rooms" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_date_1f29fa" ON "schedules" ("date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_departm_e97b2a" ON "schedules" ("department_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_status_412627" ON "schedules" ("status", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_user_id_17d51f" ON "schedules" ("user_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_studies_study_d_63c9cd" ON "studies" ("study_date");
+        CREATE INDEX IF NOT EXISTS "idx_studies_patient_9ea947" ON "studies" ("patient_id", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_studies_status_72da39" ON "studies" ("status", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_studies_referri_acc56f" ON "studies" ("referring_physician_id", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_supplies_expirat_abef53" ON "supplies" ("expiration_date");
+        CREATE INDEX IF NOT EXISTS "idx_supplies_categor_c3a238" ON "supplies" ("category");
+        CREATE INDEX IF NOT EXISTS "idx_supplies_status_4d192c" ON "supplies" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_supplies_departm_a5360f" ON "supplies" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_technologis_special_e1f48d" ON "technologists" ("specialization");
+        CREATE INDEX IF NOT EXISTS "idx_technologis_departm_66cde0" ON "technologists" ("department_id");
+        CREATE INDEX IF NOT EXISTS "idx_technologis_status_fbb5ca" ON "technologists" ("status");
+        CREATE INDEX IF NOT EXISTS "idx_users_role_35db31" ON "users" ("role");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_inventory_t_transac_8b645c";
+        DROP INDEX IF EXISTS "idx_inventory_t_departm_dc5b6e";
+        DROP INDEX IF EXISTS "idx_inventory_t_supply__cb74ce";
+        DROP INDEX IF EXISTS "idx_maintenance_equipme_e03408";
+        DROP INDEX IF EXISTS "idx_maintenance_status_c26636";
+        DROP INDEX IF EXISTS "idx_maintenance_date_ebd2b3";
+        DROP INDEX IF EXISTS "idx_protocol_te_categor_4904ea";
+        DROP INDEX IF EXISTS "idx_protocol_te_is_acti_787b1e";
+        DROP INDEX IF EXISTS "idx_protocol_te_departm_38cf4b";
+        DROP INDEX IF EXISTS "idx_protocol_te_equipme_797ce6";
+        DROP INDEX IF EXISTS "idx_compliance__departm_af294d";
+        DROP INDEX IF EXISTS "idx_compliance__status_e9b4c1";
+        DROP INDEX IF EXISTS "idx_image_annot_created_d6122e";
+        DROP INDEX IF EXISTS "idx_image_annot_status_fb9e6b";
+        DROP INDEX IF EXISTS "idx_image_annot_is_ai_g_639a69";
+        DROP INDEX IF EXISTS "idx_image_annot_study_i_da603f";
+        DROP INDEX IF EXISTS "idx_image_annot_type_ab8166";
+        DROP INDEX IF EXISTS "idx_document_ve_documen_7ea779";
+        DROP INDEX IF EXISTS "idx_quality_con_status_7a6f2c";
+        DROP INDEX IF EXISTS "idx_quality_con_created_d35a5e";
+        DROP INDEX IF EXISTS "idx_quality_con_report__9159a7";
+        DROP INDEX IF EXISTS "idx_quality_con_equipme_0409fd";
+        DROP INDEX IF EXISTS "idx_quality_con_study_i_246c1e";
+        DROP INDEX IF EXISTS "idx_medical_his_patient_9047bf";
+        DROP INDEX IF EXISTS "idx_inventory_a_departm_a33f2b";
+        DROP INDEX IF EXISTS "idx_inventory_a_supply__af0084";
+        DROP INDEX IF EXISTS "idx_inventory_a_is_acti_26d69f";
+        DROP INDEX IF EXISTS "idx_incident_re_departm_ba5768";
+        DROP INDEX IF EXISTS "idx_incident_re_status_3497ef";
+        DROP INDEX IF EXISTS "idx_incident_re_inciden_220fb6";
+        DROP INDEX IF EXISTS "idx_document_sh_shared__6c4e17";
+        DROP INDEX IF EXISTS "idx_document_sh_shared__e2cd26";
+        DROP INDEX IF EXISTS "idx_technologis_status_fbb5ca";
+        DROP INDEX IF EXISTS "idx_technologis_departm_66cde0";
+        DROP INDEX IF EXISTS "idx_technologis_special_e1f48d";
+        DROP INDEX IF EXISTS "idx_appointment_patient_3db369";
+        DROP INDEX IF EXISTS "idx_insurances_patient_aeeda5";
+        DROP INDEX IF EXISTS "idx_equipment_status_a7c610";
+        DROP INDEX IF EXISTS "idx_equipment_type_7a9011";
+        DROP INDEX IF EXISTS "idx_equipment_room_id_7f88f9";
+        DROP INDEX IF EXISTS "idx_equipment_next_ca_a6ff64";
+        DROP INDEX IF EXISTS "idx_schedules_user_id_17d51f";
+        DROP INDEX IF EXISTS "idx_schedules_status_412627";
+        DROP INDEX IF EXISTS "idx_schedules_departm_e97b2a";
+        DROP INDEX IF EXISTS "idx_schedules_date_1f29fa";
+        DROP INDEX IF EXISTS "idx_documents_departm_634fb8";
+        DROP INDEX IF EXISTS "idx_documents_created_55f5d9";
+        DROP INDEX IF EXISTS "idx_documents_categor_b49d81";
+        DROP INDEX IF EXISTS "idx_documents_expirat_87f18b";
+        DROP INDEX IF EXISTS "idx_audit_logs_module_3c7403";
+        DROP INDEX IF EXISTS "idx_audit_logs_created_bdaee3";
+        DROP INDEX IF EXISTS "idx_audit_logs_resourc_8748b7";
+        DROP INDEX IF EXISTS "idx_audit_logs_user_id_fe717c";
+        DROP INDEX IF EXISTS "idx_audit_logs_user_id_00c50b";
+        DROP INDEX IF EXISTS "idx_payments_status_c133d1";
+        DROP INDEX IF EXISTS "idx_payments_billing_d6889e";
+        DROP INDEX IF EXISTS "idx_payments_payment_6c264b";
+        DROP INDEX IF EXISTS "idx_billings_study_i_3bfc6d";
+        DROP INDEX IF EXISTS "idx_billings_patient_72fbd3";
+        DROP INDEX IF EXISTS "idx_billings_billing_576e62";
+        DROP INDEX IF EXISTS "idx_allergies_patient_a9dece";
+        DROP INDEX IF EXISTS "idx_supplies_departm_a5360f";
+        DROP INDEX IF EXISTS "idx_supplies_status_4d192c";
+        DROP INDEX IF EXISTS "idx_supplies_categor_c3a238";
+        DROP INDEX IF EXISTS "idx_supplies_expirat_abef53";
+        DROP INDEX IF EXISTS "idx_reports_radiolo_bc102b";
+        DROP INDEX IF EXISTS "idx_reports_created_9f0ca0";
+        DROP INDEX IF EXISTS "idx_reports_status_f77ae6";
+        DROP INDEX IF EXISTS "idx_reports_patient_2d266c";
+        DROP INDEX IF EXISTS "idx_reports_study_i_9942d1";
+        DROP INDEX IF EXISTS "idx_reports_critica_9d6da7";
+        DROP INDEX IF EXISTS "idx_studies_referri_acc56f";
+        DROP INDEX IF EXISTS "idx_studies_status_72da39";
+        DROP INDEX IF EXISTS "idx_studies_patient_9ea947";
+        DROP INDEX IF EXISTS "idx_studies_study_d_63c9cd";
+        DROP INDEX IF EXISTS "idx_users_role_35db31";
+        DROP INDEX IF EXISTS "idx_rooms_departm_36e13c";"""
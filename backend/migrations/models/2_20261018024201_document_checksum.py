@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "documents" ADD "checksum" VARCHAR(64);
+        ALTER TABLE "document_versions" ADD "checksum" VARCHAR(64);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "documents" DROP COLUMN "checksum";
+        ALTER TABLE "document_versions" DROP COLUMN "checksum";"""
@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_documents_checksu_82bec2" ON "documents" ("checksum");
+        CREATE INDEX IF NOT EXISTS "idx_document_ve_checksu_e36ba4" ON "document_versions" ("checksum");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_document_ve_checksu_e36ba4";
+        DROP INDEX IF EXISTS "idx_documents_checksu_82bec2";"""
@@ -0,0 +1,45 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        CREATE TABLE IF NOT EXISTS "outbound_emails" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "recipient" VARCHAR(255) NOT NULL,
+    "subject" VARCHAR(255) NOT NULL,
+    "body" TEXT NOT NULL,
+    "status" VARCHAR(7) NOT NULL  DEFAULT 'pending' /* PENDING: pending\nSENDING: sending\nSENT: sent\nFAILED: failed */,
+    "attempts" INT NOT NULL  DEFAULT 0,
+    "next_attempt_at" TIMESTAMP NOT NULL,
+    "locked_until" TIMESTAMP,
+    "last_error" TEXT,
+    "sent_at" TIMESTAMP,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE INDEX IF NOT EXISTS "idx_outbound_em_status_c17760" ON "outbound_emails" ("status", "next_attempt_at");
+        CREATE INDEX IF NOT EXISTS "idx_outbound_em_status_0ba2a2" ON "outbound_emails" ("status", "locked_until");"""
+    return """
+        CREATE TABLE IF NOT EXISTS "outbound_emails" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "recipient" VARCHAR(255) NOT NULL,
+    "subject" VARCHAR(255) NOT NULL,
+    "body" TEXT NOT NULL,
+    "status" VARCHAR(7) NOT NULL  DEFAULT 'pending',
+    "attempts" INT NOT NULL  DEFAULT 0,
+    "next_attempt_at" TIMESTAMPTZ NOT NULL,
+    "locked_until" TIMESTAMPTZ,
+    "last_error" TEXT,
+    "sent_at" TIMESTAMPTZ,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+);
+        CREATE INDEX IF NOT EXISTS "idx_outbound_em_status_c17760" ON "outbound_emails" ("status", "next_attempt_at");
+        CREATE INDEX IF NOT EXISTS "idx_outbound_em_status_0ba2a2" ON "outbound_emails" ("status", "locked_until");
+        COMMENT ON COLUMN "outbound_emails"."status" IS 'PENDING: pending\nSENDING: sending\nSENT: sent\nFAILED: failed';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "outbound_emails";"""
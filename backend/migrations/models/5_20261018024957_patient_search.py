@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "patients" ADD "last_name_search" VARCHAR(100) NOT NULL  DEFAULT '';
+        ALTER TABLE "patients" ADD "first_name_search" VARCHAR(100) NOT NULL  DEFAULT '';
+        CREATE INDEX IF NOT EXISTS "idx_patients_date_of_8851ee" ON "patients" ("date_of_birth", "last_name_search");
+        CREATE INDEX IF NOT EXISTS "idx_patients_last_na_f00b17" ON "patients" ("last_name_search", "first_name_search");
+        CREATE INDEX IF NOT EXISTS "idx_patients_first_n_cd2f5c" ON "patients" ("first_name_search", "last_name_search");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_patients_first_n_cd2f5c";
+        DROP INDEX IF EXISTS "idx_patients_last_na_f00b17";
+        DROP INDEX IF EXISTS "idx_patients_date_of_8851ee";
+        ALTER TABLE "patients" DROP COLUMN "last_name_search";
+        ALTER TABLE "patients" DROP COLUMN "first_name_search";"""
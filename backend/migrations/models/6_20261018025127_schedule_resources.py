@@ -0,0 +1,52 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        ALTER TABLE "schedules" ADD "equipment_id" INT REFERENCES "equipment" ("id") ON DELETE CASCADE;
+        ALTER TABLE "schedules" ADD "room_id" INT REFERENCES "rooms" ("id") ON DELETE CASCADE;
+        CREATE INDEX IF NOT EXISTS "idx_schedules_equipme_9271f6" ON "schedules" ("equipment_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_room_id_f2659a" ON "schedules" ("room_id", "date", "start_time");"""
+    return """
+        ALTER TABLE "schedules" ADD "equipment_id" INT;
+        ALTER TABLE "schedules" ADD "room_id" INT;
+        CREATE INDEX IF NOT EXISTS "idx_schedules_equipme_9271f6" ON "schedules" ("equipment_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_room_id_f2659a" ON "schedules" ("room_id", "date", "start_time");
+        ALTER TABLE "schedules" ADD CONSTRAINT "fk_schedule_rooms_51b68075" FOREIGN KEY ("room_id") REFERENCES "rooms" ("id") ON DELETE CASCADE;
+        ALTER TABLE "schedules" ADD CONSTRAINT "fk_schedule_equipmen_4a1b7c20" FOREIGN KEY ("equipment_id") REFERENCES "equipment" ("id") ON DELETE CASCADE;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        PRAGMA foreign_keys=OFF;
+        CREATE TABLE "schedules_new" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "date" DATE NOT NULL,
+    "start_time" TIME NOT NULL,
+    "end_time" TIME NOT NULL,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled\nON_LEAVE: on_leave\nBREAK: break */,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "notes" TEXT,
+    "is_recurring" INT NOT NULL  DEFAULT 0,
+    "recurrence_pattern" VARCHAR(50),
+    "department_id" INT REFERENCES "departments" ("id") ON DELETE CASCADE,
+    "user_id" INT NOT NULL REFERENCES "users" ("id") ON DELETE CASCADE
+);
+        INSERT INTO "schedules_new" ("id", "date", "start_time", "end_time", "status", "created_at", "updated_at", "notes", "is_recurring", "recurrence_pattern", "department_id", "user_id") SELECT "id", "date", "start_time", "end_time", "status", "created_at", "updated_at", "notes", "is_recurring", "recurrence_pattern", "department_id", "user_id" FROM "schedules";
+        DROP TABLE "schedules";
+        ALTER TABLE "schedules_new" RENAME TO "schedules";
+        CREATE INDEX IF NOT EXISTS "idx_schedules_user_id_17d51f" ON "schedules" ("user_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_departm_e97b2a" ON "schedules" ("department_id", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_status_412627" ON "schedules" ("status", "date", "start_time");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_date_1f29fa" ON "schedules" ("date", "start_time");
+        PRAGMA foreign_keys=ON;"""
+    return """
+        ALTER TABLE "schedules" DROP CONSTRAINT "fk_schedule_equipmen_4a1b7c20";
+        ALTER TABLE "schedules" DROP CONSTRAINT "fk_schedule_rooms_51b68075";
+        DROP INDEX IF EXISTS "idx_schedules_room_id_f2659a";
+        DROP INDEX IF EXISTS "idx_schedules_equipme_9271f6";
+        ALTER TABLE "schedules" DROP COLUMN "equipment_id";
+        ALTER TABLE "schedules" DROP COLUMN "room_id";"""
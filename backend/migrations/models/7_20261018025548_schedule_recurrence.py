@@ -0,0 +1,50 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        ALTER TABLE "schedules" ADD "recurrence_rule" VARCHAR(255);
+        ALTER TABLE "schedules" ADD "recurrence_end" DATE;
+        CREATE TABLE IF NOT EXISTS "schedule_exceptions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "original_date" DATE NOT NULL,
+    "is_cancelled" INT NOT NULL  DEFAULT 0,
+    "new_date" DATE,
+    "start_time" TIME,
+    "end_time" TIME,
+    "status" VARCHAR(9)   /* SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled\nON_LEAVE: on_leave\nBREAK: break */,
+    "notes" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "schedule_id" INT NOT NULL REFERENCES "schedules" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_schedule_ex_schedul_349706" UNIQUE ("schedule_id", "original_date")
+);
+        CREATE INDEX IF NOT EXISTS "idx_schedule_ex_new_dat_ef42a6" ON "schedule_exceptions" ("new_date");
+        CREATE INDEX IF NOT EXISTS "idx_schedules_is_recu_e4aea0" ON "schedules" ("is_recurring", "date");"""
+    return """
+        ALTER TABLE "schedules" ADD "recurrence_rule" VARCHAR(255);
+        ALTER TABLE "schedules" ADD "recurrence_end" DATE;
+        CREATE TABLE IF NOT EXISTS "schedule_exceptions" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "original_date" DATE NOT NULL,
+    "is_cancelled" BOOL NOT NULL  DEFAULT False,
+    "new_date" DATE,
+    "start_time" TIMETZ,
+    "end_time" TIMETZ,
+    "status" VARCHAR(9),
+    "notes" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "schedule_id" INT NOT NULL REFERENCES "schedules" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_schedule_ex_schedul_349706" UNIQUE ("schedule_id", "original_date")
+);
+        CREATE INDEX IF NOT EXISTS "idx_schedule_ex_new_dat_ef42a6" ON "schedule_exceptions" ("new_date");
+        COMMENT ON COLUMN "schedule_exceptions"."status" IS 'SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled\nON_LEAVE: on_leave\nBREAK: break';
+        CREATE INDEX IF NOT EXISTS "idx_schedules_is_recu_e4aea0" ON "schedules" ("is_recurring", "date");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_schedules_is_recu_e4aea0";
+        ALTER TABLE "schedules" DROP COLUMN "recurrence_rule";
+        ALTER TABLE "schedules" DROP COLUMN "recurrence_end";
+        DROP TABLE IF EXISTS "schedule_exceptions";"""
@@ -0,0 +1,56 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        ALTER TABLE "appointments" ADD "room_id" INT REFERENCES "rooms" ("id") ON DELETE CASCADE;
+        ALTER TABLE "appointments" ADD "duration_minutes" INT;
+        ALTER TABLE "appointments" ADD "equipment_id" INT REFERENCES "equipment" ("id") ON DELETE CASCADE;
+        CREATE INDEX IF NOT EXISTS "idx_appointment_equipme_51d119" ON "appointments" ("equipment_id", "scheduled_time");
+        CREATE INDEX IF NOT EXISTS "idx_appointment_room_id_b27033" ON "appointments" ("room_id", "scheduled_time");
+        CREATE INDEX IF NOT EXISTS "idx_studies_equipme_b51bf8" ON "studies" ("equipment_id", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_studies_room_id_09cf55" ON "studies" ("room_id", "study_date");"""
+    return """
+        ALTER TABLE "appointments" ADD "room_id" INT;
+        ALTER TABLE "appointments" ADD "duration_minutes" INT;
+        ALTER TABLE "appointments" ADD "equipment_id" INT;
+        CREATE INDEX IF NOT EXISTS "idx_appointment_equipme_51d119" ON "appointments" ("equipment_id", "scheduled_time");
+        CREATE INDEX IF NOT EXISTS "idx_appointment_room_id_b27033" ON "appointments" ("room_id", "scheduled_time");
+        ALTER TABLE "appointments" ADD CONSTRAINT "fk_appointm_rooms_535d531d" FOREIGN KEY ("room_id") REFERENCES "rooms" ("id") ON DELETE CASCADE;
+        ALTER TABLE "appointments" ADD CONSTRAINT "fk_appointm_equipmen_fc681ef0" FOREIGN KEY ("equipment_id") REFERENCES "equipment" ("id") ON DELETE CASCADE;
+        CREATE INDEX IF NOT EXISTS "idx_studies_equipme_b51bf8" ON "studies" ("equipment_id", "study_date");
+        CREATE INDEX IF NOT EXISTS "idx_studies_room_id_09cf55" ON "studies" ("room_id", "study_date");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        DROP INDEX IF EXISTS "idx_studies_room_id_09cf55";
+        DROP INDEX IF EXISTS "idx_studies_equipme_b51bf8";
+        PRAGMA foreign_keys=OFF;
+        CREATE TABLE "appointments_new" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "scheduled_time" TIMESTAMP NOT NULL,
+    "type" VARCHAR(12) NOT NULL  /* CONSULTATION: consultation\nSCAN: scan\nFOLLOW_UP: follow_up\nOTHER: other */,
+    "status" VARCHAR(9) NOT NULL  DEFAULT 'scheduled' /* SCHEDULED: scheduled\nCOMPLETED: completed\nCANCELLED: cancelled */,
+    "reason" TEXT,
+    "created_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+    "patient_id" INT NOT NULL REFERENCES "patients" ("id") ON DELETE CASCADE
+);
+        INSERT INTO "appointments_new" ("id", "scheduled_time", "type", "status", "reason", "created_at", "updated_at", "patient_id") SELECT "id", "scheduled_time", "type", "status", "reason", "created_at", "updated_at", "patient_id" FROM "appointments";
+        DROP TABLE "appointments";
+        ALTER TABLE "appointments_new" RENAME TO "appointments";
+        CREATE INDEX IF NOT EXISTS "idx_appointment_patient_3db369" ON "appointments" ("patient_id", "scheduled_time");
+        PRAGMA foreign_keys=ON;"""
+    return """
+        ALTER TABLE "appointments" DROP CONSTRAINT "fk_appointm_equipmen_fc681ef0";
+        ALTER TABLE "appointments" DROP CONSTRAINT "fk_appointm_rooms_535d531d";
+        DROP INDEX IF EXISTS "idx_appointment_room_id_b27033";
+        DROP INDEX IF EXISTS "idx_appointment_equipme_51d119";
+        DROP INDEX IF EXISTS "idx_studies_room_id_09cf55";
+        DROP INDEX IF EXISTS "idx_studies_equipme_b51bf8";
+        ALTER TABLE "appointments" DROP COLUMN "room_id";
+        ALTER TABLE "appointments" DROP COLUMN "duration_minutes";
+        ALTER TABLE "appointments" DROP COLUMN "equipment_id";"""
@@ -0,0 +1,23 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    if db.capabilities.dialect == "sqlite":
+        return """
+        DROP INDEX IF EXISTS "idx_inventory_a_supply__af0084";
+        ALTER TABLE "inventory_alerts" ADD "resolved_at" TIMESTAMP;
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_alert_t_788e20" ON "inventory_alerts" ("alert_type", "resolved_at", "department_id");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_supply__a5b3c4" ON "inventory_alerts" ("supply_id", "alert_type", "resolved_at");"""
+    return """
+        DROP INDEX IF EXISTS "idx_inventory_a_supply__af0084";
+        ALTER TABLE "inventory_alerts" ADD "resolved_at" TIMESTAMPTZ;
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_alert_t_788e20" ON "inventory_alerts" ("alert_type", "resolved_at", "department_id");
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_supply__a5b3c4" ON "inventory_alerts" ("supply_id", "alert_type", "resolved_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_inventory_a_supply__a5b3c4";
+        DROP INDEX IF EXISTS "idx_inventory_a_alert_t_788e20";
+        ALTER TABLE "inventory_alerts" DROP COLUMN "resolved_at";
+        CREATE INDEX IF NOT EXISTS "idx_inventory_a_supply__af0084" ON "inventory_alerts" ("supply_id");"""
@@ -2,6 +2,7 @@ from tortoise import fields, models
 from tortoise.contrib.pydantic import pydantic_model_creator
 from datetime import datetime, date, time
 import enum
+import unicodedata
 from pydantic import BaseModel
 
 class Gender(str, enum.Enum):
@@ -9,6 +10,11 @@ class Gender(str, enum.Enum):
     FEMALE = "female"
     OTHER = "other"
 
+def normalize_name(value: str) -> str:
+    # Lower-case and strip accents so "José" and "jose" share an index range
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
 class Patient(models.Model):
     id = fields.IntField(pk=True)
     first_name = fields.CharField(max_length=100)
@@ -19,11 +25,24 @@ class Patient(models.Model):
     email = fields.CharField(max_length=100, unique=True, null=True)
     address = fields.TextField(null=True)
     medical_record_number = fields.CharField(max_length=50, unique=True)
+    # Normalized copies of the names for the typeahead search, maintained in save()
+    first_name_search = fields.CharField(max_length=100, default="")
+    last_name_search = fields.CharField(max_length=100, default="")
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
 
     class Meta:
         table = "patients"
+        indexes = (
+            ("last_name_search", "first_name_search"),
+            ("first_name_search", "last_name_search"),
+            ("date_of_birth", "last_name_search"),
+        )
+
+    async def save(self, *args, **kwargs):
+        self.first_name_search = normalize_name(self.first_name)
+        self.last_name_search = normalize_name(self.last_name)
+        await super().save(*args, **kwargs)
 
 class AppointmentStatus(str, enum.Enum):
     SCHEDULED = "scheduled"
@@ -43,11 +62,19 @@ class Appointment(models.Model):
     type = fields.CharEnumField(AppointmentType)
     status = fields.CharEnumField(AppointmentStatus, default=AppointmentStatus.SCHEDULED)
     reason = fields.TextField(null=True)
+    room = fields.ForeignKeyField('models.Room', related_name='appointments', null=True)
+    equipment = fields.ForeignKeyField('models.Equipment', related_name='appointments', null=True)
+    duration_minutes = fields.IntField(null=True)  # Falls back to the default slot length
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
 
     class Meta:
         table = "appointments"
+        indexes = (
+            ("patient_id", "scheduled_time"),
+            ("room_id", "scheduled_time"),
+            ("equipment_id", "scheduled_time"),
+        )
 
 class ReferringPhysician(models.Model):
     id = fields.IntField(pk=True)
@@ -90,6 +117,14 @@ class Study(models.Model):
 
     class Meta:
         table = "studies"
+        indexes = (
+            ("status", "study_date"),
+            ("study_date",),
+            ("patient_id", "study_date"),
+            ("referring_physician_id", "study_date"),
+            ("room_id", "study_date"),
+            ("equipment_id", "study_date"),
+        )
 
 class EquipmentStatus(str, enum.Enum):
     ACTIVE = "active"
@@ -118,6 +153,7 @@ class Equipment(models.Model):
 
     class Meta:
         table = "equipment"
+        indexes = (("status",), ("type",), ("room_id",), ("next_calibration_date",))
 
 class MaintenanceStatus(str, enum.Enum):
     SCHEDULED = "scheduled"
@@ -150,6 +186,7 @@ class MaintenanceRecord(models.Model):
 
     class Meta:
         table = "maintenance_records"
+        indexes = (("equipment_id", "date"), ("status", "next_maintenance_date"), ("date",))
 
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
@@ -175,13 +212,18 @@ class User(models.Model):
 
     class Meta:
         table = "users"
+        indexes = (("role",),)
 
     def __str__(self):
         return f"{self.name} ({self.role})"
 
 # Create Pydantic models
-Patient_Pydantic = pydantic_model_creator(Patient, name="Patient")
-PatientIn_Pydantic = pydantic_model_creator(Patient, name="PatientIn", exclude_readonly=True)
+Patient_Pydantic = pydantic_model_creator(
+    Patient, name="Patient", exclude=("first_name_search", "last_name_search")
+)
+PatientIn_Pydantic = pydantic_model_creator(
+    Patient, name="PatientIn", exclude_readonly=True, exclude=("first_name_search", "last_name_search")
+)
 
 Appointment_Pydantic = pydantic_model_creator(Appointment, name="Appointment")
 AppointmentIn_Pydantic = pydantic_model_creator(Appointment, name="AppointmentIn", exclude_readonly=True)
@@ -241,6 +283,7 @@ class Room(models.Model):
 
     class Meta:
         table = "rooms"
+        indexes = (("department_id",),)
 
 # Create Pydantic models for Department and Room
 Department_Pydantic = pydantic_model_creator(Department, name="Department")
@@ -281,10 +324,60 @@ class Report(models.Model):
 
     class Meta:
         table = "reports"
+        indexes = (
+            ("status", "created_at"),
+            ("critical_findings",),
+            ("study_id",),
+            ("patient_id", "created_at"),
+            ("radiologist_id", "created_at"),
+            ("created_at",),
+        )
 
 Report_Pydantic = pydantic_model_creator(Report, name="Report")
 ReportIn_Pydantic = pydantic_model_creator(Report, name="ReportIn", exclude_readonly=True)
 
+class WorklistEntry(models.Model):
+    # One row per study awaiting a radiologist, with what the reading list shows copied in.
+    # Maintained by crud.worklist.refresh_worklist whenever a study, its report or the names it shows change.
+    # The entry goes with its study, including deletes cascading from the patient, room, physician or equipment
+    study = fields.OneToOneField('models.Study', related_name='worklist_entry', pk=True, on_delete=fields.CASCADE)
+    patient_id = fields.IntField()
+    patient_name = fields.CharField(max_length=201)
+    medical_record_number = fields.CharField(max_length=50)
+    referring_physician_id = fields.IntField()
+    referring_physician_name = fields.CharField(max_length=101)
+    room_id = fields.IntField()
+    room_name = fields.CharField(max_length=100)
+    department_id = fields.IntField()
+    modality = fields.CharField(max_length=100)
+    study_type = fields.CharField(max_length=100)
+    study_date = fields.DatetimeField()
+    study_status = fields.CharEnumField(StudyStatus)
+    priority = fields.CharField(max_length=20)
+    priority_rank = fields.IntField()  # Lower is more urgent
+    report_id = fields.IntField(null=True)
+    report_status = fields.CharEnumField(ReportStatus, null=True)  # Null until someone starts the report
+    radiologist_id = fields.IntField(null=True)
+    critical_findings = fields.BooleanField(default=False)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "worklist"
+        indexes = (
+            ("priority_rank", "study_date"),
+            ("radiologist_id", "priority_rank", "study_date"),
+            ("modality", "priority_rank", "study_date"),
+            ("department_id", "priority_rank", "study_date"),
+            ("priority", "study_date"),
+            ("patient_id",),
+            ("referring_physician_id",),
+            ("room_id",),
+        )
+
+class WorklistEntry_Pydantic(pydantic_model_creator(WorklistEntry, name="WorklistEntryBase")):
+    # pydantic_model_creator leaves out relation ids, and the study id is the key clients page on
+    study_id: int
+
 class ScheduleStatus(str, enum.Enum):
     SCHEDULED = "scheduled"
     COMPLETED = "completed"
@@ -304,10 +397,41 @@ class Schedule(models.Model):
     notes = fields.TextField(null=True)
     is_recurring = fields.BooleanField(default=False)
     recurrence_pattern = fields.CharField(max_length=50, null=True)  # e.g., "weekly", "monthly"
+    recurrence_rule = fields.CharField(max_length=255, null=True)  # RRULE, e.g. "FREQ=WEEKLY;BYDAY=MO,WE"
+    recurrence_end = fields.DateField(null=True)  # Last occurrence, null for open-ended series
     department = fields.ForeignKeyField('models.Department', related_name='schedules', null=True)
+    room = fields.ForeignKeyField('models.Room', related_name='schedules', null=True)
+    equipment = fields.ForeignKeyField('models.Equipment', related_name='schedules', null=True)
 
     class Meta:
         table = "schedules"
+        indexes = (
+            ("user_id", "date", "start_time"),
+            ("department_id", "date", "start_time"),
+            ("room_id", "date", "start_time"),
+            ("equipment_id", "date", "start_time"),
+            ("status", "date", "start_time"),
+            ("date", "start_time"),
+            ("is_recurring", "date"),
+        )
+
+class ScheduleException(models.Model):
+    # Cancels or changes a single occurrence of a recurring schedule
+    id = fields.IntField(pk=True)
+    schedule = fields.ForeignKeyField('models.Schedule', related_name='exceptions')
+    original_date = fields.DateField()
+    is_cancelled = fields.BooleanField(default=False)
+    new_date = fields.DateField(null=True)
+    start_time = fields.TimeField(null=True)
+    end_time = fields.TimeField(null=True)
+    status = fields.CharEnumField(ScheduleStatus, null=True)
+    notes = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "schedule_exceptions"
+        unique_together = (("schedule_id", "original_date"),)
+        indexes = (("new_date",),)
 
 class AnnotationType(str, enum.Enum):
     MEASUREMENT = "measurement"
@@ -343,10 +467,18 @@ class ImageAnnotation(models.Model):
 
     class Meta:
         table = "image_annotations"
+        indexes = (
+            ("study_id", "created_at"),
+            ("created_by_id", "created_at"),
+            ("type", "created_at"),
+            ("status", "created_at"),
+            ("is_ai_generated", "created_at"),
+        )
 
 # Create Pydantic models
 Schedule_Pydantic = pydantic_model_creator(Schedule, name="Schedule")
 ScheduleIn_Pydantic = pydantic_model_creator(Schedule, name="ScheduleIn", exclude_readonly=True)
+ScheduleException_Pydantic = pydantic_model_creator(ScheduleException, name="ScheduleException")
 
 ImageAnnotation_Pydantic = pydantic_model_creator(ImageAnnotation, name="ImageAnnotation")
 ImageAnnotationIn_Pydantic = pydantic_model_creator(ImageAnnotation, name="ImageAnnotationIn", exclude_readonly=True)
@@ -383,6 +515,7 @@ class Technologist(models.Model):
 
     class Meta:
         table = "technologists"
+        indexes = (("department_id",), ("specialization",), ("status",))
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.role})"
@@ -417,6 +550,7 @@ class Insurance(models.Model):
 
     class Meta:
         table = "insurances"
+        indexes = (("patient_id",),)
 
     def __str__(self):
         return f"{self.provider_name} - {self.policy_number}"
@@ -448,6 +582,7 @@ class MedicalHistory(models.Model):
 
     class Meta:
         table = "medical_history"
+        indexes = (("patient_id", "diagnosis_date"),)
 
     def __str__(self):
         return f"{self.condition} ({self.status})"
@@ -476,6 +611,7 @@ class Allergy(models.Model):
 
     class Meta:
         table = "allergies"
+        indexes = (("patient_id", "is_active"),)
 
     def __str__(self):
         return f"{self.allergen} ({self.severity})"
@@ -520,6 +656,7 @@ class Billing(models.Model):
 
     class Meta:
         table = "billings"
+        indexes = (("patient_id", "is_paid"), ("study_id",), ("billing_date",))
 
     def __str__(self):
         return f"Billing {self.id} - {self.patient.first_name} {self.patient.last_name}"
@@ -540,6 +677,7 @@ class Payment(models.Model):
 
     class Meta:
         table = "payments"
+        indexes = (("billing_id",), ("status",), ("payment_date",))
 
     def __str__(self):
         return f"Payment {self.id} - {self.billing.patient.first_name} {self.billing.patient.last_name}"
@@ -591,6 +729,7 @@ class QualityControl(models.Model):
 
     class Meta:
         table = "quality_controls"
+        indexes = (("status",), ("study_id",), ("equipment_id",), ("report_id",), ("created_at",))
 
     def __str__(self):
         return f"QC {self.id} - {self.type} ({self.status})"
@@ -631,6 +770,12 @@ class ProtocolTemplate(models.Model):
 
     class Meta:
         table = "protocol_templates"
+        indexes = (
+            ("category", "is_active"),
+            ("equipment_type", "is_active"),
+            ("department_id", "is_active"),
+            ("is_active",),
+        )
 
     def __str__(self):
         return f"{self.name} ({self.category})"
@@ -681,6 +826,7 @@ class Supply(models.Model):
 
     class Meta:
         table = "supplies"
+        indexes = (("department_id",), ("category",), ("status",), ("expiration_date",))
 
     def __str__(self):
         return f"{self.name} ({self.category})"
@@ -709,6 +855,11 @@ class InventoryTransaction(models.Model):
 
     class Meta:
         table = "inventory_transactions"
+        indexes = (
+            ("supply_id", "transaction_date"),
+            ("department_id", "transaction_date"),
+            ("transaction_date",),
+        )
 
     def __str__(self):
         return f"{self.transaction_type} - {self.supply.name}"
@@ -730,10 +881,17 @@ class InventoryAlert(models.Model):
     updated_at = fields.DatetimeField(auto_now=True)
     acknowledged_at = fields.DatetimeField(null=True)
     acknowledged_by = fields.ForeignKeyField('models.User', related_name='acknowledged_alerts', null=True)
+    resolved_at = fields.DatetimeField(null=True)  # Set once the condition clears; open alerts have none
     department = fields.ForeignKeyField('models.Department', related_name='inventory_alerts')
 
     class Meta:
         table = "inventory_alerts"
+        indexes = (
+            ("is_active", "alert_type"),
+            ("supply_id", "alert_type", "resolved_at"),
+            ("alert_type", "resolved_at", "department_id"),
+            ("department_id",),
+        )
 
     def __str__(self):
         return f"{self.alert_type} - {self.supply.name}"
@@ -776,7 +934,7 @@ class AuditModule(str, enum.Enum):
 
 class AuditLog(models.Model):
     id = fields.IntField(pk=True)
-    user = fields.ForeignKeyField('models.User', related_name='audit_logs')
+    user = fields.ForeignKeyField('models.User', related_name='audit_logs', null=True)  # Null for unauthenticated access
     action = fields.CharEnumField(AuditAction)
     module = fields.CharEnumField(AuditModule)
     description = fields.TextField()
@@ -791,6 +949,13 @@ class AuditLog(models.Model):
 
     class Meta:
         table = "audit_logs"
+        indexes = (
+            ("created_at",),
+            ("user_id", "module"),
+            ("user_id", "created_at"),
+            ("module", "created_at"),
+            ("resource_type", "resource_id"),
+        )
 
     def __str__(self):
         return f"{self.action} - {self.module} by {self.user.name}"
@@ -822,6 +987,7 @@ class ComplianceRecord(models.Model):
 
     class Meta:
         table = "compliance_records"
+        indexes = (("status", "due_date"), ("department_id",))
 
     def __str__(self):
         return f"{self.title} - {self.regulation}"
@@ -861,6 +1027,7 @@ class IncidentReport(models.Model):
 
     class Meta:
         table = "incident_reports"
+        indexes = (("status",), ("department_id",), ("incident_date",))
 
     def __str__(self):
         return f"{self.title} - {self.severity}"
@@ -903,6 +1070,7 @@ class Document(models.Model):
     file_path = fields.TextField()  # Path to the stored file
     file_type = fields.CharField(max_length=50)  # e.g., "pdf", "docx"
     file_size = fields.IntField()  # Size in bytes
+    checksum = fields.CharField(max_length=64, null=True)  # SHA-256 of the stored file
     version = fields.CharField(max_length=20, default="1.0")
     department = fields.ForeignKeyField('models.Department', related_name='documents')
     created_by = fields.ForeignKeyField('models.User', related_name='created_documents')
@@ -918,6 +1086,9 @@ class Document(models.Model):
 
     class Meta:
         table = "documents"
+        indexes = (
+            ("department_id",), ("category",), ("created_at",), ("expiration_date",), ("checksum",),
+        )
 
     def __str__(self):
         return f"{self.title} (v{self.version})"
@@ -928,6 +1099,7 @@ class DocumentVersion(models.Model):
     version_number = fields.CharField(max_length=20)
     file_path = fields.TextField()
     file_size = fields.IntField()
+    checksum = fields.CharField(max_length=64, null=True)  # SHA-256 of the stored file
     changes = fields.TextField(null=True)  # Description of changes
     created_by = fields.ForeignKeyField('models.User', related_name='created_versions')
     created_at = fields.DatetimeField(auto_now_add=True)
@@ -935,6 +1107,7 @@ class DocumentVersion(models.Model):
 
     class Meta:
         table = "document_versions"
+        indexes = (("document_id",), ("checksum",))
 
     def __str__(self):
         return f"{self.document.title} v{self.version_number}"
@@ -951,20 +1124,55 @@ class DocumentShare(models.Model):
 
     class Meta:
         table = "document_shares"
+        indexes = (("shared_with_id", "is_active"), ("shared_by_id", "is_active"))
 
     def __str__(self):
         return f"{self.document.title} shared with {self.shared_with.name}"
 
 # Create Pydantic models for Document Management
 Document_Pydantic = pydantic_model_creator(Document, name="Document")
-DocumentIn_Pydantic = pydantic_model_creator(Document, name="DocumentIn", exclude_readonly=True)
+# The blob fields are set by uploads only; a client-supplied path or checksum would break blob reference counts
+DOCUMENT_BLOB_FIELDS = ("file_path", "file_size", "checksum")
+DocumentIn_Pydantic = pydantic_model_creator(
+    Document, name="DocumentIn", exclude_readonly=True, exclude=DOCUMENT_BLOB_FIELDS
+)
 
 DocumentVersion_Pydantic = pydantic_model_creator(DocumentVersion, name="DocumentVersion")
-DocumentVersionIn_Pydantic = pydantic_model_creator(DocumentVersion, name="DocumentVersionIn", exclude_readonly=True)
+DocumentVersionIn_Pydantic = pydantic_model_creator(
+    DocumentVersion, name="DocumentVersionIn", exclude_readonly=True, exclude=DOCUMENT_BLOB_FIELDS
+)
 
 DocumentShare_Pydantic = pydantic_model_creator(DocumentShare, name="DocumentShare")
 DocumentShareIn_Pydantic = pydantic_model_creator(DocumentShare, name="DocumentShareIn", exclude_readonly=True)
 
+# --- Outbound Mail Queue ---
+class EmailStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class OutboundEmail(models.Model):
+    id = fields.IntField(pk=True)
+    recipient = fields.CharField(max_length=255)
+    subject = fields.CharField(max_length=255)
+    body = fields.TextField()
+    status = fields.CharEnumField(EmailStatus, default=EmailStatus.PENDING)
+    attempts = fields.IntField(default=0)
+    next_attempt_at = fields.DatetimeField()
+    locked_until = fields.DatetimeField(null=True)  # Lease held by the worker that claimed the message
+    last_error = fields.TextField(null=True)
+    sent_at = fields.DatetimeField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "outbound_emails"
+        indexes = (("status", "next_attempt_at"), ("status", "locked_until"))
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
+
 class UserCreate(BaseModel):
     name: str
     email: str
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Allergy, Allergy_Pydantic, AllergyIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/allergies",
@@ -23,8 +25,10 @@ async def get_allergy(allergy_id: int):
 
 @router.get("/", response_model=List[Allergy_Pydantic])
 async def get_allergies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     patient_id: Optional[int] = None,
     allergen: Optional[str] = None,
     severity: Optional[str] = None,
@@ -45,7 +49,9 @@ async def get_allergies(
         query = query.filter(onset_date__gte=start_date)
     if end_date:
         query = query.filter(onset_date__lte=end_date)
-    return await Allergy_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(Allergy_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{allergy_id}", response_model=Allergy_Pydantic)
 async def update_allergy(allergy_id: int, allergy: AllergyIn_Pydantic):
@@ -64,10 +70,10 @@ async def delete_allergy(allergy_id: int):
 
 @router.get("/patient/{patient_id}", response_model=List[Allergy_Pydantic])
 async def get_patient_allergies(patient_id: int):
-    return await Allergy_Pydantic.from_queryset(Allergy.filter(patient_id=patient_id))
+    return await serialize_queryset(Allergy_Pydantic, Allergy.filter(patient_id=patient_id))
 
 @router.get("/patient/{patient_id}/active", response_model=List[Allergy_Pydantic])
 async def get_patient_active_allergies(patient_id: int):
-    return await Allergy_Pydantic.from_queryset(
+    return await serialize_queryset(Allergy_Pydantic,
         Allergy.filter(patient_id=patient_id, is_active=True)
     ) 
\ No newline at end of file
@@ -1,6 +1,15 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from backend.models.tortoise_models import Appointment, Appointment_Pydantic, AppointmentIn_Pydantic
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from datetime import date, timedelta
+from tortoise import timezone
+from backend.models.tortoise_models import Appointment, Appointment_Pydantic, ProtocolTemplate
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.slots import find_available_slots, DEFAULT_DURATION_MINUTES
+from backend.schemas.appointment import AppointmentCreate, AppointmentUpdate, AvailableSlot
+
+# Longest window a single slot search may cover
+MAX_SLOT_SEARCH_DAYS = 31
 
 router = APIRouter(
     prefix="/appointments",
@@ -9,10 +18,48 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=Appointment_Pydantic)
-async def create_appointment(appointment: AppointmentIn_Pydantic):
+async def create_appointment(appointment: AppointmentCreate):
     appointment_obj = await Appointment.create(**appointment.dict(exclude_unset=True))
     return await Appointment_Pydantic.from_tortoise_orm(appointment_obj)
 
+@router.get("/slots", response_model=List[AvailableSlot])
+async def find_slots(
+    equipment_type: Optional[str] = None,
+    protocol_id: Optional[int] = None,
+    duration_minutes: Optional[int] = Query(None, ge=5, le=24 * 60),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    equipment_id: Optional[int] = None,
+    department_id: Optional[int] = None,
+    require_staff: bool = True,
+    limit: int = Query(10, ge=1, le=100)
+):
+    # Free slots where the room, the equipment and on-shift staff are all available, earliest first
+    if protocol_id is not None:
+        protocol = await ProtocolTemplate.get_or_none(id=protocol_id)
+        if not protocol:
+            raise HTTPException(status_code=404, detail="Protocol template not found")
+        equipment_type = equipment_type or protocol.equipment_type
+        duration_minutes = duration_minutes or protocol.estimated_duration
+
+    start_date = start_date or timezone.localtime().date()
+    end_date = end_date or start_date + timedelta(days=6)
+    if end_date < start_date or (end_date - start_date).days >= MAX_SLOT_SEARCH_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"end_date must be on or after start_date and within {MAX_SLOT_SEARCH_DAYS} days of it"
+        )
+    return await find_available_slots(
+        duration_minutes or DEFAULT_DURATION_MINUTES,
+        start_date,
+        end_date,
+        equipment_type=equipment_type,
+        equipment_id=equipment_id,
+        department_id=department_id,
+        require_staff=require_staff,
+        limit=limit,
+    )
+
 @router.get("/{appointment_id}", response_model=Appointment_Pydantic)
 async def get_appointment(appointment_id: int):
     appointment = await Appointment.get_or_none(id=appointment_id)
@@ -21,11 +68,18 @@ async def get_appointment(appointment_id: int):
     return await Appointment_Pydantic.from_tortoise_orm(appointment)
 
 @router.get("/", response_model=List[Appointment_Pydantic])
-async def get_appointments():
-    return await Appointment_Pydantic.from_queryset(Appointment.all())
+async def get_appointments(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None
+):
+    page = await serialize_queryset(Appointment_Pydantic, paginate(Appointment.all(), skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{appointment_id}", response_model=Appointment_Pydantic)
-async def update_appointment(appointment_id: int, appointment: AppointmentIn_Pydantic):
+async def update_appointment(appointment_id: int, appointment: AppointmentUpdate):
     appointment_obj = await Appointment.get_or_none(id=appointment_id)
     if not appointment_obj:
         raise HTTPException(status_code=404, detail="Appointment not found")
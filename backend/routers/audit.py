@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date, datetime
 from backend.models.tortoise_models import (
@@ -7,6 +7,12 @@ from backend.models.tortoise_models import (
     IncidentReport, IncidentReport_Pydantic, IncidentReportIn_Pydantic,
     AuditAction, AuditModule, ComplianceStatus, IncidentSeverity, IncidentStatus
 )
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.filters import date_range
+from backend.crud.audit_partitions import query_audit_logs
+from backend.schemas.audit import AuditEventCreate
+from backend.services.audit import audit_event, record_audit_event
 
 router = APIRouter(
     prefix="/audit",
@@ -20,10 +26,20 @@ async def create_audit_log(log: AuditLogIn_Pydantic):
     log_obj = await AuditLog.create(**log.dict(exclude_unset=True))
     return await AuditLog_Pydantic.from_tortoise_orm(log_obj)
 
+@router.post("/logs/batch", status_code=202)
+async def create_audit_logs(events: List[AuditEventCreate]):
+    # Queued for the batched writer; rows appear within AUDIT_FLUSH_INTERVAL
+    for event in events:
+        values = event.dict()
+        await record_audit_event(audit_event(values.pop("action"), values.pop("module"), values.pop("description"), **values))
+    return {"queued": len(events)}
+
 @router.get("/logs", response_model=List[AuditLog_Pydantic])
 async def get_audit_logs(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     user_id: Optional[int] = None,
     action: Optional[AuditAction] = None,
     module: Optional[AuditModule] = None,
@@ -33,24 +49,23 @@ async def get_audit_logs(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    query = AuditLog.all()
+    # Routed across monthly partitions and, for date ranges reaching that far back, the archive
+    filters = {}
     if user_id:
-        query = query.filter(user_id=user_id)
+        filters["user_id"] = user_id
     if action:
-        query = query.filter(action=action)
+        filters["action"] = action
     if module:
-        query = query.filter(module=module)
+        filters["module"] = module
     if resource_id:
-        query = query.filter(resource_id=resource_id)
+        filters["resource_id"] = resource_id
     if resource_type:
-        query = query.filter(resource_type=resource_type)
+        filters["resource_type"] = resource_type
     if department_id:
-        query = query.filter(department_id=department_id)
-    if start_date:
-        query = query.filter(created_at__date__gte=start_date)
-    if end_date:
-        query = query.filter(created_at__date__lte=end_date)
-    return await AuditLog_Pydantic.from_queryset(query.offset(skip).limit(limit))
+        filters["department_id"] = department_id
+    page = await query_audit_logs(filters, start_date, end_date, skip, limit, after)
+    set_next_cursor(response, page, limit, after)
+    return page
 
 # Compliance Record endpoints
 @router.post("/compliance", response_model=ComplianceRecord_Pydantic)
@@ -67,8 +82,10 @@ async def get_compliance_record(record_id: int):
 
 @router.get("/compliance", response_model=List[ComplianceRecord_Pydantic])
 async def get_compliance_records(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     status: Optional[ComplianceStatus] = None,
     regulation: Optional[str] = None,
     department_id: Optional[int] = None,
@@ -89,7 +106,9 @@ async def get_compliance_records(
         query = query.filter(due_date__lte=due_date_before)
     if due_date_after:
         query = query.filter(due_date__gte=due_date_after)
-    return await ComplianceRecord_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(ComplianceRecord_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/compliance/{record_id}", response_model=ComplianceRecord_Pydantic)
 async def update_compliance_record(record_id: int, record: ComplianceRecordIn_Pydantic):
@@ -114,8 +133,10 @@ async def get_incident_report(incident_id: int):
 
 @router.get("/incidents", response_model=List[IncidentReport_Pydantic])
 async def get_incident_reports(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     severity: Optional[IncidentSeverity] = None,
     status: Optional[IncidentStatus] = None,
     department_id: Optional[int] = None,
@@ -135,11 +156,10 @@ async def get_incident_reports(
         query = query.filter(reported_by_id=reported_by)
     if assigned_to:
         query = query.filter(assigned_to_id=assigned_to)
-    if start_date:
-        query = query.filter(incident_date__date__gte=start_date)
-    if end_date:
-        query = query.filter(incident_date__date__lte=end_date)
-    return await IncidentReport_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    query = query.filter(**date_range("incident_date", start_date, end_date))
+    page = await serialize_queryset(IncidentReport_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/incidents/{incident_id}", response_model=IncidentReport_Pydantic)
 async def update_incident_report(incident_id: int, incident: IncidentReportIn_Pydantic):
@@ -153,7 +173,7 @@ async def update_incident_report(incident_id: int, incident: IncidentReportIn_Py
 @router.get("/compliance/overdue", response_model=List[ComplianceRecord_Pydantic])
 async def get_overdue_compliance_records():
     today = datetime.now().date()
-    return await ComplianceRecord_Pydantic.from_queryset(
+    return await serialize_queryset(ComplianceRecord_Pydantic,
         ComplianceRecord.filter(
             due_date__lt=today,
             status__in=[ComplianceStatus.PENDING_REVIEW, ComplianceStatus.NEEDS_ACTION]
@@ -162,7 +182,7 @@ async def get_overdue_compliance_records():
 
 @router.get("/incidents/active", response_model=List[IncidentReport_Pydantic])
 async def get_active_incidents():
-    return await IncidentReport_Pydantic.from_queryset(
+    return await serialize_queryset(IncidentReport_Pydantic,
         IncidentReport.filter(
             status__in=[
                 IncidentStatus.REPORTED,
@@ -173,7 +193,6 @@ async def get_active_incidents():
     )
 
 @router.get("/logs/user/{user_id}", response_model=List[AuditLog_Pydantic])
-async def get_user_audit_logs(user_id: int):
-    return await AuditLog_Pydantic.from_queryset(
-        AuditLog.filter(user_id=user_id)
-    ) 
\ No newline at end of file
+async def get_user_audit_logs(user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    # A user's full history, archived months included
+    return await query_audit_logs({"user_id": user_id}, start_date, end_date, limit=None, search_archive=True)
\ No newline at end of file
@@ -1,16 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from backend.models.tortoise_models import User, User_Pydantic
+from backend.services.passwords import verify_password
+from backend.services.principals import Principal, get_principal, principal_cache
+from backend.services.mailer import enqueue_email
 from pydantic import BaseModel, EmailStr
 import os
 from dotenv import load_dotenv
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 
 load_dotenv()
 
@@ -25,13 +24,6 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Email configuration
-SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
-SMTP_USERNAME = os.getenv("SMTP_USERNAME")
-SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 class Token(BaseModel):
@@ -45,9 +37,6 @@ class TokenData(BaseModel):
 class ForgotPasswordRequest(BaseModel):
     email: EmailStr
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -73,7 +62,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user = await User.get_or_none(email=token_data.email)
+    user = await get_principal(token_data.email)
     if user is None:
         raise credentials_exception
     return user
@@ -81,7 +70,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await User.get_or_none(email=form_data.username)
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
@@ -91,6 +80,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     # Update last login
     user.last_login = datetime.utcnow()
     await user.save()
+    principal_cache.invalidate_user(user.id)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -106,15 +96,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 
 @router.post("/verify-token")
 async def verify_token(token: str = Depends(oauth2_scheme)):
-    user = await get_current_user(token)
-    return {"user": await User_Pydantic.from_tortoise_orm(user)}
+    return {"user": await get_current_user(token)}
 
 async def send_reset_email(email: str, reset_token: str):
-    msg = MIMEMultipart()
-    msg['From'] = SMTP_USERNAME
-    msg['To'] = email
-    msg['Subject'] = "Password Reset Request"
-    
     reset_link = f"http://localhost:3000/reset-password?token={reset_token}"
     body = f"""
     Hello,
@@ -129,19 +113,11 @@ async def send_reset_email(email: str, reset_token: str):
     Your App Team
     """
     
-    msg.attach(MIMEText(body, 'plain'))
-    
-    try:
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+    # Delivered by the mail queue worker, with retries
+    await enqueue_email(email, "Password Reset Request", body)
 
 @router.post("/forgot-password")
-async def forgot_password(request: ForgotPasswordRequest, background_tasks: BackgroundTasks):
+async def forgot_password(request: ForgotPasswordRequest):
     user = await User.get_or_none(email=request.email)
     if not user:
         # Don't reveal if email exists or not
@@ -153,11 +129,11 @@ async def forgot_password(request: ForgotPasswordRequest, background_tasks: Back
         expires_delta=timedelta(hours=1)
     )
     
-    # Send email in background
-    background_tasks.add_task(send_reset_email, user.email, reset_token)
+    # Queue the email; delivery happens outside the request
+    await send_reset_email(user.email, reset_token)
     
     return {"message": "If your email is registered, you will receive password reset instructions"}
 
 @router.get("/me", response_model=User_Pydantic)
-async def read_users_me(current_user: User = Depends(get_current_user)):
-    return await User_Pydantic.from_tortoise_orm(current_user) 
\ No newline at end of file
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
+    return current_user 
\ No newline at end of file
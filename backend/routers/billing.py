@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Billing, Billing_Pydantic, BillingIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/billing",
@@ -23,8 +25,10 @@ async def get_billing(billing_id: int):
 
 @router.get("/", response_model=List[Billing_Pydantic])
 async def get_billings(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     patient_id: Optional[int] = None,
     study_id: Optional[int] = None,
     insurance_id: Optional[int] = None,
@@ -45,7 +49,9 @@ async def get_billings(
         query = query.filter(billing_date__gte=start_date)
     if end_date:
         query = query.filter(billing_date__lte=end_date)
-    return await Billing_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(Billing_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{billing_id}", response_model=Billing_Pydantic)
 async def update_billing(billing_id: int, billing: BillingIn_Pydantic):
@@ -64,10 +70,10 @@ async def delete_billing(billing_id: int):
 
 @router.get("/patient/{patient_id}", response_model=List[Billing_Pydantic])
 async def get_patient_billings(patient_id: int):
-    return await Billing_Pydantic.from_queryset(Billing.filter(patient_id=patient_id))
+    return await serialize_queryset(Billing_Pydantic, Billing.filter(patient_id=patient_id))
 
 @router.get("/patient/{patient_id}/unpaid", response_model=List[Billing_Pydantic])
 async def get_patient_unpaid_billings(patient_id: int):
-    return await Billing_Pydantic.from_queryset(
+    return await serialize_queryset(Billing_Pydantic,
         Billing.filter(patient_id=patient_id, is_paid=False)
     ) 
\ No newline at end of file
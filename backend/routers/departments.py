@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from backend.models.tortoise_models import Department, Department_Pydantic, DepartmentIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/departments",
@@ -22,12 +24,18 @@ async def get_department(department_id: int):
 
 @router.get("/", response_model=List[Department_Pydantic])
 async def get_departments(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
     status: Optional[str] = Query(None)
 ):
     query = Department.all()
     if status is not None:
         query = query.filter(status=status)
-    return await Department_Pydantic.from_queryset(query)
+    page = await serialize_queryset(Department_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{department_id}", response_model=Department_Pydantic)
 async def update_department(department_id: int, department: DepartmentIn_Pydantic):
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form, Request, Response
 from typing import List, Optional
 from datetime import date, datetime, timedelta
 import os
@@ -8,6 +8,11 @@ from backend.models.tortoise_models import (
     DocumentShare, DocumentShare_Pydantic, DocumentShareIn_Pydantic,
     DocumentCategory, DocumentStatus
 )
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.filters import date_range
+from backend.services.storage import stored_blob, stored_upload, release_blob
+from backend.services.downloads import file_download
 
 router = APIRouter(
     prefix="/documents",
@@ -28,30 +33,26 @@ async def create_document(
     is_public: bool = Form(False),
     parent_document_id: Optional[int] = Form(None)
 ):
-    # Save the file
-    file_path = f"uploads/documents/{file.filename}"
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-    
-    # Create document record
-    document_data = {
-        "title": title,
-        "description": description,
-        "category": category,
-        "department_id": department_id,
-        "created_by_id": created_by_id,
-        "file_path": file_path,
-        "file_type": file.content_type,
-        "file_size": len(content),
-        "tags": tags.split(",") if tags else None,
-        "is_public": is_public,
-        "parent_document_id": parent_document_id
-    }
-    
-    document = await Document.create(**document_data)
+    # Store the file once per distinct content
+    async with stored_upload(file) as (file_path, file_size, checksum):
+        # Create document record
+        document_data = {
+            "title": title,
+            "description": description,
+            "category": category,
+            "department_id": department_id,
+            "created_by_id": created_by_id,
+            "updated_by_id": created_by_id,
+            "file_path": file_path,
+            "file_type": file.content_type,
+            "file_size": file_size,
+            "checksum": checksum,
+            "tags": tags.split(",") if tags else None,
+            "metadata": {"filename": file.filename},
+            "is_public": is_public,
+            "parent_document_id": parent_document_id
+        }
+        document = await Document.create(**document_data)
     return await Document_Pydantic.from_tortoise_orm(document)
 
 @router.get("/{document_id}", response_model=Document_Pydantic)
@@ -61,10 +62,24 @@ async def get_document(document_id: int):
         raise HTTPException(status_code=404, detail="Document not found")
     return await Document_Pydantic.from_tortoise_orm(document)
 
+@router.get("/{document_id}/download")
+async def download_document(document_id: int, request: Request):
+    document = await Document.get_or_none(id=document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    # Served from the blob store by checksum, never from a stored path
+    path = stored_blob(document.checksum)
+    if path is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    filename = (document.metadata or {}).get("filename")
+    return await file_download(request, path, document.checksum, document.file_type, filename)
+
 @router.get("/", response_model=List[Document_Pydantic])
 async def get_documents(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     category: Optional[DocumentCategory] = None,
     status: Optional[DocumentStatus] = None,
     department_id: Optional[int] = None,
@@ -91,11 +106,10 @@ async def get_documents(
         query = query.filter(tags__contains=tag_list)
     if is_public is not None:
         query = query.filter(is_public=is_public)
-    if start_date:
-        query = query.filter(created_at__date__gte=start_date)
-    if end_date:
-        query = query.filter(created_at__date__lte=end_date)
-    return await Document_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    query = query.filter(**date_range("created_at", start_date, end_date))
+    page = await serialize_queryset(Document_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{document_id}", response_model=Document_Pydantic)
 async def update_document(document_id: int, document: DocumentIn_Pydantic):
@@ -111,12 +125,21 @@ async def delete_document(document_id: int):
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Delete the file
-    if os.path.exists(document.file_path):
+    # Blobs of the document and its versions, collected before the versions cascade away
+    checksums = set(await DocumentVersion.filter(document_id=document_id).values_list("checksum", flat=True))
+    checksums.add(document.checksum)
+    checksums.discard(None)
+
+    # Files stored before content addressing belong to this document alone
+    if document.checksum is None and os.path.exists(document.file_path):
         os.remove(document.file_path)
     
     # Delete the document record
     await document.delete()
+
+    # Shared blobs stay until their last reference is gone
+    for checksum in checksums:
+        await release_blob(checksum)
     return {"message": "Document deleted successfully"}
 
 # Document Version endpoints
@@ -131,25 +154,19 @@ async def create_document_version(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Save the new version file
-    file_path = f"uploads/documents/versions/{file.filename}"
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-    
-    # Create version record
-    version_data = {
-        "document_id": document_id,
-        "version_number": str(float(document.version) + 0.1),
-        "file_path": file_path,
-        "file_size": len(content),
-        "changes": changes,
-        "created_by_id": created_by_id
-    }
-    
-    version = await DocumentVersion.create(**version_data)
+    # Store the new version file once per distinct content
+    async with stored_upload(file) as (file_path, file_size, checksum):
+        # Create version record
+        version_data = {
+            "document_id": document_id,
+            "version_number": str(float(document.version) + 0.1),
+            "file_path": file_path,
+            "file_size": file_size,
+            "checksum": checksum,
+            "changes": changes,
+            "created_by_id": created_by_id
+        }
+        version = await DocumentVersion.create(**version_data)
     
     # Update document version
     document.version = version.version_number
@@ -159,10 +176,20 @@ async def create_document_version(
 
 @router.get("/{document_id}/versions", response_model=List[DocumentVersion_Pydantic])
 async def get_document_versions(document_id: int):
-    return await DocumentVersion_Pydantic.from_queryset(
+    return await serialize_queryset(DocumentVersion_Pydantic,
         DocumentVersion.filter(document_id=document_id)
     )
 
+@router.get("/{document_id}/versions/{version_id}/download")
+async def download_document_version(document_id: int, version_id: int, request: Request):
+    version = await DocumentVersion.get_or_none(id=version_id, document_id=document_id).prefetch_related("document")
+    if not version:
+        raise HTTPException(status_code=404, detail="Document version not found")
+    path = stored_blob(version.checksum)
+    if path is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return await file_download(request, path, version.checksum, version.document.file_type)
+
 # Document Share endpoints
 @router.post("/{document_id}/share", response_model=DocumentShare_Pydantic)
 async def share_document(share: DocumentShareIn_Pydantic):
@@ -173,7 +200,7 @@ async def share_document(share: DocumentShareIn_Pydantic):
 async def get_shared_documents(user_id: int):
     shares = await DocumentShare.filter(shared_with_id=user_id, is_active=True)
     document_ids = [share.document_id for share in shares]
-    return await Document_Pydantic.from_queryset(
+    return await serialize_queryset(Document_Pydantic,
         Document.filter(id__in=document_ids)
     )
 
@@ -181,26 +208,26 @@ async def get_shared_documents(user_id: int):
 async def get_documents_shared_by_me(user_id: int):
     shares = await DocumentShare.filter(shared_by_id=user_id, is_active=True)
     document_ids = [share.document_id for share in shares]
-    return await Document_Pydantic.from_queryset(
+    return await serialize_queryset(Document_Pydantic,
         Document.filter(id__in=document_ids)
     )
 
 # Additional utility endpoints
 @router.get("/category/{category}", response_model=List[Document_Pydantic])
 async def get_documents_by_category(category: DocumentCategory):
-    return await Document_Pydantic.from_queryset(
+    return await serialize_queryset(Document_Pydantic,
         Document.filter(category=category)
     )
 
 @router.get("/department/{department_id}", response_model=List[Document_Pydantic])
 async def get_department_documents(department_id: int):
-    return await Document_Pydantic.from_queryset(
+    return await serialize_queryset(Document_Pydantic,
         Document.filter(department_id=department_id)
     )
 
 @router.get("/expiring-soon", response_model=List[Document_Pydantic])
 async def get_expiring_documents():
     thirty_days_from_now = datetime.now().date() + timedelta(days=30)
-    return await Document_Pydantic.from_queryset(
+    return await serialize_queryset(Document_Pydantic,
         Document.filter(expiration_date__lte=thirty_days_from_now)
     ) 
\ No newline at end of file
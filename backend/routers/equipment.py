@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Equipment_Pydantic, EquipmentIn_Pydantic
 from backend.crud import equipment as equipment_crud
+from backend.crud.pagination import set_next_cursor
+from backend.crud.worklist import refresh_worklist_where
 
 router = APIRouter(
     prefix="/equipment",
@@ -23,19 +25,25 @@ async def read_equipment(equipment_id: int):
 
 @router.get("/", response_model=List[Equipment_Pydantic])
 async def read_equipment_list(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     status: Optional[str] = None,
     type: Optional[str] = None,
     room_id: Optional[int] = None
 ):
-    return await equipment_crud.get_all_equipment(skip, limit, status, type, room_id)
+    page = await equipment_crud.get_all_equipment(skip, limit, status, type, room_id, after=after)
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{equipment_id}", response_model=Equipment_Pydantic)
 async def update_equipment(equipment_id: int, equipment: EquipmentIn_Pydantic):
     updated_equipment = await equipment_crud.update_equipment(equipment_id, equipment)
     if updated_equipment is None:
         raise HTTPException(status_code=404, detail="Equipment not found")
+    # The worklist shows the equipment type as the study's modality
+    await refresh_worklist_where(study__equipment_id=equipment_id)
     return updated_equipment
 
 @router.delete("/{equipment_id}")
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from backend.models.tortoise_models import ImageAnnotation_Pydantic, ImageAnnotationIn_Pydantic
 from backend.crud import image_annotation as annotation_crud
+from backend.crud.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/annotations",
@@ -22,17 +23,21 @@ async def read_annotation(annotation_id: int):
 
 @router.get("/", response_model=List[ImageAnnotation_Pydantic])
 async def read_annotations(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     study_id: Optional[int] = None,
     created_by: Optional[int] = None,
     type: Optional[str] = None,
     status: Optional[str] = None,
     is_ai_generated: Optional[bool] = None
 ):
-    return await annotation_crud.get_all_annotations(
-        skip, limit, study_id, created_by, type, status, is_ai_generated
+    page = await annotation_crud.get_all_annotations(
+        skip, limit, study_id, created_by, type, status, is_ai_generated, after=after
     )
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{annotation_id}", response_model=ImageAnnotation_Pydantic)
 async def update_annotation(annotation_id: int, annotation: ImageAnnotationIn_Pydantic):
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Insurance, Insurance_Pydantic, InsuranceIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/insurances",
@@ -23,8 +25,10 @@ async def get_insurance(insurance_id: int):
 
 @router.get("/", response_model=List[Insurance_Pydantic])
 async def get_insurances(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     patient_id: Optional[int] = None,
     provider_name: Optional[str] = None,
     status: Optional[str] = None,
@@ -45,7 +49,9 @@ async def get_insurances(
         query = query.filter(start_date__gte=start_date)
     if end_date:
         query = query.filter(end_date__lte=end_date)
-    return await Insurance_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(Insurance_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{insurance_id}", response_model=Insurance_Pydantic)
 async def update_insurance(insurance_id: int, insurance: InsuranceIn_Pydantic):
@@ -64,4 +70,4 @@ async def delete_insurance(insurance_id: int):
 
 @router.get("/patient/{patient_id}", response_model=List[Insurance_Pydantic])
 async def get_patient_insurances(patient_id: int):
-    return await Insurance_Pydantic.from_queryset(Insurance.filter(patient_id=patient_id)) 
\ No newline at end of file
+    return await serialize_queryset(Insurance_Pydantic, Insurance.filter(patient_id=patient_id)) 
\ No newline at end of file
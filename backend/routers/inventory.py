@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from backend.models.tortoise_models import (
     Supply, Supply_Pydantic, SupplyIn_Pydantic,
-    InventoryTransaction, InventoryTransaction_Pydantic, InventoryTransactionIn_Pydantic,
+    InventoryTransaction, InventoryTransaction_Pydantic,
     InventoryAlert, InventoryAlert_Pydantic, InventoryAlertIn_Pydantic,
     SupplyCategory, SupplyStatus, TransactionType, AlertType
 )
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.filters import date_range
+from backend.crud import inventory as inventory_crud
+from backend.schemas.inventory import InventoryTransactionCreate, StudySupplyIssue
+from backend.services.inventory_alerts import alert_engine
 
 router = APIRouter(
     prefix="/inventory",
@@ -18,8 +24,24 @@ router = APIRouter(
 @router.post("/supplies", response_model=Supply_Pydantic)
 async def create_supply(supply: SupplyIn_Pydantic):
     supply_obj = await Supply.create(**supply.dict(exclude_unset=True))
+    alert_engine.notify([supply_obj.id])
     return await Supply_Pydantic.from_tortoise_orm(supply_obj)
 
+# Served from open alerts, which the alert engine keeps current as stock moves and dates pass
+@router.get("/supplies/low-stock", response_model=List[Supply_Pydantic])
+async def get_low_stock_supplies(department_id: Optional[int] = None):
+    query = inventory_crud.with_open_alert(Supply.all(), [AlertType.LOW_STOCK])
+    if department_id:
+        query = query.filter(department_id=department_id)
+    return await serialize_queryset(Supply_Pydantic, query)
+
+@router.get("/supplies/expiring-soon", response_model=List[Supply_Pydantic])
+async def get_expiring_supplies(department_id: Optional[int] = None):
+    query = inventory_crud.with_open_alert(Supply.all(), [AlertType.EXPIRING, AlertType.EXPIRED])
+    if department_id:
+        query = query.filter(department_id=department_id)
+    return await serialize_queryset(Supply_Pydantic, query.order_by("expiration_date"))
+
 @router.get("/supplies/{supply_id}", response_model=Supply_Pydantic)
 async def get_supply(supply_id: int):
     supply = await Supply.get_or_none(id=supply_id)
@@ -29,8 +51,10 @@ async def get_supply(supply_id: int):
 
 @router.get("/supplies", response_model=List[Supply_Pydantic])
 async def get_supplies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     category: Optional[SupplyCategory] = None,
     status: Optional[SupplyStatus] = None,
     department_id: Optional[int] = None,
@@ -48,12 +72,12 @@ async def get_supplies(
     if search:
         query = query.filter(name__icontains=search)
     if low_stock:
-        query = query.filter(current_quantity__lte=Supply.minimum_quantity)
+        query = inventory_crud.with_open_alert(query, [AlertType.LOW_STOCK])
     if expiring_soon:
-        # Filter for items expiring in the next 30 days
-        thirty_days_from_now = datetime.now().date() + timedelta(days=30)
-        query = query.filter(expiration_date__lte=thirty_days_from_now)
-    return await Supply_Pydantic.from_queryset(query.offset(skip).limit(limit))
+        query = inventory_crud.with_open_alert(query, [AlertType.EXPIRING, AlertType.EXPIRED])
+    page = await serialize_queryset(Supply_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/supplies/{supply_id}", response_model=Supply_Pydantic)
 async def update_supply(supply_id: int, supply: SupplyIn_Pydantic):
@@ -61,6 +85,7 @@ async def update_supply(supply_id: int, supply: SupplyIn_Pydantic):
     if not supply_obj:
         raise HTTPException(status_code=404, detail="Supply not found")
     await supply_obj.update_from_dict(supply.dict(exclude_unset=True)).save()
+    alert_engine.notify([supply_id])
     return await Supply_Pydantic.from_tortoise_orm(supply_obj)
 
 @router.delete("/supplies/{supply_id}")
@@ -71,39 +96,51 @@ async def delete_supply(supply_id: int):
     return {"message": "Supply deleted successfully"}
 
 # Inventory Transaction endpoints
+async def _apply_transactions(transactions: List[InventoryTransactionCreate]) -> List[InventoryTransaction_Pydantic]:
+    try:
+        created = await inventory_crud.apply_transactions(transactions)
+    except inventory_crud.SupplyNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # Includes insufficient quantity; nothing from the request was applied
+        raise HTTPException(status_code=400, detail=str(e))
+    alert_engine.notify(transaction.supply_id for transaction in transactions)
+    return created
+
 @router.post("/transactions", response_model=InventoryTransaction_Pydantic)
-async def create_transaction(transaction: InventoryTransactionIn_Pydantic):
-    # Get the supply
-    supply = await Supply.get_or_none(id=transaction.supply_id)
-    if not supply:
-        raise HTTPException(status_code=404, detail="Supply not found")
-    
-    # Create transaction
-    transaction_obj = await InventoryTransaction.create(**transaction.dict(exclude_unset=True))
-    
-    # Update supply quantity based on transaction type
-    if transaction.transaction_type == TransactionType.RECEIVED:
-        supply.current_quantity += transaction.quantity
-    elif transaction.transaction_type == TransactionType.ISSUED:
-        if supply.current_quantity < transaction.quantity:
-            raise HTTPException(status_code=400, detail="Insufficient quantity")
-        supply.current_quantity -= transaction.quantity
-    
-    # Update supply status
-    if supply.current_quantity <= supply.minimum_quantity:
-        supply.status = SupplyStatus.LOW_STOCK
-    elif supply.current_quantity <= 0:
-        supply.status = SupplyStatus.OUT_OF_STOCK
-    else:
-        supply.status = SupplyStatus.IN_STOCK
-    
-    await supply.save()
-    return await InventoryTransaction_Pydantic.from_tortoise_orm(transaction_obj)
+async def create_transaction(transaction: InventoryTransactionCreate):
+    created = await _apply_transactions([transaction])
+    return created[0]
+
+@router.post("/transactions/batch", response_model=List[InventoryTransaction_Pydantic])
+async def create_transactions(transactions: List[InventoryTransactionCreate]):
+    # Applied in one database transaction: every line goes through or none does
+    if not transactions:
+        return []
+    return await _apply_transactions(transactions)
+
+@router.post("/studies/{study_id}/issue", response_model=List[InventoryTransaction_Pydantic])
+async def issue_study_supplies(study_id: int, issue: StudySupplyIssue):
+    # All contrast and consumables for one procedure in a single call
+    try:
+        created = await inventory_crud.issue_for_study(study_id, issue)
+    except inventory_crud.IssueRejected as e:
+        raise HTTPException(status_code=400, detail=e.problems)
+    except inventory_crud.SupplyNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if created is None:
+        raise HTTPException(status_code=404, detail="Study not found")
+    alert_engine.notify(item.supply_id for item in issue.items)
+    return created
 
 @router.get("/transactions", response_model=List[InventoryTransaction_Pydantic])
 async def get_transactions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     supply_id: Optional[int] = None,
     transaction_type: Optional[TransactionType] = None,
     department_id: Optional[int] = None,
@@ -117,11 +154,10 @@ async def get_transactions(
         query = query.filter(transaction_type=transaction_type)
     if department_id:
         query = query.filter(department_id=department_id)
-    if start_date:
-        query = query.filter(transaction_date__date__gte=start_date)
-    if end_date:
-        query = query.filter(transaction_date__date__lte=end_date)
-    return await InventoryTransaction_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    query = query.filter(**date_range("transaction_date", start_date, end_date))
+    page = await serialize_queryset(InventoryTransaction_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 # Inventory Alert endpoints
 @router.post("/alerts", response_model=InventoryAlert_Pydantic)
@@ -131,8 +167,10 @@ async def create_alert(alert: InventoryAlertIn_Pydantic):
 
 @router.get("/alerts", response_model=List[InventoryAlert_Pydantic])
 async def get_alerts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     supply_id: Optional[int] = None,
     alert_type: Optional[AlertType] = None,
     is_active: Optional[bool] = None,
@@ -147,7 +185,9 @@ async def get_alerts(
         query = query.filter(is_active=is_active)
     if department_id:
         query = query.filter(department_id=department_id)
-    return await InventoryAlert_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(InventoryAlert_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/alerts/{alert_id}/acknowledge", response_model=InventoryAlert_Pydantic)
 async def acknowledge_alert(alert_id: int, user_id: int):
@@ -162,21 +202,8 @@ async def acknowledge_alert(alert_id: int, user_id: int):
     return await InventoryAlert_Pydantic.from_tortoise_orm(alert)
 
 # Additional utility endpoints
-@router.get("/supplies/low-stock", response_model=List[Supply_Pydantic])
-async def get_low_stock_supplies():
-    return await Supply_Pydantic.from_queryset(
-        Supply.filter(current_quantity__lte=Supply.minimum_quantity)
-    )
-
-@router.get("/supplies/expiring-soon", response_model=List[Supply_Pydantic])
-async def get_expiring_supplies():
-    thirty_days_from_now = datetime.now().date() + timedelta(days=30)
-    return await Supply_Pydantic.from_queryset(
-        Supply.filter(expiration_date__lte=thirty_days_from_now)
-    )
-
 @router.get("/supplies/department/{department_id}", response_model=List[Supply_Pydantic])
 async def get_department_supplies(department_id: int):
-    return await Supply_Pydantic.from_queryset(
+    return await serialize_queryset(Supply_Pydantic,
         Supply.filter(department_id=department_id)
     ) 
\ No newline at end of file
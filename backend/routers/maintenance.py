@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import MaintenanceRecord_Pydantic, MaintenanceRecordIn_Pydantic
 from backend.crud import maintenance as maintenance_crud
+from backend.crud.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/maintenance",
@@ -23,16 +24,20 @@ async def read_maintenance_record(maintenance_id: int):
 
 @router.get("/", response_model=List[MaintenanceRecord_Pydantic])
 async def read_maintenance_records(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     equipment_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    return await maintenance_crud.get_all_maintenance_records(
-        skip, limit, equipment_id, status, start_date, end_date
+    page = await maintenance_crud.get_all_maintenance_records(
+        skip, limit, equipment_id, status, start_date, end_date, after=after
     )
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{maintenance_id}", response_model=MaintenanceRecord_Pydantic)
 async def update_maintenance_record(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import MedicalHistory, MedicalHistory_Pydantic, MedicalHistoryIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/medical-history",
@@ -23,8 +25,10 @@ async def get_medical_history(history_id: int):
 
 @router.get("/", response_model=List[MedicalHistory_Pydantic])
 async def get_medical_histories(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     patient_id: Optional[int] = None,
     condition: Optional[str] = None,
     status: Optional[str] = None,
@@ -45,7 +49,9 @@ async def get_medical_histories(
         query = query.filter(diagnosis_date__gte=start_date)
     if end_date:
         query = query.filter(diagnosis_date__lte=end_date)
-    return await MedicalHistory_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(MedicalHistory_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{history_id}", response_model=MedicalHistory_Pydantic)
 async def update_medical_history(history_id: int, history: MedicalHistoryIn_Pydantic):
@@ -64,4 +70,4 @@ async def delete_medical_history(history_id: int):
 
 @router.get("/patient/{patient_id}", response_model=List[MedicalHistory_Pydantic])
 async def get_patient_medical_history(patient_id: int):
-    return await MedicalHistory_Pydantic.from_queryset(MedicalHistory.filter(patient_id=patient_id)) 
\ No newline at end of file
+    return await serialize_queryset(MedicalHistory_Pydantic, MedicalHistory.filter(patient_id=patient_id)) 
\ No newline at end of file
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
+from datetime import date
 from backend.models.tortoise_models import Patient, Patient_Pydantic, PatientIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.worklist import refresh_worklist_where
+from backend.crud.patient_search import search_patients
 
 router = APIRouter(
     prefix="/patients",
@@ -13,6 +18,14 @@ async def create_patient(patient: PatientIn_Pydantic):
     patient_obj = await Patient.create(**patient.dict(exclude_unset=True))
     return await Patient_Pydantic.from_tortoise_orm(patient_obj)
 
+@router.get("/search", response_model=List[Patient_Pydantic])
+async def search_patient_typeahead(
+    q: Optional[str] = None,
+    date_of_birth: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=50)
+):
+    return await search_patients(q, date_of_birth, limit)
+
 @router.get("/{patient_id}", response_model=Patient_Pydantic)
 async def get_patient(patient_id: int):
     patient = await Patient.get_or_none(id=patient_id)
@@ -21,8 +34,15 @@ async def get_patient(patient_id: int):
     return await Patient_Pydantic.from_tortoise_orm(patient)
 
 @router.get("/", response_model=List[Patient_Pydantic])
-async def get_patients():
-    return await Patient_Pydantic.from_queryset(Patient.all())
+async def get_patients(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None
+):
+    page = await serialize_queryset(Patient_Pydantic, paginate(Patient.all(), skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{patient_id}", response_model=Patient_Pydantic)
 async def update_patient(patient_id: int, patient: PatientIn_Pydantic):
@@ -30,6 +50,7 @@ async def update_patient(patient_id: int, patient: PatientIn_Pydantic):
     if not patient_obj:
         raise HTTPException(status_code=404, detail="Patient not found")
     await patient_obj.update_from_dict(patient.dict(exclude_unset=True)).save()
+    await refresh_worklist_where(patient_id=patient_id)
     return await Patient_Pydantic.from_tortoise_orm(patient_obj)
 
 @router.delete("/{patient_id}")
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Payment, Payment_Pydantic, PaymentIn_Pydantic, Billing
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/payment",
@@ -34,8 +36,10 @@ async def get_payment(payment_id: int):
 
 @router.get("/", response_model=List[Payment_Pydantic])
 async def get_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     billing_id: Optional[int] = None,
     payment_method: Optional[str] = None,
     status: Optional[str] = None,
@@ -53,7 +57,9 @@ async def get_payments(
         query = query.filter(payment_date__gte=start_date)
     if end_date:
         query = query.filter(payment_date__lte=end_date)
-    return await Payment_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(Payment_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{payment_id}", response_model=Payment_Pydantic)
 async def update_payment(payment_id: int, payment: PaymentIn_Pydantic):
@@ -95,10 +101,10 @@ async def delete_payment(payment_id: int):
 
 @router.get("/billing/{billing_id}", response_model=List[Payment_Pydantic])
 async def get_billing_payments(billing_id: int):
-    return await Payment_Pydantic.from_queryset(Payment.filter(billing_id=billing_id))
+    return await serialize_queryset(Payment_Pydantic, Payment.filter(billing_id=billing_id))
 
 @router.get("/patient/{patient_id}", response_model=List[Payment_Pydantic])
 async def get_patient_payments(patient_id: int):
-    return await Payment_Pydantic.from_queryset(
+    return await serialize_queryset(Payment_Pydantic,
         Payment.filter(billing__patient_id=patient_id)
     ) 
\ No newline at end of file
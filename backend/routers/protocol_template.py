@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import (
     ProtocolTemplate, ProtocolTemplate_Pydantic, ProtocolTemplateIn_Pydantic,
     ProtocolCategory
 )
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.filters import date_range
 
 router = APIRouter(
     prefix="/protocol-template",
@@ -26,8 +29,10 @@ async def get_protocol_template(protocol_id: int):
 
 @router.get("/", response_model=List[ProtocolTemplate_Pydantic])
 async def get_protocol_templates(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     category: Optional[ProtocolCategory] = None,
     equipment_type: Optional[str] = None,
     department_id: Optional[int] = None,
@@ -50,11 +55,10 @@ async def get_protocol_templates(
         query = query.filter(created_by_id=created_by)
     if updated_by:
         query = query.filter(updated_by_id=updated_by)
-    if start_date:
-        query = query.filter(created_at__date__gte=start_date)
-    if end_date:
-        query = query.filter(created_at__date__lte=end_date)
-    return await ProtocolTemplate_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    query = query.filter(**date_range("created_at", start_date, end_date))
+    page = await serialize_queryset(ProtocolTemplate_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{protocol_id}", response_model=ProtocolTemplate_Pydantic)
 async def update_protocol_template(protocol_id: int, protocol: ProtocolTemplateIn_Pydantic):
@@ -73,25 +77,25 @@ async def delete_protocol_template(protocol_id: int):
 
 @router.get("/category/{category}", response_model=List[ProtocolTemplate_Pydantic])
 async def get_protocols_by_category(category: ProtocolCategory):
-    return await ProtocolTemplate_Pydantic.from_queryset(
+    return await serialize_queryset(ProtocolTemplate_Pydantic,
         ProtocolTemplate.filter(category=category, is_active=True)
     )
 
 @router.get("/equipment/{equipment_type}", response_model=List[ProtocolTemplate_Pydantic])
 async def get_protocols_by_equipment(equipment_type: str):
-    return await ProtocolTemplate_Pydantic.from_queryset(
+    return await serialize_queryset(ProtocolTemplate_Pydantic,
         ProtocolTemplate.filter(equipment_type=equipment_type, is_active=True)
     )
 
 @router.get("/department/{department_id}", response_model=List[ProtocolTemplate_Pydantic])
 async def get_department_protocols(department_id: int):
-    return await ProtocolTemplate_Pydantic.from_queryset(
+    return await serialize_queryset(ProtocolTemplate_Pydantic,
         ProtocolTemplate.filter(department_id=department_id, is_active=True)
     )
 
 @router.get("/active", response_model=List[ProtocolTemplate_Pydantic])
 async def get_active_protocols():
-    return await ProtocolTemplate_Pydantic.from_queryset(
+    return await serialize_queryset(ProtocolTemplate_Pydantic,
         ProtocolTemplate.filter(is_active=True)
     )
 
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import (
     QualityControl, QualityControl_Pydantic, QualityControlIn_Pydantic,
     QualityControlStatus, QualityControlType
 )
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.filters import date_range
 
 router = APIRouter(
     prefix="/quality-control",
@@ -26,8 +29,10 @@ async def get_quality_control(qc_id: int):
 
 @router.get("/", response_model=List[QualityControl_Pydantic])
 async def get_quality_controls(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     type: Optional[QualityControlType] = None,
     status: Optional[QualityControlStatus] = None,
     study_id: Optional[int] = None,
@@ -54,13 +59,12 @@ async def get_quality_controls(
         query = query.filter(performed_by_id=performed_by)
     if reviewed_by:
         query = query.filter(reviewed_by_id=reviewed_by)
-    if start_date:
-        query = query.filter(created_at__date__gte=start_date)
-    if end_date:
-        query = query.filter(created_at__date__lte=end_date)
+    query = query.filter(**date_range("created_at", start_date, end_date))
     if priority:
         query = query.filter(priority=priority)
-    return await QualityControl_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(QualityControl_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{qc_id}", response_model=QualityControl_Pydantic)
 async def update_quality_control(qc_id: int, qc: QualityControlIn_Pydantic):
@@ -79,30 +83,30 @@ async def delete_quality_control(qc_id: int):
 
 @router.get("/study/{study_id}", response_model=List[QualityControl_Pydantic])
 async def get_study_quality_controls(study_id: int):
-    return await QualityControl_Pydantic.from_queryset(
+    return await serialize_queryset(QualityControl_Pydantic,
         QualityControl.filter(study_id=study_id)
     )
 
 @router.get("/equipment/{equipment_id}", response_model=List[QualityControl_Pydantic])
 async def get_equipment_quality_controls(equipment_id: int):
-    return await QualityControl_Pydantic.from_queryset(
+    return await serialize_queryset(QualityControl_Pydantic,
         QualityControl.filter(equipment_id=equipment_id)
     )
 
 @router.get("/report/{report_id}", response_model=List[QualityControl_Pydantic])
 async def get_report_quality_controls(report_id: int):
-    return await QualityControl_Pydantic.from_queryset(
+    return await serialize_queryset(QualityControl_Pydantic,
         QualityControl.filter(report_id=report_id)
     )
 
 @router.get("/pending", response_model=List[QualityControl_Pydantic])
 async def get_pending_quality_controls():
-    return await QualityControl_Pydantic.from_queryset(
+    return await serialize_queryset(QualityControl_Pydantic,
         QualityControl.filter(status=QualityControlStatus.PENDING)
     )
 
 @router.get("/needs-review", response_model=List[QualityControl_Pydantic])
 async def get_needs_review_quality_controls():
-    return await QualityControl_Pydantic.from_queryset(
+    return await serialize_queryset(QualityControl_Pydantic,
         QualityControl.filter(status=QualityControlStatus.NEEDS_REVIEW)
     ) 
\ No newline at end of file
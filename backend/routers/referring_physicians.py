@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Response
+from typing import List, Optional
 from backend.models.tortoise_models import ReferringPhysician, ReferringPhysician_Pydantic, ReferringPhysicianIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.worklist import refresh_worklist_where
 
 router = APIRouter(
     prefix="/referring-physicians",
@@ -21,8 +24,15 @@ async def get_referring_physician(physician_id: int):
     return await ReferringPhysician_Pydantic.from_tortoise_orm(physician)
 
 @router.get("/", response_model=List[ReferringPhysician_Pydantic])
-async def get_referring_physicians():
-    return await ReferringPhysician_Pydantic.from_queryset(ReferringPhysician.all())
+async def get_referring_physicians(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None
+):
+    page = await serialize_queryset(ReferringPhysician_Pydantic, paginate(ReferringPhysician.all(), skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{physician_id}", response_model=ReferringPhysician_Pydantic)
 async def update_referring_physician(physician_id: int, physician: ReferringPhysicianIn_Pydantic):
@@ -30,6 +40,7 @@ async def update_referring_physician(physician_id: int, physician: ReferringPhys
     if not physician_obj:
         raise HTTPException(status_code=404, detail="Referring physician not found")
     await physician_obj.update_from_dict(physician.dict(exclude_unset=True)).save()
+    await refresh_worklist_where(referring_physician_id=physician_id)
     return await ReferringPhysician_Pydantic.from_tortoise_orm(physician_obj)
 
 @router.delete("/{physician_id}")
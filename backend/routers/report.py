@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Report_Pydantic, ReportIn_Pydantic
 from backend.crud import report as report_crud
+from backend.crud.report_search import search_reports
+from backend.schemas.report import ReportSearchHit
+from backend.crud.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/reports",
@@ -14,6 +17,19 @@ router = APIRouter(
 async def create_report(report: ReportIn_Pydantic):
     return await report_crud.create_report(report)
 
+@router.get("/search", response_model=List[ReportSearchHit])
+async def search_report_text(
+    q: str = Query(..., min_length=1),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    status: Optional[str] = None,
+    radiologist_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    return await search_reports(q, skip, limit, status, radiologist_id, patient_id, start_date, end_date)
+
 @router.get("/{report_id}", response_model=Report_Pydantic)
 async def read_report(report_id: int):
     report = await report_crud.get_report(report_id)
@@ -23,8 +39,10 @@ async def read_report(report_id: int):
 
 @router.get("/", response_model=List[Report_Pydantic])
 async def read_reports(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     study_id: Optional[int] = None,
     patient_id: Optional[int] = None,
     radiologist_id: Optional[int] = None,
@@ -32,9 +50,11 @@ async def read_reports(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    return await report_crud.get_all_reports(
-        skip, limit, study_id, patient_id, radiologist_id, status, start_date, end_date
+    page = await report_crud.get_all_reports(
+        skip, limit, study_id, patient_id, radiologist_id, status, start_date, end_date, after=after
     )
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{report_id}", response_model=Report_Pydantic)
 async def update_report(report_id: int, report: ReportIn_Pydantic):
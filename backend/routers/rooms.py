@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from backend.models.tortoise_models import Room, Room_Pydantic, RoomIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.worklist import refresh_worklist_where
 
 router = APIRouter(
     prefix="/rooms",
@@ -22,6 +25,10 @@ async def get_room(room_id: int):
 
 @router.get("/", response_model=List[Room_Pydantic])
 async def get_rooms(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
     department_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None)
 ):
@@ -30,7 +37,9 @@ async def get_rooms(
         query = query.filter(department_id=department_id)
     if status is not None:
         query = query.filter(status=status)
-    return await Room_Pydantic.from_queryset(query)
+    page = await serialize_queryset(Room_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{room_id}", response_model=Room_Pydantic)
 async def update_room(room_id: int, room: RoomIn_Pydantic):
@@ -38,6 +47,7 @@ async def update_room(room_id: int, room: RoomIn_Pydantic):
     if not room_obj:
         raise HTTPException(status_code=404, detail="Room not found")
     await room_obj.update_from_dict(room.dict(exclude_unset=True)).save()
+    await refresh_worklist_where(room_id=room_id)
     return await Room_Pydantic.from_tortoise_orm(room_obj)
 
 @router.delete("/{room_id}")
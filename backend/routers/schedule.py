@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date, time
-from backend.models.tortoise_models import Schedule_Pydantic, ScheduleIn_Pydantic
+from backend.models.tortoise_models import Schedule_Pydantic, ScheduleException_Pydantic
 from backend.crud import schedule as schedule_crud
+from backend.crud.schedule_conflicts import check_schedule_conflict, find_schedule_conflicts
+from backend.crud.pagination import set_next_cursor
+from backend.schemas.schedule import ScheduleCreate, ScheduleConflictResult, ScheduleExceptionCreate
 
 router = APIRouter(
     prefix="/schedules",
@@ -11,17 +14,36 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=Schedule_Pydantic)
-async def create_schedule(schedule: ScheduleIn_Pydantic):
-    # Check for schedule conflicts
-    has_conflict = await schedule_crud.check_schedule_conflict(
-        user_id=schedule.user_id,
-        date=schedule.date,
-        start_time=schedule.start_time,
-        end_time=schedule.end_time
-    )
-    if has_conflict:
-        raise HTTPException(status_code=400, detail="Schedule conflict detected")
-    return await schedule_crud.create_schedule(schedule)
+async def create_schedule(schedule: ScheduleCreate):
+    try:
+        # Check staff, room and equipment for overlapping schedules
+        if await check_schedule_conflict(schedule):
+            raise HTTPException(status_code=400, detail="Schedule conflict detected")
+        return await schedule_crud.create_schedule(schedule)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/check-conflicts", response_model=List[ScheduleConflictResult])
+async def check_schedule_conflicts(schedules: List[ScheduleCreate]):
+    # Only slots that conflict are returned, identified by their position in the request
+    try:
+        return await find_schedule_conflicts(schedules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk")
+async def create_schedules(schedules: List[ScheduleCreate]):
+    try:
+        conflicts = await find_schedule_conflicts(schedules)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if conflicts:
+        raise HTTPException(
+            status_code=400,
+            detail=[conflict.model_dump() for conflict in conflicts]
+        )
+    created = await schedule_crud.create_schedules(schedules)
+    return {"message": f"{created} schedules created successfully"}
 
 @router.get("/{schedule_id}", response_model=Schedule_Pydantic)
 async def read_schedule(schedule_id: int):
@@ -32,32 +54,34 @@ async def read_schedule(schedule_id: int):
 
 @router.get("/", response_model=List[Schedule_Pydantic])
 async def read_schedules(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     user_id: Optional[int] = None,
     department_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    return await schedule_crud.get_all_schedules(
-        skip, limit, user_id, department_id, status, start_date, end_date
+    page = await schedule_crud.get_all_schedules(
+        skip, limit, user_id, department_id, status, start_date, end_date, after=after
     )
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{schedule_id}", response_model=Schedule_Pydantic)
-async def update_schedule(schedule_id: int, schedule: ScheduleIn_Pydantic):
-    # Check for schedule conflicts, excluding the current schedule
-    has_conflict = await schedule_crud.check_schedule_conflict(
-        user_id=schedule.user_id,
-        date=schedule.date,
-        start_time=schedule.start_time,
-        end_time=schedule.end_time,
-        exclude_schedule_id=schedule_id
-    )
-    if has_conflict:
-        raise HTTPException(status_code=400, detail="Schedule conflict detected")
-    
-    updated_schedule = await schedule_crud.update_schedule(schedule_id, schedule)
+async def update_schedule(schedule_id: int, schedule: ScheduleCreate):
+    merged = await schedule_crud.merge_schedule(schedule_id, schedule)
+    if merged is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    try:
+        # Check the updated row for schedule conflicts, excluding the current schedule
+        if await check_schedule_conflict(merged, exclude_schedule_id=schedule_id):
+            raise HTTPException(status_code=400, detail="Schedule conflict detected")
+        updated_schedule = await schedule_crud.update_schedule(schedule_id, merged)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if updated_schedule is None:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return updated_schedule
@@ -69,6 +93,28 @@ async def delete_schedule(schedule_id: int):
         raise HTTPException(status_code=404, detail="Schedule not found")
     return {"message": "Schedule deleted successfully"}
 
+@router.get("/{schedule_id}/exceptions", response_model=List[ScheduleException_Pydantic])
+async def read_schedule_exceptions(schedule_id: int):
+    return await schedule_crud.get_schedule_exceptions(schedule_id)
+
+@router.post("/{schedule_id}/exceptions", response_model=ScheduleException_Pydantic)
+async def create_schedule_exception(schedule_id: int, exception: ScheduleExceptionCreate):
+    # Cancels or changes one occurrence of a recurring schedule
+    try:
+        created = await schedule_crud.create_schedule_exception(schedule_id, exception)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if created is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return created
+
+@router.delete("/{schedule_id}/exceptions/{exception_id}")
+async def delete_schedule_exception(schedule_id: int, exception_id: int):
+    success = await schedule_crud.delete_schedule_exception(schedule_id, exception_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Schedule exception not found")
+    return {"message": "Schedule exception deleted successfully"}
+
 @router.get("/user/{user_id}", response_model=List[Schedule_Pydantic])
 async def read_user_schedules(user_id: int):
     return await schedule_crud.get_user_schedules(user_id)
@@ -80,9 +126,12 @@ async def read_department_schedules(department_id: int):
 @router.get("/date-range/", response_model=List[Schedule_Pydantic])
 async def read_schedules_by_date_range(
     start_date: date,
-    end_date: date
+    end_date: date,
+    user_id: Optional[int] = None,
+    department_id: Optional[int] = None
 ):
-    return await schedule_crud.get_schedules_by_date_range(start_date, end_date)
+    # Recurring schedules appear once per occurrence in the range
+    return await schedule_crud.get_schedules_by_date_range(start_date, end_date, user_id, department_id)
 
 @router.get("/status/{status}", response_model=List[Schedule_Pydantic])
 async def read_schedules_by_status(status: str):
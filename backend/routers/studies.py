@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Response
+from typing import List, Optional
 from backend.models.tortoise_models import Study, Study_Pydantic, StudyIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.crud.worklist import refresh_worklist
 
 router = APIRouter(
     prefix="/studies",
@@ -11,6 +14,7 @@ router = APIRouter(
 @router.post("/", response_model=Study_Pydantic)
 async def create_study(study: StudyIn_Pydantic):
     study_obj = await Study.create(**study.dict(exclude_unset=True))
+    await refresh_worklist([study_obj.id])
     return await Study_Pydantic.from_tortoise_orm(study_obj)
 
 @router.get("/{study_id}", response_model=Study_Pydantic)
@@ -21,8 +25,15 @@ async def get_study(study_id: int):
     return await Study_Pydantic.from_tortoise_orm(study)
 
 @router.get("/", response_model=List[Study_Pydantic])
-async def get_studies():
-    return await Study_Pydantic.from_queryset(Study.all())
+async def get_studies(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None
+):
+    page = await serialize_queryset(Study_Pydantic, paginate(Study.all(), skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{study_id}", response_model=Study_Pydantic)
 async def update_study(study_id: int, study: StudyIn_Pydantic):
@@ -30,6 +41,7 @@ async def update_study(study_id: int, study: StudyIn_Pydantic):
     if not study_obj:
         raise HTTPException(status_code=404, detail="Study not found")
     await study_obj.update_from_dict(study.dict(exclude_unset=True)).save()
+    await refresh_worklist([study_id])
     return await Study_Pydantic.from_tortoise_orm(study_obj)
 
 @router.delete("/{study_id}")
@@ -37,4 +49,5 @@ async def delete_study(study_id: int):
     deleted_count = await Study.filter(id=study_id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail="Study not found")
+    await refresh_worklist([study_id])
     return {"message": "Study deleted successfully"} 
\ No newline at end of file
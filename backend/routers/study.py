@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import date
 from backend.models.tortoise_models import Study_Pydantic, StudyIn_Pydantic
 from backend.crud import study as study_crud
+from backend.crud.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/studies",
@@ -23,17 +24,21 @@ async def read_study(study_id: int):
 
 @router.get("/", response_model=List[Study_Pydantic])
 async def read_studies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     patient_id: Optional[int] = None,
     physician_id: Optional[int] = None,
     status: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    return await study_crud.get_all_studies(
-        skip, limit, patient_id, physician_id, status, start_date, end_date
+    page = await study_crud.get_all_studies(
+        skip, limit, patient_id, physician_id, status, start_date, end_date, after=after
     )
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{study_id}", response_model=Study_Pydantic)
 async def update_study(study_id: int, study: StudyIn_Pydantic):
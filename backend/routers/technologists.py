@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
 from backend.models.tortoise_models import Technologist, Technologist_Pydantic, TechnologistIn_Pydantic
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter(
     prefix="/technologists",
@@ -22,8 +24,10 @@ async def get_technologist(technologist_id: int):
 
 @router.get("/", response_model=List[Technologist_Pydantic])
 async def get_technologists(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = None,
     department_id: Optional[int] = None,
     specialization: Optional[str] = None,
     status: Optional[str] = None
@@ -35,7 +39,9 @@ async def get_technologists(
         query = query.filter(specialization=specialization)
     if status:
         query = query.filter(status=status)
-    return await Technologist_Pydantic.from_queryset(query.offset(skip).limit(limit))
+    page = await serialize_queryset(Technologist_Pydantic, paginate(query, skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{technologist_id}", response_model=Technologist_Pydantic)
 async def update_technologist(technologist_id: int, technologist: TechnologistIn_Pydantic):
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Response
+from typing import List, Optional
 from backend.models.tortoise_models import User, User_Pydantic, UserIn_Pydantic, UserRole, UserCreate
-from passlib.context import CryptContext
+from backend.crud.serialization import serialize_queryset
+from backend.crud.pagination import paginate, set_next_cursor
+from backend.services.passwords import hash_password
+from backend.services.principals import principal_cache
 
 router = APIRouter(
     prefix="/users",
@@ -9,18 +12,13 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
 @router.post("/", response_model=User_Pydantic)
 async def create_user(user: UserCreate):
     # Check if user with email already exists
     if await User.filter(email=user.email).exists():
         raise HTTPException(status_code=400, detail="Email already registered")
     user_dict = user.dict(exclude_unset=True)
-    user_dict["password_hash"] = get_password_hash(user_dict.pop("password"))
+    user_dict["password_hash"] = await hash_password(user_dict.pop("password"))
     user_obj = await User.create(**user_dict)
     return await User_Pydantic.from_tortoise_orm(user_obj)
 
@@ -32,8 +30,15 @@ async def get_user(user_id: int):
     return await User_Pydantic.from_tortoise_orm(user)
 
 @router.get("/", response_model=List[User_Pydantic])
-async def get_users():
-    return await User_Pydantic.from_queryset(User.all())
+async def get_users(
+    response: Response,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    after: Optional[str] = None
+):
+    page = await serialize_queryset(User_Pydantic, paginate(User.all(), skip, limit, after))
+    set_next_cursor(response, page, limit, after)
+    return page
 
 @router.put("/{user_id}", response_model=User_Pydantic)
 async def update_user(user_id: int, user: UserIn_Pydantic):
@@ -44,18 +49,20 @@ async def update_user(user_id: int, user: UserIn_Pydantic):
     # Update user data
     user_dict = user.dict(exclude_unset=True)
     if "password" in user_dict:
-        user_dict["password_hash"] = get_password_hash(user_dict.pop("password"))
+        user_dict["password_hash"] = await hash_password(user_dict.pop("password"))
     
     await user_obj.update_from_dict(user_dict).save()
+    principal_cache.invalidate_user(user_id)
     return await User_Pydantic.from_tortoise_orm(user_obj)
 
 @router.delete("/{user_id}")
 async def delete_user(user_id: int):
     deleted_count = await User.filter(id=user_id).delete()
+    principal_cache.invalidate_user(user_id)
     if not deleted_count:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User deleted successfully"}
 
 @router.get("/role/{role}", response_model=List[User_Pydantic])
 async def get_users_by_role(role: UserRole):
-    return await User_Pydantic.from_queryset(User.filter(role=role)) 
\ No newline at end of file
+    return await serialize_queryset(User_Pydantic, User.filter(role=role)) 
\ No newline at end of file
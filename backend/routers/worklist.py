@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Response
+from typing import List, Optional
+from backend.models.tortoise_models import ReportStatus, WorklistEntry_Pydantic
+from backend.crud import worklist as worklist_crud
+from backend.crud.pagination import set_next_cursor
+
+router = APIRouter(
+    prefix="/worklist",
+    tags=["worklist"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/", response_model=List[WorklistEntry_Pydantic])
+async def read_worklist(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    modality: Optional[str] = None,
+    priority: Optional[str] = None,
+    radiologist_id: Optional[int] = None,
+    unassigned: Optional[bool] = None,
+    report_status: Optional[ReportStatus] = None,
+    department_id: Optional[int] = None
+):
+    # Most urgent first, then oldest; pass `after` for keyset paging
+    page = await worklist_crud.get_worklist(
+        skip, limit, after, modality, priority, radiologist_id, unassigned, report_status, department_id
+    )
+    set_next_cursor(response, page, limit, after, keys=worklist_crud.WORKLIST_KEYS)
+    return page
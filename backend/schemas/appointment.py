@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from backend.models.tortoise_models import Appointment, AppointmentStatus, AppointmentType
 
 class AppointmentBase(BaseModel):
@@ -9,6 +9,9 @@ class AppointmentBase(BaseModel):
     type: AppointmentType
     status: Optional[AppointmentStatus] = AppointmentStatus.SCHEDULED
     reason: Optional[str] = None
+    room_id: Optional[int] = None
+    equipment_id: Optional[int] = None
+    duration_minutes: Optional[int] = None
 
 class AppointmentCreate(AppointmentBase):
     pass
@@ -18,6 +21,9 @@ class AppointmentUpdate(BaseModel):
     type: Optional[AppointmentType] = None
     status: Optional[AppointmentStatus] = None
     reason: Optional[str] = None
+    room_id: Optional[int] = None
+    equipment_id: Optional[int] = None
+    duration_minutes: Optional[int] = None
 
 class Appointment(AppointmentBase):
     id: int
@@ -25,4 +31,11 @@ class Appointment(AppointmentBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class AvailableSlot(BaseModel):
+    start: datetime
+    end: datetime
+    room_id: int
+    equipment_id: int
+    staff_ids: List[int]  # Staff on shift for the whole slot
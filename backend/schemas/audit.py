@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from backend.models.tortoise_models import AuditAction, AuditModule
+
+class AuditEventCreate(BaseModel):
+    user_id: int
+    action: AuditAction
+    module: AuditModule
+    description: str
+    ip_address: Optional[str] = Field(None, max_length=50)
+    user_agent: Optional[str] = None
+    resource_id: Optional[int] = None
+    resource_type: Optional[str] = Field(None, max_length=100)
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    department_id: Optional[int] = None
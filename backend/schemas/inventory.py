@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from backend.models.tortoise_models import TransactionType
+
+class InventoryTransactionCreate(BaseModel):
+    supply_id: int
+    transaction_type: TransactionType
+    quantity: Decimal = Field(..., max_digits=10, decimal_places=2)  # Signed only for adjustments
+    transaction_date: Optional[datetime] = None  # Defaults to now
+    reference_number: Optional[str] = Field(None, max_length=100)
+    study_id: Optional[int] = None
+    notes: Optional[str] = None
+    performed_by_id: int
+    department_id: int
+
+class StudySupplyLine(BaseModel):
+    supply_id: int
+    quantity: Decimal = Field(..., gt=0, max_digits=10, decimal_places=2)
+    notes: Optional[str] = None
+
+class StudySupplyIssue(BaseModel):
+    items: List[StudySupplyLine] = Field(..., min_length=1)
+    performed_by_id: int
+    department_id: Optional[int] = None  # Defaults to the department of the study's room
+    reference_number: Optional[str] = Field(None, max_length=100)
+    transaction_date: Optional[datetime] = None
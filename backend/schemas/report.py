@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from backend.models.tortoise_models import Report_Pydantic
+
+class ReportSearchHit(BaseModel):
+    report: Report_Pydantic
+    rank: float
+    snippet: str
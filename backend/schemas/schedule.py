@@ -0,0 +1,46 @@
+from pydantic import BaseModel, field_validator
+from datetime import date, time
+from typing import List, Optional
+from backend.models.tortoise_models import ScheduleStatus
+from backend.crud.recurrence import parse_rrule
+
+class ScheduleCreate(BaseModel):
+    user_id: int
+    date: date
+    start_time: time
+    end_time: time  # At or before start_time means the shift ends the next day
+    status: ScheduleStatus = ScheduleStatus.SCHEDULED
+    notes: Optional[str] = None
+    is_recurring: bool = False
+    recurrence_pattern: Optional[str] = None
+    recurrence_rule: Optional[str] = None  # RRULE such as "FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20251231"
+    department_id: Optional[int] = None
+    room_id: Optional[int] = None
+    equipment_id: Optional[int] = None
+
+    @field_validator("recurrence_rule")
+    @classmethod
+    def check_recurrence_rule(cls, rule: Optional[str]) -> Optional[str]:
+        # A rule that cannot be expanded is rejected with the request rather than when it is stored
+        if rule:
+            parse_rrule(rule)
+        return rule
+
+class ScheduleExceptionCreate(BaseModel):
+    original_date: date  # The occurrence being cancelled or changed
+    is_cancelled: bool = False
+    new_date: Optional[date] = None  # Moves the occurrence to another day
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    status: Optional[ScheduleStatus] = None
+    notes: Optional[str] = None
+
+class ScheduleConflict(BaseModel):
+    resource: str  # "user", "room" or "equipment"
+    resource_id: int
+    schedule_id: Optional[int] = None  # Existing schedule that overlaps
+    proposal_index: Optional[int] = None  # Earlier slot in the same batch that overlaps
+
+class ScheduleConflictResult(BaseModel):
+    index: int
+    conflicts: List[ScheduleConflict]
@@ -0,0 +1,37 @@
+import asyncio
+import sys
+import os
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tortoise import Tortoise
+from backend.models.tortoise_models import Patient, normalize_name
+from backend.database.tortoise_config import TORTOISE_ORM
+
+BATCH_SIZE = 1000
+
+async def backfill_patient_search():
+    # Initialize Tortoise
+    await Tortoise.init(config=TORTOISE_ORM)
+
+    # Fill the normalized name columns for patients stored before the typeahead search existed
+    updated = 0
+    last_id = 0
+    while True:
+        patients = await Patient.filter(id__gt=last_id).order_by("id").limit(BATCH_SIZE)
+        if not patients:
+            break
+        for patient in patients:
+            patient.first_name_search = normalize_name(patient.first_name)
+            patient.last_name_search = normalize_name(patient.last_name)
+        await Patient.bulk_update(patients, fields=["first_name_search", "last_name_search"])
+        updated += len(patients)
+        last_id = patients[-1].id
+    print(f"Updated search names for {updated} patients")
+
+    # Close connection
+    await Tortoise.close_connections()
+
+if __name__ == "__main__":
+    asyncio.run(backfill_patient_search())
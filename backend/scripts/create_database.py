@@ -1,13 +1,21 @@
+import os
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from dotenv import load_dotenv
+from pathlib import Path
+
+load_dotenv(dotenv_path=Path(__file__).parent.parent / '.env')
+
+DATABASE_NAME = os.getenv("DATABASE_NAME", "radiology_db")
 
 def create_database():
     # Connect to PostgreSQL server
     conn = psycopg2.connect(
-        user="postgres",
-        password="1234",
-        host="localhost",
-        port="5432"
+        user=os.getenv("DATABASE_USER", "postgres"),
+        password=os.getenv("DATABASE_PASSWORD", ""),
+        host=os.getenv("DATABASE_HOST", "localhost"),
+        port=os.getenv("DATABASE_PORT", "5432")
     )
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
     
@@ -16,15 +24,15 @@ def create_database():
     
     try:
         # Check if database exists
-        cur.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = 'radiology_db'")
+        cur.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", (DATABASE_NAME,))
         exists = cur.fetchone()
         
         if not exists:
             # Create database
-            cur.execute('CREATE DATABASE radiology_db')
-            print("Database 'radiology_db' created successfully!")
+            cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(DATABASE_NAME)))
+            print(f"Database '{DATABASE_NAME}' created successfully!")
         else:
-            print("Database 'radiology_db' already exists.")
+            print(f"Database '{DATABASE_NAME}' already exists.")
             
     except Exception as e:
         print(f"An error occurred: {e}")
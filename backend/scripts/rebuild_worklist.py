@@ -0,0 +1,24 @@
+import asyncio
+import sys
+import os
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tortoise import Tortoise
+from backend.crud.worklist import rebuild_worklist
+from backend.database.tortoise_config import TORTOISE_ORM
+
+async def main():
+    # Initialize Tortoise
+    await Tortoise.init(config=TORTOISE_ORM)
+
+    # Fills the worklist for studies stored before it existed; safe to rerun at any time
+    entries = await rebuild_worklist()
+    print(f"Worklist holds {entries} studies")
+
+    # Close connection
+    await Tortoise.close_connections()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from tortoise import timezone
+from backend.database.tortoise_config import DATA_DIR
+from backend.models.tortoise_models import AuditLog, AuditAction, AuditModule
+
+logger = logging.getLogger(__name__)
+
+# Events wait here until the writer turns them into bulk inserts
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "50000"))
+# A batch is written once it reaches this size or its first event is this old
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "1000"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+# With the queue full, producers wait this long for room before being turned away with 503
+AUDIT_ENQUEUE_TIMEOUT = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "2"))
+# Events that cannot be written at shutdown are kept here and replayed on the next start
+AUDIT_SPILL_FILE = Path(os.getenv("AUDIT_SPILL_FILE", DATA_DIR / "audit_spill.ndjson"))
+AUDIT_SHUTDOWN_RETRIES = 3
+
+_STOP = object()
+
+def audit_event(
+    action: AuditAction,
+    module: AuditModule,
+    description: str,
+    user_id: Optional[int] = None,
+    **fields: Any
+) -> Dict[str, Any]:
+    # Stamped when it happens, not when the batch is written
+    return {
+        "action": action,
+        "module": module,
+        "description": description,
+        "user_id": user_id,
+        "created_at": timezone.now(),
+        **fields,
+    }
+
+class AuditSink:
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.recorded = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.waited = 0
+        self.rejected = 0
+        self.spilled = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._queue = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+            await self._replay_spill()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Everything queued before this call is written (or spilled) before it returns
+        if self._task is not None:
+            self._stopping = True
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+    def record_nowait(self, event: Dict[str, Any]) -> bool:
+        # Never waits; False means the queue is full and the caller must decide what to do
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        self.recorded += 1
+        return True
+
+    async def record(self, event: Dict[str, Any]) -> None:
+        if self.record_nowait(event):
+            return
+        if not self.running:
+            # No writer (scripts, shutdown): write straight through
+            await AuditLog.create(**event)
+            self.recorded += 1
+            self.written += 1
+            return
+
+        # Backpressure: wait briefly for the writer to catch up rather than dropping the event
+        self.waited += 1
+        try:
+            await asyncio.wait_for(self._queue.put(event), AUDIT_ENQUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Audit log is backed up, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.recorded += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            deadline = loop.time() + AUDIT_FLUSH_INTERVAL
+            stop = False
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    event = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        event = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if event is _STOP:
+                    stop = True
+                    break
+                batch.append(event)
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        delay = 0.5
+        attempts = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                await AuditLog.bulk_create([AuditLog(**event) for event in batch])
+            except Exception as e:
+                attempts += 1
+                self.failed_flushes += 1
+                logger.exception("Writing %d audit events failed: %s", len(batch), e)
+                if self._stopping and attempts >= AUDIT_SHUTDOWN_RETRIES:
+                    self._spill(batch)
+                    return
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+            self.flushes += 1
+            self.written += len(batch)
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            return
+
+    def _spill(self, batch: List[Dict[str, Any]]) -> None:
+        AUDIT_SPILL_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with AUDIT_SPILL_FILE.open("a", encoding="utf-8") as spill:
+            for event in batch:
+                spill.write(json.dumps(event, default=str) + "\n")
+        self.spilled += len(batch)
+        logger.error("Spilled %d audit events to %s", len(batch), AUDIT_SPILL_FILE)
+
+    async def _replay_spill(self) -> None:
+        if not AUDIT_SPILL_FILE.exists():
+            return
+        events = []
+        with AUDIT_SPILL_FILE.open(encoding="utf-8") as spill:
+            for line in spill:
+                if line.strip():
+                    event = json.loads(line)
+                    event["created_at"] = datetime.fromisoformat(event["created_at"])
+                    events.append(event)
+        for i in range(0, len(events), AUDIT_BATCH_SIZE):
+            await AuditLog.bulk_create([AuditLog(**event) for event in events[i:i + AUDIT_BATCH_SIZE]])
+        AUDIT_SPILL_FILE.unlink()
+        logger.info("Replayed %d spilled audit events", len(events))
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": AUDIT_QUEUE_SIZE,
+            "recorded": self.recorded,
+            "written": self.written,
+            "flushes": self.flushes,
+            "avg_batch": round(self.written / self.flushes, 1) if self.flushes else 0.0,
+            "last_flush_ms": round(self.last_flush_ms, 1),
+            "failed_flushes": self.failed_flushes,
+            "waited": self.waited,
+            "rejected": self.rejected,
+            "spilled": self.spilled,
+        }
+
+audit_sink = AuditSink()
+
+async def record_audit_event(event: Dict[str, Any]) -> None:
+    await audit_sink.record(event)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from backend.crud.audit_partitions import (
+    archive_month, ensure_audit_partitions, maintenance_lock, months_to_archive, purge_archives
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds between maintenance passes; the first runs at startup
+AUDIT_MAINTENANCE_INTERVAL = float(os.getenv("AUDIT_MAINTENANCE_INTERVAL", "86400"))
+
+class AuditArchiver:
+    # Keeps monthly audit partitions ahead of the clock, archives months past AUDIT_HOT_MONTHS
+    # and deletes archives past retention. With several instances on one PostgreSQL database only the
+    # one holding the maintenance lock does a pass; the others skip it.
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.runs = 0
+        self.skipped = 0
+        self.partitions = 0
+        self.archived_months = 0
+        self.archived_rows = 0
+        self.purged = 0
+        self.last_run_ms = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.exception("Audit log maintenance failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), AUDIT_MAINTENANCE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> None:
+        started = time.perf_counter()
+        async with maintenance_lock() as locked:
+            if not locked:
+                self.skipped += 1
+                return
+            self.partitions += await ensure_audit_partitions()
+            for month in await months_to_archive():
+                if self._stopping:
+                    break
+                rows = await archive_month(month)
+                self.archived_months += 1
+                self.archived_rows += rows
+                logger.info("Archived %d audit events from %s", rows, f"{month:%Y-%m}")
+            self.purged += await asyncio.to_thread(purge_archives)
+        self.runs += 1
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "partitions": self.partitions,
+            "archived_months": self.archived_months,
+            "archived_rows": self.archived_rows,
+            "purged": self.purged,
+            "last_run_ms": round(self.last_run_ms, 1),
+        }
+
+audit_archiver = AuditArchiver()
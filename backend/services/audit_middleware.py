@@ -0,0 +1,133 @@
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from fastapi import APIRouter
+from fastapi.routing import APIRoute
+from jose import JWTError, jwt
+from backend.models.tortoise_models import AuditAction, AuditModule
+from backend.routers.auth import SECRET_KEY, ALGORITHM
+from backend.services.audit import audit_event, audit_sink
+from backend.services.principals import get_principal
+
+logger = logging.getLogger(__name__)
+
+# Request and response bodies larger than this are not copied into the audit row
+AUDIT_BODY_LIMIT = int(os.getenv("AUDIT_BODY_LIMIT", "65536"))
+
+METHOD_ACTIONS = {
+    "GET": AuditAction.READ,
+    "HEAD": AuditAction.READ,
+    "POST": AuditAction.CREATE,
+    "PUT": AuditAction.UPDATE,
+    "PATCH": AuditAction.UPDATE,
+    "DELETE": AuditAction.DELETE,
+}
+
+class AuditTarget(NamedTuple):
+    module: AuditModule
+    resource_type: str
+    action: Optional[AuditAction] = None  # Derived from the method when not set
+
+# Route metadata: endpoint function -> what accessing it means for the audit trail
+AUDITED_ENDPOINTS: Dict[Callable, AuditTarget] = {}
+
+def audit_routes(router: APIRouter, module: AuditModule, resource_type: str) -> None:
+    # Every route on the router is audited; routes ending in /download are recorded as downloads
+    for route in router.routes:
+        if isinstance(route, APIRoute):
+            action = AuditAction.DOWNLOAD if route.path.endswith("/download") else None
+            AUDITED_ENDPOINTS.setdefault(route.endpoint, AuditTarget(module, resource_type, action))
+
+def _json_or_none(body: bytes) -> Optional[Any]:
+    if not body or len(body) > AUDIT_BODY_LIMIT:
+        return None
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+def _resource_id(path_params: Dict[str, Any], response: Optional[Any]) -> Optional[int]:
+    # The first id in the path, or the id of a newly created resource
+    for name, value in path_params.items():
+        if name.endswith("_id") or name == "id":
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                continue
+    if isinstance(response, dict) and isinstance(response.get("id"), int):
+        return response["id"]
+    return None
+
+async def _user_id(headers: Dict[bytes, bytes]) -> Optional[int]:
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        email = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+    user = await get_principal(email) if email else None
+    return user.id if user else None
+
+class AuditMiddleware:
+    # Records access to audited routes. Only status and bodies are captured while the request runs;
+    # the event is built and queued after the response has gone out, so clients do not wait on it.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        request_body = bytearray()
+        response_body = bytearray()
+        status = 500
+        capture_response = method == "POST"
+
+        async def receive_and_copy():
+            message = await receive()
+            if message["type"] == "http.request" and len(request_body) <= AUDIT_BODY_LIMIT:
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def send_and_copy(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif capture_response and message["type"] == "http.response.body" and len(response_body) <= AUDIT_BODY_LIMIT:
+                response_body.extend(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive if method in ("GET", "HEAD") else receive_and_copy, send_and_copy)
+        finally:
+            # Starlette's router fills in the matched endpoint on the shared scope
+            target = AUDITED_ENDPOINTS.get(scope.get("endpoint"))
+            if target is not None:
+                await self._record(scope, target, status, bytes(request_body), bytes(response_body))
+
+    async def _record(self, scope, target: AuditTarget, status: int, request_body: bytes, response_body: bytes) -> None:
+        try:
+            headers = dict(scope["headers"])
+            method = scope["method"]
+            response = _json_or_none(response_body) if 200 <= status < 300 else None
+            client = scope.get("client")
+            event = audit_event(
+                target.action or METHOD_ACTIONS.get(method, AuditAction.READ),
+                target.module,
+                f"{method} {scope['path']} -> {status}",
+                user_id=await _user_id(headers),
+                ip_address=client[0] if client else None,
+                user_agent=headers.get(b"user-agent", b"").decode("latin-1") or None,
+                resource_id=_resource_id(scope.get("path_params", {}), response),
+                resource_type=target.resource_type,
+                new_values=_json_or_none(request_body) if method in ("POST", "PUT", "PATCH") else None,
+            )
+            await audit_sink.record(event)
+        except Exception as e:
+            # Never let auditing break a response that has already been sent
+            logger.exception("Could not record audit event for %s %s: %s", scope["method"], scope["path"], e)
@@ -0,0 +1,114 @@
+import os
+import re
+import stat
+from email.utils import formatdate
+from typing import Optional, Tuple
+from urllib.parse import quote
+import anyio
+from fastapi import HTTPException, Request, Response
+from starlette.types import Receive, Scope, Send
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+_RANGE_SPEC = re.compile(r"([0-9]*)-([0-9]*)")
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    # Single "bytes=" ranges only. A header that is not a valid range is ignored and the whole file is sent;
+    # 416 is only for valid ranges that lie outside the file.
+    unit, _, spec = header.partition("=")
+    match = _RANGE_SPEC.fullmatch(spec.strip())
+    if unit.strip().lower() != "bytes" or not match or match.group(0) == "-":
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+class FileRangeResponse(Response):
+    # Sends bytes [start, end] of a file, handing the descriptor to the server when it supports zero-copy sends
+    def __init__(self, path: str, start: int, end: int, status_code: int, headers: dict, media_type: str):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.count = end - start + 1
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if "http.response.zerocopy" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopy",
+                    "file": file.fileno(),
+                    "offset": self.start,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.count
+            more_body = True
+            while more_body:
+                chunk = await file.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+                remaining -= len(chunk)
+                more_body = bool(chunk) and remaining > 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+async def file_download(
+    request: Request,
+    path: str,
+    checksum: Optional[str] = None,
+    media_type: Optional[str] = None,
+    filename: Optional[str] = None
+) -> Response:
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = stat_result.st_size
+    # Content-addressed files are immutable, so their hash is a strong validator
+    etag = f'"{checksum}"' if checksum else f'"{int(stat_result.st_mtime)}-{size}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+    if filename:
+        headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    media_type = media_type or "application/octet-stream"
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and size:
+        # A stale If-Range means the client's partial copy is outdated, so it gets the whole file
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() == etag:
+            byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        return FileRangeResponse(path, 0, size - 1, 200, headers, media_type)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(path, start, end, 206, headers, media_type)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Iterable, Optional, Set
+from backend.crud.inventory import evaluate_supply_alerts, sweep_supply_ids
+
+logger = logging.getLogger(__name__)
+
+# Seconds between full sweeps, which catch expiry dates passing; the first runs at startup
+ALERT_SWEEP_INTERVAL = float(os.getenv("ALERT_SWEEP_INTERVAL", "86400"))
+# Supplies evaluated per query
+ALERT_BATCH_SIZE = int(os.getenv("ALERT_BATCH_SIZE", "500"))
+# After a failed pass the engine waits before retrying, doubling the wait while failures repeat
+ALERT_RETRY_BASE_DELAY = float(os.getenv("ALERT_RETRY_BASE_DELAY", "1"))
+ALERT_RETRY_MAX_DELAY = float(os.getenv("ALERT_RETRY_MAX_DELAY", "300"))
+
+class AlertEngine:
+    # Re-evaluates alerts for supplies touched by stock movements, plus a periodic sweep for dates passing
+    def __init__(self):
+        self._dirty: Set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._next_sweep = 0.0
+        self.evaluated = 0
+        self.opened = 0
+        self.resolved = 0
+        self.sweeps = 0
+        self.failures = 0
+        self.last_sweep_ms = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._next_sweep = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    def notify(self, supply_ids: Iterable[int]) -> None:
+        self._dirty.update(supply_ids)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        failures = 0
+        while not self._stopping:
+            try:
+                await self.process_dirty()
+                if time.monotonic() >= self._next_sweep:
+                    await self.sweep()
+                    self._next_sweep = time.monotonic() + ALERT_SWEEP_INTERVAL
+                failures = 0
+            except Exception as e:
+                failures += 1
+                self.failures += 1
+                logger.exception("Inventory alert evaluation failed: %s", e)
+            if failures:
+                # Notifications keep collecting in the dirty set meanwhile; only stop() cuts the wait short
+                retry_at = time.monotonic() + min(ALERT_RETRY_BASE_DELAY * 2 ** (failures - 1), ALERT_RETRY_MAX_DELAY)
+                while not self._stopping and time.monotonic() < retry_at:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), retry_at - time.monotonic())
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                continue
+            if self._dirty and not self._stopping:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(self._next_sweep - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+        # Nothing notified before shutdown is lost, unless the database is the reason for stopping
+        try:
+            await self.process_dirty()
+        except Exception as e:
+            logger.exception("Inventory alerts for %d supplies were not evaluated at shutdown: %s", len(self._dirty), e)
+
+    async def process_dirty(self) -> None:
+        while self._dirty:
+            batch = [self._dirty.pop() for _ in range(min(len(self._dirty), ALERT_BATCH_SIZE))]
+            try:
+                await self._evaluate(batch)
+            except Exception:
+                # Put them back so the next pass retries
+                self._dirty.update(batch)
+                raise
+
+    async def sweep(self) -> None:
+        started = time.perf_counter()
+        supply_ids = await sweep_supply_ids()
+        for i in range(0, len(supply_ids), ALERT_BATCH_SIZE):
+            await self._evaluate(supply_ids[i:i + ALERT_BATCH_SIZE])
+        self.sweeps += 1
+        self.last_sweep_ms = (time.perf_counter() - started) * 1000
+        logger.info("Inventory alert sweep checked %d supplies in %.1f ms", len(supply_ids), self.last_sweep_ms)
+
+    async def _evaluate(self, supply_ids) -> None:
+        opened, resolved = await evaluate_supply_alerts(supply_ids)
+        self.evaluated += len(supply_ids)
+        self.opened += opened
+        self.resolved += resolved
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._dirty),
+            "evaluated": self.evaluated,
+            "opened": self.opened,
+            "resolved": self.resolved,
+            "sweeps": self.sweeps,
+            "failures": self.failures,
+            "last_sweep_ms": round(self.last_sweep_ms, 1),
+        }
+
+alert_engine = AlertEngine()
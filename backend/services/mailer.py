@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+from email.message import EmailMessage
+from typing import List, Optional
+import aiosmtplib
+from tortoise import timezone
+from tortoise.expressions import F, Q
+from backend.models.tortoise_models import OutboundEmail, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+# SMTP configuration; for local testing point this at a stand-in such as
+# `python -m aiosmtpd -n -l localhost:1025` with SMTP_STARTTLS=false
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+MAIL_FROM = os.getenv("MAIL_FROM", SMTP_USERNAME or "no-reply@localhost")
+
+# Queue tuning
+MAIL_CONNECTIONS = int(os.getenv("MAIL_CONNECTIONS", "2"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "50"))
+MAIL_POLL_INTERVAL = float(os.getenv("MAIL_POLL_INTERVAL", "5"))
+MAIL_MAX_ATTEMPTS = int(os.getenv("MAIL_MAX_ATTEMPTS", "8"))
+MAIL_RETRY_BASE_DELAY = float(os.getenv("MAIL_RETRY_BASE_DELAY", "30"))
+MAIL_RETRY_MAX_DELAY = float(os.getenv("MAIL_RETRY_MAX_DELAY", "3600"))
+# A claimed message is handed to another worker if it is still unsent after this long
+MAIL_LEASE_SECONDS = float(os.getenv("MAIL_LEASE_SECONDS", "120"))
+# Pooled connections are closed after sitting idle this long
+MAIL_IDLE_DISCONNECT = float(os.getenv("MAIL_IDLE_DISCONNECT", "60"))
+
+class MailQueue:
+    def __init__(self):
+        self._clients: List[Optional[aiosmtplib.SMTP]] = [None] * MAIL_CONNECTIONS
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._last_used = 0.0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+        self.connections_opened = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self._disconnect()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                logger.exception("Mail queue batch failed: %s", e)
+                processed = 0
+            if processed >= MAIL_BATCH_SIZE:
+                continue
+
+            if self._last_used and time.monotonic() - self._last_used > MAIL_IDLE_DISCONNECT:
+                await self._disconnect()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), MAIL_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self) -> List[OutboundEmail]:
+        now = timezone.now()
+        due = Q(status=EmailStatus.PENDING, next_attempt_at__lte=now) | Q(status=EmailStatus.SENDING, locked_until__lt=now)
+        ids = await OutboundEmail.filter(due).order_by("next_attempt_at").limit(MAIL_BATCH_SIZE).values_list("id", flat=True)
+        if not ids:
+            return []
+
+        # Conditional claim so two workers never send the same message
+        lease = now + timedelta(seconds=MAIL_LEASE_SECONDS)
+        await OutboundEmail.filter(due, id__in=ids).update(status=EmailStatus.SENDING, locked_until=lease)
+        return await OutboundEmail.filter(id__in=ids, status=EmailStatus.SENDING, locked_until=lease)
+
+    async def process_batch(self) -> int:
+        messages = await self._claim()
+        if not messages:
+            return 0
+        self.batches += 1
+
+        # Each pooled connection works through its share of the batch
+        lanes = [messages[i::MAIL_CONNECTIONS] for i in range(MAIL_CONNECTIONS)]
+        results = await asyncio.gather(*(self._send_lane(i, lane) for i, lane in enumerate(lanes) if lane))
+        sent_ids = [message_id for lane_ids in results for message_id in lane_ids]
+        if sent_ids:
+            # Bodies carry reset links; they are only kept while the message may still be sent
+            await OutboundEmail.filter(id__in=sent_ids).update(
+                body="",
+                status=EmailStatus.SENT,
+                sent_at=timezone.now(),
+                locked_until=None,
+                last_error=None,
+                attempts=F("attempts") + 1,
+            )
+            self.sent += len(sent_ids)
+        self._last_used = time.monotonic()
+        return len(messages)
+
+    async def _send_lane(self, lane: int, messages: List[OutboundEmail]) -> List[int]:
+        sent_ids = []
+        for message in messages:
+            try:
+                client = await self._connection(lane)
+                await client.send_message(self._build(message))
+                sent_ids.append(message.id)
+            except aiosmtplib.SMTPResponseException as e:
+                # 5xx replies are permanent, everything else is worth retrying
+                await self._record_failure(message, f"{e.code} {e.message}", permanent=e.code >= 500)
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                # Raised with the refusal of each recipient rather than a single reply
+                error = "; ".join(f"{refused.code} {refused.message}" for refused in e.recipients)
+                await self._record_failure(message, error, permanent=all(refused.code >= 500 for refused in e.recipients))
+            except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError) as e:
+                await self._drop_connection(lane)
+                await self._record_failure(message, str(e) or e.__class__.__name__)
+        return sent_ids
+
+    async def _record_failure(self, message: OutboundEmail, error: str, permanent: bool = False) -> None:
+        attempts = message.attempts + 1
+        if permanent or attempts >= MAIL_MAX_ATTEMPTS:
+            status = EmailStatus.FAILED
+            self.failed += 1
+            logger.warning("Giving up on email %s to %s: %s", message.id, message.recipient, error)
+        else:
+            status = EmailStatus.PENDING
+            self.retried += 1
+        delay = min(MAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1), MAIL_RETRY_MAX_DELAY)
+        values = {
+            "status": status,
+            "attempts": attempts,
+            "next_attempt_at": timezone.now() + timedelta(seconds=delay),
+            "locked_until": None,
+            "last_error": error,
+        }
+        if status == EmailStatus.FAILED:
+            values["body"] = ""
+        await OutboundEmail.filter(id=message.id).update(**values)
+
+    def _build(self, message: OutboundEmail) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = MAIL_FROM
+        email["To"] = message.recipient
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        return email
+
+    async def _connection(self, lane: int) -> aiosmtplib.SMTP:
+        client = self._clients[lane]
+        if client is not None and client.is_connected:
+            return client
+        client = aiosmtplib.SMTP(
+            hostname=SMTP_SERVER,
+            port=SMTP_PORT,
+            start_tls=SMTP_STARTTLS,
+            timeout=SMTP_TIMEOUT,
+        )
+        await client.connect()
+        if SMTP_USERNAME and SMTP_PASSWORD:
+            await client.login(SMTP_USERNAME, SMTP_PASSWORD)
+        self._clients[lane] = client
+        self.connections_opened += 1
+        return client
+
+    async def _drop_connection(self, lane: int) -> None:
+        client, self._clients[lane] = self._clients[lane], None
+        if client is not None and client.is_connected:
+            try:
+                await client.quit()
+            except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+                client.close()
+
+    async def _disconnect(self) -> None:
+        for lane in range(MAIL_CONNECTIONS):
+            await self._drop_connection(lane)
+        self._last_used = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "batches": self.batches,
+            "open_connections": sum(1 for client in self._clients if client is not None and client.is_connected),
+            "connections_opened": self.connections_opened,
+        }
+
+mail_queue = MailQueue()
+
+async def enqueue_email(recipient: str, subject: str, body: str) -> OutboundEmail:
+    # The row is the durable queue entry; the worker picks it up right away or after a restart
+    message = await OutboundEmail.create(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        next_attempt_at=timezone.now(),
+    )
+    mail_queue.wake()
+    return message
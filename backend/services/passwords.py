@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+# Requests waiting beyond this are turned away with 503 instead of piling up behind a login storm
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "100"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = asyncio.Semaphore(workers)
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    async def _run(self, func, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many concurrent sign-ins, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        queued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds += time.perf_counter() - queued_at
+
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "running": self.running,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
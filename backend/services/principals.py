@@ -0,0 +1,84 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from pydantic import ConfigDict
+from backend.models.tortoise_models import User, User_Pydantic
+
+# Authenticated users are cached per token subject for a short while; changes in other workers show up after the TTL
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+class Principal(User_Pydantic):
+    # The cached user is shared by concurrent requests, so it is a read-only snapshot rather than the ORM row
+    model_config = ConfigDict(frozen=True)
+
+class PrincipalCache:
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self._subjects: Dict[int, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        entry = self._entries.get(subject)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(subject)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, subject: str, user: Principal) -> None:
+        self._entries[subject] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(subject)
+        self._subjects[user.id] = subject
+        while len(self._entries) > self.max_size:
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate(self, subject: str) -> None:
+        if subject in self._entries:
+            self._drop(subject)
+            self.invalidations += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        subject = self._subjects.get(user_id)
+        if subject is not None:
+            self.invalidate(subject)
+
+    def _drop(self, subject: str) -> None:
+        _, user = self._entries.pop(subject)
+        if self._subjects.get(user.id) == subject:
+            del self._subjects[user.id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL, PRINCIPAL_CACHE_SIZE)
+
+async def get_principal(email: str) -> Optional[Principal]:
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = await User.get_or_none(email=email)
+        if user is not None:
+            principal = await Principal.from_tortoise_orm(user)
+            principal_cache.put(email, principal)
+    return principal
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Tuple
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from backend.database.tortoise_config import DATA_DIR
+from backend.models.tortoise_models import Document, DocumentVersion
+
+# Uploads are copied in chunks so a large file never sits in memory as a whole
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(200 * 1024 * 1024)))
+
+# Content-addressed store: every distinct file is kept once, at <root>/ab/cd/<sha256>
+BLOB_STORAGE_DIR = os.getenv("BLOB_STORAGE_DIR", str(DATA_DIR / "blobs"))
+
+def blob_path(checksum: str) -> str:
+    return os.path.join(BLOB_STORAGE_DIR, checksum[:2], checksum[2:4], checksum)
+
+def stored_blob(checksum: Optional[str]) -> Optional[str]:
+    # The resolved blob for a stored checksum; None when there is none or it would lie outside the store
+    if not checksum:
+        return None
+    root = os.path.realpath(BLOB_STORAGE_DIR)
+    path = os.path.realpath(blob_path(checksum))
+    if os.path.commonpath([root, path]) != root or path == root:
+        return None
+    return path
+
+def _remove(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
+
+def _commit_blob(tmp_path: str, checksum: str) -> str:
+    # The staged file stays as a second link to the blob until the referencing row is committed
+    path = blob_path(checksum)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            # Identical content was stored by a concurrent upload
+            pass
+    return path
+
+def _settle_blob(tmp_path: str, checksum: str) -> None:
+    # A release that counted no references before the row was committed may have removed the blob
+    _commit_blob(tmp_path, checksum)
+    os.remove(tmp_path)
+
+@asynccontextmanager
+async def stored_upload(file: UploadFile) -> AsyncIterator[Tuple[str, int, str]]:
+    # Yields (blob path, size in bytes, sha256 hex digest); the row referencing the blob must be created inside
+    # the block. Raises 413 and keeps nothing once the limit is passed.
+    tmp_dir = os.path.join(BLOB_STORAGE_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+
+    buffer = await run_in_threadpool(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File exceeds the maximum upload size of {MAX_UPLOAD_SIZE} bytes"
+                )
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+        await run_in_threadpool(buffer.close)
+        checksum = digest.hexdigest()
+        path = await run_in_threadpool(_commit_blob, tmp_path, checksum)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(_remove, tmp_path)
+        raise
+
+    try:
+        yield path, size, checksum
+    except BaseException:
+        await run_in_threadpool(_remove, tmp_path)
+        # No row was created; the blob goes too unless something else references it
+        await release_blob(checksum)
+        raise
+    await run_in_threadpool(_settle_blob, tmp_path, checksum)
+
+async def blob_reference_count(checksum: str) -> int:
+    return (
+        await Document.filter(checksum=checksum).count()
+        + await DocumentVersion.filter(checksum=checksum).count()
+    )
+
+async def release_blob(checksum: str) -> bool:
+    # Call after the referencing rows are gone; the blob is unlinked only when nothing points at it anymore.
+    # It is moved aside before the final count, so an upload of the same content committed in between either
+    # sees it missing and puts its staged copy back, or is counted here and the blob is restored.
+    if await blob_reference_count(checksum):
+        return False
+    path = blob_path(checksum)
+    released = f"{path}.{uuid.uuid4().hex}.released"
+    try:
+        await run_in_threadpool(os.rename, path, released)
+    except FileNotFoundError:
+        return True
+    if await blob_reference_count(checksum):
+        await run_in_threadpool(os.replace, released, path)
+        return False
+    await run_in_threadpool(_remove, released)
+    return True
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from backend.models.tortoise_models import AuditAction, AuditLog, AuditModule
+from backend.services import audit
+from backend.services.audit import AuditSink, audit_event
+
+@pytest.fixture(autouse=True)
+def spill_file(tmp_path, monkeypatch):
+    # The data directory does not exist until something is spilled
+    path = tmp_path / "data" / "audit_spill.ndjson"
+    monkeypatch.setattr(audit, "AUDIT_SPILL_FILE", path)
+    return path
+
+def event(i):
+    return audit_event(AuditAction.READ, AuditModule.PATIENT, f"GET /patients/{i}", resource_id=i)
+
+def test_events_are_written_in_batches_before_stop_returns(run, monkeypatch):
+    monkeypatch.setattr(audit, "AUDIT_BATCH_SIZE", 10)
+
+    async def test():
+        sink = AuditSink()
+        await sink.start()
+        for i in range(25):
+            await sink.record(event(i))
+        await sink.stop()
+        assert await AuditLog.all().count() == 25
+        assert sink.stats()["flushes"] >= 3
+        # Without a writer events go straight to the table
+        await sink.record(event(25))
+        assert await AuditLog.all().count() == 26
+    run(test)
+
+def test_a_full_queue_waits_then_turns_producers_away(run, monkeypatch):
+    monkeypatch.setattr(audit, "AUDIT_QUEUE_SIZE", 1)
+    monkeypatch.setattr(audit, "AUDIT_BATCH_SIZE", 1)
+    monkeypatch.setattr(audit, "AUDIT_ENQUEUE_TIMEOUT", 0.05)
+    bulk_create = AuditLog.bulk_create
+
+    async def test():
+        release = asyncio.Event()
+
+        async def slow(objects):
+            await release.wait()
+            return await bulk_create(objects)
+        monkeypatch.setattr(AuditLog, "bulk_create", slow)
+
+        sink = AuditSink()
+        await sink.start()
+        await sink.record(event(1))
+        await asyncio.sleep(0.01)
+        # The writer holds the first event; the second fills the queue and the third has nowhere to go
+        await sink.record(event(2))
+        with pytest.raises(HTTPException) as raised:
+            await sink.record(event(3))
+        assert raised.value.status_code == 503
+        release.set()
+        await sink.stop()
+        assert await AuditLog.all().count() == 2
+        assert sink.stats()["waited"] == 1
+        assert sink.stats()["rejected"] == 1
+    run(test)
+
+def test_unwritable_events_are_spilled_and_replayed_on_start(run, monkeypatch, spill_file):
+    async def failing(objects):
+        raise RuntimeError("database unavailable")
+
+    async def test():
+        sink = AuditSink()
+        await sink.start()
+        with monkeypatch.context() as patch:
+            patch.setattr(AuditLog, "bulk_create", failing)
+            for i in range(3):
+                await sink.record(event(i))
+            await sink.stop()
+        assert sink.stats()["spilled"] == 3
+        assert len(spill_file.read_text().splitlines()) == 3
+
+        restarted = AuditSink()
+        await restarted.start()
+        await restarted.stop()
+        assert sorted(await AuditLog.all().values_list("resource_id", flat=True)) == [0, 1, 2]
+        assert not spill_file.exists()
+    run(test)
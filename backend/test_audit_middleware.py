@@ -0,0 +1,80 @@
+from fastapi import APIRouter
+from backend.models.tortoise_models import AuditAction, AuditLog, AuditModule
+from backend.routers import patients
+from backend.routers.auth import create_access_token
+from backend.services import audit_middleware
+from backend.services.audit_middleware import AuditMiddleware, audit_routes
+
+files = APIRouter(prefix="/files")
+
+@files.get("/{file_id}/download")
+async def download_file(file_id: int):
+    return {"id": file_id}
+
+unaudited = APIRouter(prefix="/health")
+
+@unaudited.get("/")
+async def health():
+    return {"status": "ok"}
+
+audit_routes(patients.router, AuditModule.PATIENT, "patient")
+audit_routes(files, AuditModule.DOCUMENT, "document")
+
+def start(make_client, seed):
+    client = make_client(patients.router, files, unaudited, middleware=(AuditMiddleware,))
+    records = client.portal.call(seed)
+    return client, records
+
+def audit_rows(client):
+    async def rows():
+        return await AuditLog.all().order_by("id").values(
+            "action", "module", "resource_type", "resource_id", "user_id", "user_agent", "new_values", "description"
+        )
+    return client.portal.call(rows)
+
+def test_reads_are_recorded_with_the_caller(make_client, seed):
+    client, records = start(make_client, seed)
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': records['user'].email})}",
+        "User-Agent": "viewer/1.0",
+    }
+    patient_id = records["patient"].id
+    assert client.get(f"/patients/{patient_id}", headers=headers).status_code == 200
+    assert client.get("/files/7/download").status_code == 200
+    assert client.get("/health/").status_code == 200
+
+    read, download = audit_rows(client)
+    assert read["action"] == AuditAction.READ
+    assert read["module"] == AuditModule.PATIENT
+    assert (read["resource_type"], read["resource_id"]) == ("patient", patient_id)
+    assert (read["user_id"], read["user_agent"]) == (records["user"].id, "viewer/1.0")
+    assert read["description"] == f"GET /patients/{patient_id} -> 200"
+    assert download["action"] == AuditAction.DOWNLOAD
+    assert (download["resource_id"], download["user_id"]) == (7, None)
+
+def test_mutations_record_the_body_and_created_id(make_client, seed):
+    client, records = start(make_client, seed)
+    body = {
+        "first_name": "Grace", "last_name": "Hopper", "date_of_birth": "1990-12-09", "gender": "female",
+        "phone_number": None, "email": None, "address": None, "medical_record_number": "MRN-2",
+        "created_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z",
+    }
+    created = client.post("/patients/", json=body)
+    assert created.status_code == 200
+    assert client.delete(f"/patients/{created.json()['id']}").status_code == 200
+
+    create, delete = audit_rows(client)
+    assert create["action"] == AuditAction.CREATE
+    assert create["resource_id"] == created.json()["id"]
+    assert create["new_values"] == body
+    assert delete["action"] == AuditAction.DELETE
+    assert delete["resource_id"] == created.json()["id"]
+
+def test_a_failing_audit_write_does_not_break_the_response(make_client, seed, monkeypatch):
+    client, records = start(make_client, seed)
+
+    async def failing(event):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(audit_middleware.audit_sink, "record", failing)
+    assert client.get(f"/patients/{records['patient'].id}").status_code == 200
+    assert audit_rows(client) == []
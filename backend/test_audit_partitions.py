@@ -0,0 +1,94 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+import pytest
+from backend.crud import audit_partitions
+from backend.crud.pagination import NEXT_CURSOR_HEADER
+from backend.models.tortoise_models import AuditLog, User
+from backend.routers import audit
+from backend.services import audit_archive
+from backend.services.audit_archive import AuditArchiver
+
+NOW = datetime.now(timezone.utc)
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_partitions, "AUDIT_ARCHIVE_DIR", tmp_path)
+    return tmp_path
+
+def start(make_client, *ages):
+    # One event per age in days, user 1 on every other one; returns the client and the ids oldest first
+    client = make_client(audit.router)
+
+    async def create():
+        await User.create(id=1, name="Reader", email="reader@example.com", password_hash="x", role="radiologist")
+        await AuditLog.bulk_create([
+            AuditLog(action="read", module="patient", description=f"{age} days", user_id=1 if i % 2 == 0 else None,
+                     created_at=NOW - timedelta(days=age))
+            for i, age in enumerate(ages)
+        ])
+        return await AuditLog.all().order_by("created_at", "id").values_list("id", flat=True)
+    return client, client.portal.call(create)
+
+def walk(client, path, **params):
+    ids, after = [], ""
+    while after is not None:
+        response = client.get(path, params={**params, "after": after, "limit": 2})
+        assert response.status_code == 200
+        ids += [row["id"] for row in response.json()]
+        after = response.headers.get(NEXT_CURSOR_HEADER)
+    return ids
+
+def test_maintenance_rolls_closed_months_and_archives_old_ones(make_client, archive_dir):
+    client, ids = start(make_client, 600, 500, 90, 60, 0)
+    archiver = AuditArchiver()
+    client.portal.call(archiver.run_once)
+
+    async def sources():
+        db = AuditLog._meta.db
+        return await audit_partitions.rolled_months(db), await AuditLog.all().count()
+    rolled, live = client.portal.call(sources)
+    assert live == 1
+    assert len(rolled) == 2
+    assert len(list(archive_dir.iterdir())) == 2
+    assert archiver.stats()["archived_rows"] == 2
+
+    # A date range reaching back merges the archive, the rolled months and the live table in order
+    since = (NOW - timedelta(days=700)).date()
+    assert walk(client, "/audit/logs", start_date=since) == ids
+    assert walk(client, "/audit/logs") == ids[2:]
+
+def test_user_history_includes_archived_months(make_client):
+    client, ids = start(make_client, 600, 500, 400, 0)
+    client.portal.call(AuditArchiver().run_once)
+    response = client.get("/audit/logs/user/1")
+    assert [row["id"] for row in response.json()] == [ids[0], ids[2]]
+    recent = client.get("/audit/logs/user/1", params={"start_date": (NOW - timedelta(days=450)).date()})
+    assert [row["id"] for row in recent.json()] == [ids[2]]
+
+def test_late_events_for_an_archived_month_are_appended(make_client):
+    client, ids = start(make_client, 600)
+    archiver = AuditArchiver()
+    client.portal.call(archiver.run_once)
+
+    async def late():
+        event = await AuditLog.create(action="read", module="patient", description="late", user_id=1,
+                                      created_at=NOW - timedelta(days=600))
+        await archiver.run_once()
+        return event.id
+    late_id = client.portal.call(late)
+    assert [row["id"] for row in client.get("/audit/logs/user/1").json()] == [ids[0], late_id]
+    assert archiver.stats()["archived_months"] == 2
+
+def test_passes_are_skipped_without_the_maintenance_lock(make_client, monkeypatch):
+    @asynccontextmanager
+    async def taken():
+        yield False
+    monkeypatch.setattr(audit_archive, "maintenance_lock", taken)
+    client, ids = start(make_client, 600)
+    archiver = AuditArchiver()
+    client.portal.call(archiver.run_once)
+    assert archiver.stats()["skipped"] == 1
+
+    async def live():
+        return await AuditLog.all().count()
+    assert client.portal.call(live) == 1
@@ -0,0 +1,69 @@
+import pytest
+from pydantic import ValidationError
+from backend.routers import auth, users
+from backend.services import principals
+from backend.services.principals import PrincipalCache
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = PrincipalCache(30, 2)
+    for module in (principals, auth, users):
+        monkeypatch.setattr(module, "principal_cache", cache)
+    return cache
+
+def login(client):
+    response = client.post("/auth/login", data={"username": "ada@example.com", "password": "secret"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def start(make_client):
+    client = make_client(auth.router, users.router)
+    user = {"name": "Ada", "email": "ada@example.com", "password": "secret", "role": "admin"}
+    assert client.post("/users/", json=user).status_code == 200
+    return client
+
+def test_principals_are_cached_per_token_subject(make_client, cache):
+    client = start(make_client)
+    headers = login(client)
+    for _ in range(3):
+        assert client.get("/auth/me", headers=headers).json()["name"] == "Ada"
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 2
+
+def test_login_refreshes_the_cached_principal(make_client):
+    client = start(make_client)
+    headers = login(client)
+    first = client.get("/auth/me", headers=headers).json()["last_login"]
+    login(client)
+    assert client.get("/auth/me", headers=headers).json()["last_login"] != first
+
+def test_user_changes_invalidate_the_cached_principal(make_client, cache):
+    client = start(make_client)
+    headers = login(client)
+    user = client.get("/auth/me", headers=headers).json()
+    changed = {
+        "name": "Augusta", "email": "ada@example.com", "password_hash": "x", "role": "admin", "phone": None,
+        "department": None, "specialization": None, "license_number": None,
+    }
+    assert client.put(f"/users/{user['id']}", json=changed).status_code == 200
+    assert client.get("/auth/me", headers=headers).json()["name"] == "Augusta"
+    assert client.delete(f"/users/{user['id']}").status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    assert cache.stats()["invalidations"] >= 2
+
+def test_cached_principals_are_read_only(make_client):
+    client = start(make_client)
+    principal = client.portal.call(principals.get_principal, "ada@example.com")
+    with pytest.raises(ValidationError):
+        principal.role = "technician"
+    assert client.portal.call(principals.get_principal, "ada@example.com").role == "admin"
+
+def test_least_recently_used_principals_are_evicted(cache):
+    class Snapshot:
+        def __init__(self, id):
+            self.id = id
+    for i in range(3):
+        cache.put(f"user{i}@example.com", Snapshot(i))
+    assert cache.get("user0@example.com") is None
+    assert cache.get("user2@example.com").id == 2
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,79 @@
+import pytest
+from backend.models.tortoise_models import Department, Document, User
+from backend.routers import document
+from backend.services import storage
+
+DATA = bytes(range(256)) * 40
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "BLOB_STORAGE_DIR", str(tmp_path))
+
+def upload(make_client):
+    # Returns the client and the download URL of one stored document holding DATA
+    client = make_client(document.router)
+
+    async def create_owner():
+        await Department.create(name="Radiology", description="")
+        await User.create(name="Admin", email="admin@example.com", password_hash="x", role="admin")
+    client.portal.call(create_owner)
+    form = {"title": "Consent", "category": "policy", "department_id": 1, "created_by_id": 1}
+    created = client.post("/documents/", data=form, files={"file": ("a.pdf", DATA, "application/pdf")})
+    assert created.status_code == 200
+    return client, f"/documents/{created.json()['id']}/download"
+
+def test_whole_file_and_conditional_requests(make_client):
+    client, url = upload(make_client)
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["accept-ranges"] == "bytes"
+    etag = response.headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+    # A partial copy with a stale validator is replaced as a whole
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"other"'}).status_code == 200
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+
+@pytest.mark.parametrize("header, first, last", [
+    ("bytes=0-99", 0, 99),
+    ("bytes=100-", 100, len(DATA) - 1),
+    ("bytes=-100", len(DATA) - 100, len(DATA) - 1),
+    ("bytes=10000-99999", 10000, len(DATA) - 1),
+])
+def test_satisfiable_ranges_are_partial(make_client, header, first, last):
+    client, url = upload(make_client)
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 206
+    assert response.content == DATA[first:last + 1]
+    assert response.headers["content-range"] == f"bytes {first}-{last}/{len(DATA)}"
+
+@pytest.mark.parametrize("header", ["bytes=5-3", "bytes=abc", "bytes=-", "bytes=--5", "bytes=0-1,4-5", "items=0-9"])
+def test_invalid_ranges_are_ignored(make_client, header):
+    client, url = upload(make_client)
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 200
+    assert response.content == DATA
+
+@pytest.mark.parametrize("header", [f"bytes={len(DATA)}-", f"bytes={len(DATA) + 10}-{len(DATA) + 20}", "bytes=-0"])
+def test_unsatisfiable_ranges_are_refused(make_client, header):
+    client, url = upload(make_client)
+    response = client.get(url, headers={"Range": header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(DATA)}"
+
+@pytest.mark.parametrize("values", [
+    {"file_path": "/etc/passwd", "checksum": None},
+    {"file_path": "/etc/passwd", "checksum": "../../../../../../etc/passwd"},
+])
+def test_tampered_rows_do_not_reach_files_outside_the_store(make_client, values):
+    client, url = upload(make_client)
+
+    async def tamper():
+        await Document.filter(id=1).update(**values)
+    client.portal.call(tamper)
+    response = client.get(url)
+    assert response.status_code == 404
+    assert b"root" not in response.content
@@ -0,0 +1,44 @@
+from datetime import date, datetime, timezone
+from backend.crud.filters import date_range, day_bounds
+from backend.models.tortoise_models import AuditLog, InventoryTransaction, Report
+
+async def query_plan(queryset) -> str:
+    rows = await queryset.model._meta.db.execute_query_dict(f"EXPLAIN QUERY PLAN {queryset.sql()}")
+    return " | ".join(row["detail"] for row in rows)
+
+def test_day_bounds_are_half_open_and_aware():
+    since, until = day_bounds(date(2024, 2, 28), date(2024, 2, 29))
+    assert since == datetime(2024, 2, 28, tzinfo=timezone.utc)
+    assert until == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert day_bounds() == (None, None)
+
+def test_date_range_kwargs():
+    assert date_range("created_at") == {}
+    assert date_range("created_at", start_date=date(2024, 1, 1)) == {"created_at__gte": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    assert date_range("created_at", end_date=date(2024, 1, 31)) == {"created_at__lt": datetime(2024, 2, 1, tzinfo=timezone.utc)}
+
+def test_generated_sql_compares_the_bare_column(run):
+    async def test():
+        for model, field in ((AuditLog, "created_at"), (Report, "created_at"), (InventoryTransaction, "transaction_date")):
+            sql = model.filter(**date_range(field, date(2024, 1, 1), date(2024, 1, 31))).sql()
+            assert f'"{field}">=\'2024-01-01 00:00:00+00:00\'' in sql
+            assert f'"{field}"<\'2024-02-01 00:00:00+00:00\'' in sql
+            assert "CAST(" not in sql.upper() and "DATE(" not in sql.upper()
+    run(test)
+
+def test_range_is_served_by_the_index(run):
+    async def test():
+        start, end = date(2024, 1, 1), date(2024, 1, 31)
+        for model in (AuditLog, Report):
+            plan = await query_plan(model.filter(**date_range("created_at", start, end)))
+            assert plan.startswith("SEARCH") and "USING INDEX" in plan and "created_at>? AND created_at<?" in plan.replace("=", ""), plan
+    run(test)
+
+def test_end_date_includes_the_whole_day(run):
+    async def test():
+        for moment in (datetime(2024, 1, 31, 0, 0, tzinfo=timezone.utc), datetime(2024, 1, 31, 23, 59, 59, 999999, tzinfo=timezone.utc),
+                       datetime(2024, 2, 1, tzinfo=timezone.utc)):
+            await AuditLog.create(action="read", module="patient", description=str(moment), created_at=moment)
+        found = await AuditLog.filter(**date_range("created_at", date(2024, 1, 31), date(2024, 1, 31))).count()
+        assert found == 2
+    run(test)
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+from backend.crud.inventory import InsufficientQuantity, apply_transactions
+from backend.models.tortoise_models import InventoryAlert, InventoryTransaction, Supply, SupplyCategory
+from backend.routers import inventory
+from backend.schemas.inventory import InventoryTransactionCreate
+from backend.services import inventory_alerts
+from backend.services.inventory_alerts import AlertEngine
+
+async def create_supply(records, name, quantity, **values):
+    return await Supply.create(
+        name=name, category=list(SupplyCategory)[0], unit_of_measure="ml", current_quantity=Decimal(quantity),
+        minimum_quantity=Decimal("20"), maximum_quantity=Decimal("500"), unit_price=Decimal("1"),
+        department=records["department"], created_by=records["user"], updated_by=records["user"], **values
+    )
+
+def line(supply_id, quantity, transaction_type="issued"):
+    return {
+        "supply_id": supply_id, "transaction_type": transaction_type, "quantity": quantity,
+        "performed_by_id": 1, "department_id": 1,
+    }
+
+async def stock():
+    return dict(await Supply.all().values_list("name", "current_quantity"))
+
+async def transaction_count():
+    return await InventoryTransaction.all().count()
+
+async def open_alerts():
+    return sorted(await InventoryAlert.filter(resolved_at__isnull=True).values_list("supply_id", "alert_type"))
+
+def test_alerts_open_and_resolve_with_stock_and_dates(run, seed):
+    async def test():
+        records = await seed()
+        stocked = await create_supply(records, "Contrast", "100")
+        expiring = await create_supply(records, "Syringes", "50", expiration_date=date.today() + timedelta(days=10))
+        expired = await create_supply(records, "Gel", "5", expiration_date=date.today() - timedelta(days=1))
+        engine = AlertEngine()
+        await engine.sweep()
+        assert await open_alerts() == [
+            (expiring.id, "expiring"), (expired.id, "expired"), (expired.id, "low_stock"),
+        ]
+
+        await Supply.filter(id=stocked.id).update(current_quantity=Decimal("10"))
+        await Supply.filter(id=expired.id).update(current_quantity=Decimal("100"))
+        engine.notify([stocked.id, expired.id])
+        await engine.process_dirty()
+        assert await open_alerts() == [
+            (stocked.id, "low_stock"), (expiring.id, "expiring"), (expired.id, "expired"),
+        ]
+        # Evaluating again opens no duplicates
+        engine.notify([stocked.id])
+        await engine.process_dirty()
+        assert engine.stats()["opened"] == 4
+        assert engine.stats()["resolved"] == 1
+    run(test)
+
+def test_failures_back_off_and_shutdown_still_completes(run, seed, monkeypatch):
+    attempts = []
+
+    async def failing(supply_ids):
+        attempts.append(list(supply_ids))
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(inventory_alerts, "evaluate_supply_alerts", failing)
+    monkeypatch.setattr(inventory_alerts, "ALERT_RETRY_BASE_DELAY", 0.05)
+    monkeypatch.setattr(inventory_alerts, "ALERT_SWEEP_INTERVAL", 3600)
+
+    async def test():
+        records = await seed()
+        supply = await create_supply(records, "Contrast", "10")
+        engine = AlertEngine()
+        engine.notify([supply.id])
+        engine.start()
+        # Waits of 0.05, 0.1 and 0.2 seconds fit in half a second; without backoff this would spin
+        await asyncio.sleep(0.5)
+        assert 2 <= len(attempts) <= 5
+        await engine.stop()
+        # The final pass at shutdown failed too, and the supply is still pending
+        assert engine.stats()["pending"] == 1
+        assert engine.stats()["failures"] == len(attempts) - 1
+    run(test)
+
+def test_batches_apply_every_line_or_none(make_client, seed):
+    client = make_client(inventory.router)
+    records = client.portal.call(seed)
+
+    async def create():
+        return [(await create_supply(records, name, quantity)).id for name, quantity in (("Contrast", "100"), ("Saline", "10"))]
+    contrast, saline = client.portal.call(create)
+
+    response = client.post("/inventory/transactions/batch", json=[line(contrast, "30"), line(saline, "20")])
+    assert response.status_code == 400
+    assert client.portal.call(stock) == {"Contrast": 100, "Saline": 10}
+    assert client.portal.call(transaction_count) == 0
+
+    # Lines for the same supply are netted before the stock check
+    response = client.post(
+        "/inventory/transactions/batch",
+        json=[line(contrast, "30"), line(saline, "15"), line(saline, "10", "received")],
+    )
+    assert response.status_code == 200
+    assert client.portal.call(stock) == {"Contrast": 70, "Saline": 5}
+    assert client.post("/inventory/transactions", json=line(99, "1")).status_code == 404
+
+def test_concurrent_issues_never_take_stock_below_zero(run, seed):
+    async def test():
+        records = await seed()
+        supply = await create_supply(records, "Contrast", "10")
+        issue = InventoryTransactionCreate(**line(supply.id, "3"))
+        results = await asyncio.gather(*(apply_transactions([issue]) for _ in range(5)), return_exceptions=True)
+        assert sum(not isinstance(result, Exception) for result in results) == 3
+        assert all(isinstance(result, InsufficientQuantity) for result in results if isinstance(result, Exception))
+        assert await stock() == {"Contrast": 1}
+        assert await transaction_count() == 3
+    run(test)
+
+def test_study_issues_report_every_problem(make_client, seed):
+    client = make_client(inventory.router)
+    records = client.portal.call(seed)
+
+    async def create():
+        return (
+            (await create_supply(records, "Contrast", "100")).id,
+            (await create_supply(records, "Gel", "5", expiration_date=date.today() - timedelta(days=1))).id,
+        )
+    contrast, gel = client.portal.call(create)
+    url = f"/inventory/studies/{records['study'].id}/issue"
+
+    response = client.post(url, json={"performed_by_id": 1, "items": [
+        {"supply_id": contrast, "quantity": "150"}, {"supply_id": gel, "quantity": "1"}, {"supply_id": 99, "quantity": "1"},
+    ]})
+    assert response.status_code == 400
+    assert sorted(problem["supply_id"] for problem in response.json()["detail"]) == [contrast, gel, 99]
+
+    response = client.post(url, json={"performed_by_id": 1, "items": [
+        {"supply_id": contrast, "quantity": "40"}, {"supply_id": contrast, "quantity": "10"},
+    ]})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    async def issued_for():
+        return set(await InventoryTransaction.all().values_list("study_id", "department_id"))
+    assert client.portal.call(issued_for) == {(records["study"].id, records["department"].id)}
+    assert client.portal.call(stock)["Contrast"] == 50
+    assert client.post("/inventory/studies/99/issue", json={
+        "performed_by_id": 1, "items": [{"supply_id": contrast, "quantity": "1"}],
+    }).status_code == 404
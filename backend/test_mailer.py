@@ -0,0 +1,100 @@
+import socket
+from datetime import timedelta
+import pytest
+from tortoise import timezone
+from backend.models.tortoise_models import EmailStatus, OutboundEmail
+from backend.services import mailer
+from backend.services.mailer import MailQueue, enqueue_email
+
+controller = pytest.importorskip("aiosmtpd.controller")
+
+class Inbox:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos[0], envelope.content.decode()))
+        return "250 OK"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def inbox(monkeypatch):
+    inbox = Inbox()
+    port = free_port()
+    server = controller.Controller(inbox, hostname="127.0.0.1", port=port)
+    server.start()
+    monkeypatch.setattr(mailer, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(mailer, "SMTP_PORT", port)
+    monkeypatch.setattr(mailer, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(mailer, "SMTP_USERNAME", None)
+    yield inbox
+    server.stop()
+
+async def statuses():
+    return dict(await OutboundEmail.all().values_list("recipient", "status"))
+
+def test_batches_go_out_over_pooled_connections(run, inbox):
+    async def test():
+        queue = MailQueue()
+        for i in range(5):
+            await enqueue_email(f"user{i}@example.com", "Reset", f"Code {i}")
+        assert await queue.process_batch() == 5
+        await enqueue_email("late@example.com", "Reset", "Code 5")
+        assert await queue.process_batch() == 1
+        await queue.stop()
+
+        assert sorted(recipient for recipient, _ in inbox.messages)[-1] == "user4@example.com"
+        assert len(inbox.messages) == 6
+        assert set((await statuses()).values()) == {EmailStatus.SENT}
+        # Sent bodies are not kept in the database
+        assert set(await OutboundEmail.all().values_list("body", flat=True)) == {""}
+        # Both lanes connected once and were reused by the second batch
+        assert queue.stats()["connections_opened"] == mailer.MAIL_CONNECTIONS
+        assert queue.stats()["open_connections"] == 0
+    run(test)
+
+def test_claimed_messages_are_leased(run, inbox):
+    async def test():
+        first, second = MailQueue(), MailQueue()
+        message = await enqueue_email("ada@example.com", "Reset", "Code")
+        assert [claimed.id for claimed in await first._claim()] == [message.id]
+        # Another worker leaves it alone while the lease lasts, then takes it over
+        assert await second._claim() == []
+        await OutboundEmail.filter(id=message.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+        assert await second.process_batch() == 1
+        await second.stop()
+        assert len(inbox.messages) == 1
+    run(test)
+
+def test_rejections_fail_and_outages_are_retried_later(run, inbox, monkeypatch):
+    async def test():
+        queue = MailQueue()
+        await enqueue_email("bounce@example.com", "Reset", "Code")
+        await queue.process_batch()
+        await queue.stop()
+        assert (await statuses())["bounce@example.com"] == EmailStatus.FAILED
+        assert (await OutboundEmail.get(recipient="bounce@example.com")).body == ""
+
+        monkeypatch.setattr(mailer, "SMTP_PORT", free_port())
+        await enqueue_email("ada@example.com", "Reset", "Code")
+        await queue.process_batch()
+        message = await OutboundEmail.get(recipient="ada@example.com")
+        assert (message.status, message.attempts) == (EmailStatus.PENDING, 1)
+        assert message.next_attempt_at > timezone.now()
+        assert message.last_error
+        assert message.body == "Code"
+        # Not due yet, so the next batch does not touch it
+        assert await queue.process_batch() == 0
+        assert queue.stats()["retried"] == 1
+        assert queue.stats()["failed"] == 1
+    run(test)
@@ -0,0 +1,74 @@
+import asyncio
+import shutil
+import sqlite3
+from pathlib import Path
+from aerich import Command
+from tortoise import Tortoise
+from backend.database.tortoise_config import MIGRATIONS_DIR
+
+MODULES = {"models": ["backend.models.tortoise_models", "aerich.models"]}
+TRACKED_DB = Path(__file__).parent / "db.sqlite3"
+
+def config(path) -> dict:
+    return {
+        "connections": {"default": f"sqlite://{path}"},
+        "apps": {"models": {"models": MODULES["models"], "default_connection": "default"}},
+    }
+
+def upgrade(path) -> list:
+    async def main():
+        command = Command(tortoise_config=config(path), app="models", location=str(MIGRATIONS_DIR.parent))
+        await command.init()
+        try:
+            return await command.upgrade(run_in_transaction=True)
+        finally:
+            await Tortoise.close_connections()
+    return asyncio.run(main())
+
+def generate(path) -> None:
+    async def main():
+        await Tortoise.init(db_url=f"sqlite://{path}", modules=MODULES)
+        await Tortoise.generate_schemas()
+        await Tortoise.close_connections()
+    asyncio.run(main())
+
+def schema(path) -> dict:
+    # Columns, foreign keys and indexes per table; index names are left out, SQLite names implicit ones itself
+    db = sqlite3.connect(path)
+    tables = [row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    described = {}
+    for table in tables:
+        columns = sorted(tuple(row[1:6]) for row in db.execute(f'PRAGMA table_info("{table}")'))
+        foreign_keys = sorted((row[2], row[3], row[4], row[6]) for row in db.execute(f'PRAGMA foreign_key_list("{table}")'))
+        indexes = sorted(
+            (row[2], tuple(info[2] for info in db.execute(f'PRAGMA index_info("{row[1]}")')))
+            for row in db.execute(f'PRAGMA index_list("{table}")')
+        )
+        described[table] = (columns, foreign_keys, indexes)
+    db.close()
+    return described
+
+def test_migrations_build_the_schema_the_models_declare(tmp_path):
+    migrated, generated = tmp_path / "migrated.sqlite3", tmp_path / "generated.sqlite3"
+    applied = upgrade(migrated)
+    assert applied == sorted((path.name for path in MIGRATIONS_DIR.glob("*.py")), key=lambda name: int(name.split("_")[0]))
+    generate(generated)
+    assert schema(migrated) == schema(generated)
+    assert upgrade(migrated) == []
+
+def test_existing_database_upgrades_in_place(tmp_path):
+    # The tracked development database predates the migrations
+    existing, generated = tmp_path / "existing.sqlite3", tmp_path / "generated.sqlite3"
+    shutil.copy(TRACKED_DB, existing)
+    users = sqlite3.connect(existing).execute("SELECT COUNT(*) FROM users").fetchone()
+    upgrade(existing)
+    generate(generated)
+    assert schema(existing) == schema(generated)
+
+    db = sqlite3.connect(existing)
+    assert db.execute("SELECT COUNT(*) FROM users").fetchone() == users
+    # Patients stored before the typeahead existed are found by it
+    assert db.execute("SELECT first_name_search, last_name_search FROM patients WHERE last_name = 'samir'").fetchone() == ("ali", "samir")
+    db.execute("INSERT INTO audit_logs (action, module, description, created_at) VALUES ('read', 'patient', 'anonymous', '2024-01-01')")
+    assert db.execute("SELECT COUNT(*) FROM audit_logs WHERE user_id IS NULL").fetchone() == (1,)
+    db.close()
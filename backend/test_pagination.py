@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from backend.crud.pagination import NEXT_CURSOR_HEADER, encode_cursor, keyset_filter
+from backend.models.tortoise_models import Department
+from backend.routers import departments
+
+def walk(client, limit):
+    pages, after = [], ""
+    while after is not None:
+        response = client.get("/departments/", params={"after": after, "limit": limit})
+        assert response.status_code == 200
+        pages.append([row["name"] for row in response.json()])
+        after = response.headers.get(NEXT_CURSOR_HEADER)
+    return pages
+
+def test_keyset_pages_cover_every_row_once_in_order(make_client):
+    client = make_client(departments.router)
+
+    async def create():
+        for i in range(7):
+            await Department.create(name=f"d{i}")
+        # Equal timestamps are broken by id
+        await Department.filter(name__in=["d2", "d3", "d4"]).update(created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    client.portal.call(create)
+
+    pages = walk(client, 3)
+    assert pages == [["d2", "d3", "d4"], ["d0", "d1", "d5"], ["d6"]]
+
+def test_rows_inserted_before_the_cursor_do_not_shift_later_pages(make_client):
+    client = make_client(departments.router)
+
+    async def create(*names):
+        for name in names:
+            await Department.create(name=name)
+    client.portal.call(create, "a", "b", "c", "d")
+
+    first = client.get("/departments/", params={"after": "", "limit": 2})
+    async def backdate():
+        await Department.create(name="early")
+        await Department.filter(name="early").update(created_at=datetime(2000, 1, 1, tzinfo=timezone.utc))
+    client.portal.call(backdate)
+    second = client.get("/departments/", params={"after": first.headers[NEXT_CURSOR_HEADER], "limit": 2})
+    assert [row["name"] for row in first.json()] == ["a", "b"]
+    assert [row["name"] for row in second.json()] == ["c", "d"]
+
+def test_offset_mode_is_unchanged_and_sends_no_cursor(make_client):
+    client = make_client(departments.router)
+
+    async def create():
+        for i in range(5):
+            await Department.create(name=f"d{i}")
+    client.portal.call(create)
+
+    response = client.get("/departments/", params={"skip": 1, "limit": 2})
+    assert [row["name"] for row in response.json()] == ["d1", "d2"]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+def test_invalid_cursor_is_a_400(make_client):
+    client = make_client(departments.router)
+    assert client.get("/departments/", params={"after": "not-a-cursor!"}).status_code == 400
+    assert client.get("/departments/", params={"after": encode_cursor([1])}).status_code == 400
+    # Well-formed cursors carrying values the sort keys cannot take
+    for values in (["garbage", 1], [{"a": 1}, 1], ["2024-01-01T00:00:00", "x"], ["2024-01-01T00:00:00", [1]], [None, 1]):
+        assert client.get("/departments/", params={"after": encode_cursor(values)}).status_code == 400
+
+def test_descending_keys_flip_the_comparison(run):
+    async def test():
+        sql = Department.filter(keyset_filter(("-created_at", "id"), [datetime(2024, 1, 1, tzinfo=timezone.utc), 5])).sql()
+        assert "\"created_at\"<'2024-01-01 00:00:00+00:00'" in sql
+        assert "\"created_at\"='2024-01-01 00:00:00+00:00' AND \"id\">5" in sql
+    run(test)
@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from backend.routers import auth, users
+from backend.services import passwords
+from backend.services.passwords import PasswordHasher
+
+def test_hash_and_verify_round_trip_on_the_pool(run):
+    async def test():
+        hasher = PasswordHasher(2, 10)
+        hashed = await hasher.hash("secret")
+        assert hashed != "secret"
+        assert await hasher.verify("secret", hashed)
+        assert not await hasher.verify("wrong", hashed)
+        assert (await hasher._run(lambda: threading.current_thread().name)).startswith("password-hash")
+        assert hasher.stats()["completed"] == 4
+        assert hasher.stats()["running"] == 0
+    run(test)
+
+def test_a_full_queue_turns_callers_away(run):
+    async def test():
+        hasher = PasswordHasher(1, 2)
+        release = threading.Event()
+        # One call holds the only worker and two wait for it, which fills the queue
+        busy = [asyncio.create_task(hasher._run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert (hasher.stats()["running"], hasher.stats()["queued"]) == (1, 2)
+        with pytest.raises(HTTPException) as raised:
+            await hasher.hash("secret")
+        assert raised.value.status_code == 503
+        assert raised.value.headers == {"Retry-After": "1"}
+
+        release.set()
+        await asyncio.gather(*busy)
+        assert hasher.stats()["completed"] == 3
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["peak_queued"] == 2
+    run(test)
+
+def test_sign_ins_beyond_the_queue_get_a_503(make_client, monkeypatch):
+    client = make_client(auth.router, users.router)
+    user = {"name": "Ada", "email": "ada@example.com", "password": "secret", "role": "admin"}
+    assert client.post("/users/", json=user).status_code == 200
+
+    monkeypatch.setattr(passwords, "password_hasher", PasswordHasher(1, 0))
+    response = client.post("/auth/login", data={"username": "ada@example.com", "password": "secret"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
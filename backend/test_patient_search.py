@@ -0,0 +1,64 @@
+from datetime import date
+from backend.models.tortoise_models import Patient
+from backend.routers import patients
+
+PATIENTS = (
+    # first name, last name, MRN, date of birth
+    ("Jo", "Smith", "MRN-2", date(1980, 5, 1)),
+    ("John", "Smith", "MRN-21", date(1975, 2, 3)),
+    ("Joanna", "Smithers", "MRN-30", date(1980, 5, 1)),
+    ("José", "Núñez", "MRN-20", date(1990, 7, 9)),
+    ("Smitty", "Adams", "MRN-40", date(1960, 1, 1)),
+)
+
+def start(make_client, seed):
+    # The seeded Ada Lovelace (MRN-1) matches none of the searches below
+    client = make_client(patients.router)
+    client.portal.call(seed)
+
+    async def create():
+        for first, last, mrn, born in PATIENTS:
+            await Patient.create(
+                first_name=first, last_name=last, medical_record_number=mrn, date_of_birth=born, gender="other"
+            )
+    client.portal.call(create)
+    return client
+
+def search(client, q=None, **params):
+    response = client.get("/patients/search", params={"q": q, **params} if q is not None else params)
+    assert response.status_code == 200
+    return [f"{patient['last_name']}, {patient['first_name']}" for patient in response.json()]
+
+def test_name_prefixes_match_last_names_before_first_names(make_client, seed):
+    client = start(make_client, seed)
+    assert search(client, "smi") == ["Smith, Jo", "Smith, John", "Smithers, Joanna", "Adams, Smitty"]
+    assert search(client, "SMITHE") == ["Smithers, Joanna"]
+    assert search(client, "smi", limit=2) == ["Smith, Jo", "Smith, John"]
+    assert search(client, "zz") == []
+    assert search(client, "  ") == []
+
+def test_accents_and_case_are_folded(make_client, seed):
+    client = start(make_client, seed)
+    assert search(client, "nunez") == ["Núñez, José"]
+    assert search(client, "NÚÑ") == ["Núñez, José"]
+    assert search(client, "jose nunez") == ["Núñez, José"]
+
+def test_full_names_in_either_order(make_client, seed):
+    client = start(make_client, seed)
+    # Both parts are prefixes, so "smith jo" takes in Joanna Smithers too
+    expected = ["Smith, Jo", "Smith, John", "Smithers, Joanna"]
+    assert search(client, "smith jo") == expected
+    assert search(client, "Smith, Jo") == expected
+    assert search(client, "jo smith") == expected
+    assert search(client, "smith, joh") == ["Smith, John"]
+
+def test_medical_record_numbers_rank_exact_matches_first(make_client, seed):
+    client = start(make_client, seed)
+    assert search(client, "MRN-2") == ["Smith, Jo", "Núñez, José", "Smith, John"]
+    assert search(client, " MRN-30 ") == ["Smithers, Joanna"]
+
+def test_date_of_birth_narrows_or_lists_on_its_own(make_client, seed):
+    client = start(make_client, seed)
+    assert search(client, "smi", date_of_birth="1980-05-01") == ["Smith, Jo", "Smithers, Joanna"]
+    assert search(client, date_of_birth="1980-05-01") == ["Smith, Jo", "Smithers, Joanna"]
+    assert search(client) == []
@@ -0,0 +1,68 @@
+from backend.crud.report_search import ensure_report_search_index, index_report
+from backend.models.tortoise_models import Report
+from backend.routers import patients, report, studies
+
+def hits(client, q, **params):
+    response = client.get("/reports/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+def start(make_client, seed, *findings):
+    # One report per findings text on the seeded study, indexed as the CRUD layer does
+    client = make_client(report.router, studies.router, patients.router)
+    records = client.portal.call(seed)
+
+    async def create():
+        ids = []
+        for i, text in enumerate(findings):
+            created = await Report.create(
+                study=records["study"], patient=records["patient"], radiologist=records["user"],
+                clinical_indication="Cough", findings=text, impression="See findings", report_number=f"R-{i}"
+            )
+            await index_report(created.id)
+            ids.append(created.id)
+        return ids
+    return client, records, client.portal.call(create)
+
+def test_words_and_prefixes_match(make_client, seed):
+    client, records, (nodule, fracture) = start(
+        make_client, seed, "Small nodule in the right upper lobe.", "No fracture. Lungs clear."
+    )
+    assert [hit["report"]["id"] for hit in hits(client, "nodule")] == [nodule]
+    assert [hit["report"]["id"] for hit in hits(client, "nodul*")] == [nodule]
+    assert [hit["report"]["id"] for hit in hits(client, "fracture lungs")] == [fracture]
+    # Query syntax is not passed through to FTS5
+    assert hits(client, '"drop table') == []
+    assert "<mark>nodule</mark>" in hits(client, "nodule")[0]["snippet"]
+
+def test_snippets_escape_report_text(make_client, seed):
+    client, records, ids = start(make_client, seed, 'Nodule <img src=x onerror="alert(1)"> & mass')
+    snippet = hits(client, "nodule")[0]["snippet"]
+    assert "<img" not in snippet
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; &amp; mass" in snippet
+    assert snippet.startswith("<mark>Nodule</mark>")
+
+def test_reports_leave_the_index_with_their_study_or_patient(make_client, seed):
+    client, records, (first, second) = start(make_client, seed, "Nodule one.", "Nodule two.")
+    assert client.delete(f"/reports/{first}").status_code == 200
+    assert [hit["report"]["id"] for hit in hits(client, "nodule")] == [second]
+    assert client.delete(f"/patients/{records['patient'].id}").status_code == 200
+
+    async def indexed():
+        rows = await Report._meta.db.execute_query_dict("SELECT rowid FROM report_search")
+        return [row["rowid"] for row in rows]
+    assert client.portal.call(indexed) == []
+
+def test_index_backfills_and_prunes_on_startup(run, seed):
+    async def test():
+        records = await seed()
+        report_obj = await Report.create(
+            study=records["study"], patient=records["patient"], radiologist=records["user"],
+            clinical_indication="Cough", findings="Nodule", impression="Nodule", report_number="R-1"
+        )
+        db = Report._meta.db
+        await db.execute_query("INSERT INTO report_search(rowid, findings) VALUES (999, 'orphan')")
+        await ensure_report_search_index()
+        rows = await db.execute_query_dict("SELECT rowid FROM report_search")
+        assert [row["rowid"] for row in rows] == [report_obj.id]
+    run(test)
@@ -0,0 +1,69 @@
+import itertools
+from contextlib import ExitStack
+from datetime import date
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tortoise import connections
+from tortoise.contrib.fastapi import register_tortoise
+from tortoise.utils import get_schema_sql
+from backend.database import routing
+from backend.crud.worklist import refresh_worklist
+from backend.database.routing import READ_PRIMARY_COOKIE, ReadReplicaMiddleware
+from backend.models.tortoise_models import Patient
+from backend.routers import patients
+
+@pytest.fixture
+def client(monkeypatch):
+    # A primary and one replica, each its own in-memory database, so every row shows where it was read
+    monkeypatch.setattr(routing, "REPLICA_CONNECTIONS", ["replica_0"])
+    monkeypatch.setattr(routing, "_replicas", itertools.cycle(["replica_0"]))
+    app = FastAPI()
+    app.include_router(patients.router)
+    app.add_middleware(ReadReplicaMiddleware)
+    register_tortoise(app, config={
+        "connections": {"default": "sqlite://:memory:", "replica_0": "sqlite://:memory:"},
+        "apps": {"models": {"models": ["backend.models.tortoise_models"], "default_connection": "default"}},
+        "routers": ["backend.database.routing.ReplicaRouter"],
+    }, generate_schemas=True)
+    with ExitStack() as stack:
+        client = stack.enter_context(TestClient(app))
+
+        async def create():
+            # The replica takes the primary's schema, as it would through replication
+            await connections.get("replica_0").execute_script(get_schema_sql(connections.get("default"), safe=False))
+            for connection, name in (("default", "Primary"), ("replica_0", "Replica")):
+                await Patient.create(
+                    first_name=name, last_name="Row", date_of_birth=date(1990, 1, 1), gender="female",
+                    medical_record_number=f"MRN-{name}", using_db=connections.get(connection)
+                )
+        client.portal.call(create)
+        yield client
+    # Tortoise merges connection configs across inits; later tests expect a single database again
+    connections.db_config.pop("replica_0", None)
+
+def names(response):
+    assert response.status_code == 200
+    return [patient["first_name"] for patient in response.json()]
+
+def test_reads_go_to_the_replica_unless_pinned(client):
+    assert names(client.get("/patients/")) == ["Replica"]
+    assert names(client.get("/patients/", headers={"X-Read-Primary": "1"})) == ["Primary"]
+
+def test_writes_go_to_the_primary_and_pin_the_client_briefly(client):
+    deleted = client.delete("/patients/1")
+    assert deleted.status_code == 200
+    assert READ_PRIMARY_COOKIE in deleted.headers["set-cookie"]
+    # The test client keeps the cookie, so the follow-up read sees the delete
+    assert names(client.get("/patients/")) == []
+
+    client.cookies.clear()
+    assert names(client.get("/patients/")) == ["Replica"]
+
+def test_failed_writes_do_not_pin_the_client(client):
+    response = client.delete("/patients/99")
+    assert response.status_code == 404
+    assert "set-cookie" not in response.headers
+
+def test_transactions_run_with_replicas_configured(client):
+    client.portal.call(refresh_worklist, [1])
@@ -0,0 +1,118 @@
+from backend.models.tortoise_models import User
+from backend.routers import schedule
+
+def slot(**values):
+    return {"user_id": 1, "date": "2024-03-04", "start_time": "08:00:00", "end_time": "16:00:00", **values}
+
+def start(make_client, seed):
+    # Users 1 and 2, room 1 and equipment 1
+    client = make_client(schedule.router)
+
+    async def create():
+        await seed()
+        await User.create(name="Tech", email="tech@example.com", password_hash="x", role="technician")
+    client.portal.call(create)
+    return client
+
+def days(client, start_date, end_date, **params):
+    response = client.get("/schedules/date-range/", params={"start_date": start_date, "end_date": end_date, **params})
+    assert response.status_code == 200
+    return [(row["date"], row["start_time"][:5]) for row in response.json()]
+
+def test_recurring_schedules_expand_with_their_exceptions(make_client, seed):
+    client = start(make_client, seed)
+    series = client.post("/schedules/", json=slot(recurrence_rule="FREQ=WEEKLY;BYDAY=MO,WE")).json()
+    assert series["is_recurring"] is True
+    assert series["recurrence_end"] is None
+
+    exceptions = f"/schedules/{series['id']}/exceptions"
+    assert client.post(exceptions, json={"original_date": "2024-03-06", "is_cancelled": True}).status_code == 200
+    moved = {"original_date": "2024-03-11", "new_date": "2024-03-12", "start_time": "10:00:00"}
+    assert client.post(exceptions, json=moved).status_code == 200
+    assert client.post(exceptions, json={"original_date": "2024-03-05", "is_cancelled": True}).status_code == 400
+
+    assert days(client, "2024-03-01", "2024-03-14") == [
+        ("2024-03-04", "08:00"), ("2024-03-12", "10:00"), ("2024-03-13", "08:00"),
+    ]
+    # A cancelled occurrence frees the slot
+    assert client.post("/schedules/", json=slot(date="2024-03-06")).status_code == 200
+
+def test_count_rules_are_bounded(make_client, seed):
+    client = start(make_client, seed)
+    series = client.post("/schedules/", json=slot(recurrence_rule="FREQ=DAILY;COUNT=3")).json()
+    assert series["recurrence_end"] == "2024-03-06"
+    assert len(days(client, "2024-03-01", "2024-03-31")) == 3
+
+def test_invalid_rules_are_rejected_with_the_request(make_client, seed):
+    client = start(make_client, seed)
+    for rule in ("FREQ=DAILY;COUNT=abc", "FREQ=HOURLY", "FREQ=WEEKLY;UNTIL=soon", "FREQ=DAILY;BYDAY=MO"):
+        response = client.post("/schedules/", json=slot(recurrence_rule=rule))
+        assert response.status_code == 422, rule
+    series = client.post("/schedules/", json=slot(recurrence_rule="FREQ=DAILY")).json()
+    assert client.put(f"/schedules/{series['id']}", json=slot(recurrence_rule="FREQ=DAILY;COUNT=abc")).status_code == 422
+
+def test_updates_without_a_rule_keep_the_series_and_its_exceptions(make_client, seed):
+    client = start(make_client, seed)
+    series = client.post("/schedules/", json=slot(recurrence_rule="FREQ=WEEKLY;COUNT=4")).json()
+    exceptions = f"/schedules/{series['id']}/exceptions"
+    client.post(exceptions, json={"original_date": "2024-03-11", "is_cancelled": True})
+
+    response = client.put(f"/schedules/{series['id']}", json=slot(notes="Covering CT"))
+    assert response.status_code == 200
+    updated = response.json()
+    assert updated["recurrence_rule"] == "FREQ=WEEKLY;COUNT=4"
+    assert updated["recurrence_end"] == "2024-03-25"
+    assert updated["notes"] == "Covering CT"
+    assert [e["original_date"] for e in client.get(exceptions).json()] == ["2024-03-11"]
+
+def test_rule_changes_drop_only_exceptions_the_new_rule_no_longer_produces(make_client, seed):
+    client = start(make_client, seed)
+    series = client.post("/schedules/", json=slot(recurrence_rule="FREQ=WEEKLY;BYDAY=MO,WE")).json()
+    exceptions = f"/schedules/{series['id']}/exceptions"
+    client.post(exceptions, json={"original_date": "2024-03-06", "is_cancelled": True})
+    client.post(exceptions, json={"original_date": "2024-03-11", "is_cancelled": True})
+
+    assert client.put(f"/schedules/{series['id']}", json=slot(recurrence_rule="FREQ=WEEKLY;BYDAY=MO")).status_code == 200
+    assert [e["original_date"] for e in client.get(exceptions).json()] == ["2024-03-11"]
+    assert client.put(f"/schedules/{series['id']}", json=slot(recurrence_rule=None)).status_code == 200
+    assert client.get(exceptions).json() == []
+
+def test_updating_a_missing_schedule_is_a_404(make_client, seed):
+    client = start(make_client, seed)
+    assert client.put("/schedules/999", json=slot()).status_code == 404
+
+def test_overlaps_on_any_resource_conflict(make_client, seed):
+    client = start(make_client, seed)
+    assert client.post("/schedules/", json=slot(room_id=1)).status_code == 200
+    # Same user, same room held by someone else, and a shift starting as the first ends
+    assert client.post("/schedules/", json=slot(start_time="15:00:00", end_time="18:00:00")).status_code == 400
+    assert client.post("/schedules/", json=slot(user_id=2, room_id=1, start_time="09:00:00")).status_code == 400
+    assert client.post("/schedules/", json=slot(start_time="16:00:00", end_time="17:00:00")).status_code == 200
+    # Updating a schedule does not conflict with itself
+    assert client.put("/schedules/1", json=slot(room_id=1, end_time="15:30:00")).status_code == 200
+
+def test_night_shifts_run_into_the_next_day(make_client, seed):
+    client = start(make_client, seed)
+    assert client.post("/schedules/", json=slot(start_time="22:00:00", end_time="06:00:00")).status_code == 200
+    assert client.post("/schedules/", json=slot(date="2024-03-05", start_time="05:00:00", end_time="07:00:00")).status_code == 400
+    assert client.post("/schedules/", json=slot(date="2024-03-05", start_time="06:00:00", end_time="07:00:00")).status_code == 200
+
+def test_batches_are_checked_against_stored_schedules_and_each_other(make_client, seed):
+    client = start(make_client, seed)
+    client.post("/schedules/", json=slot(recurrence_rule="FREQ=WEEKLY;BYDAY=MO"))
+    batch = [
+        slot(user_id=2, equipment_id=1, date="2024-04-01"),
+        slot(user_id=1, date="2024-03-18", start_time="12:00:00", end_time="13:00:00"),
+        slot(user_id=1, equipment_id=1, date="2024-04-01", start_time="20:00:00", end_time="21:00:00"),
+        slot(user_id=2, equipment_id=1, date="2024-04-01", start_time="12:00:00", end_time="13:00:00"),
+    ]
+    results = client.post("/schedules/check-conflicts", json=batch).json()
+    assert results == [
+        {"index": 1, "conflicts": [{"resource": "user", "resource_id": 1, "schedule_id": 1, "proposal_index": None}]},
+        {"index": 3, "conflicts": [
+            {"resource": "user", "resource_id": 2, "schedule_id": None, "proposal_index": 0},
+            {"resource": "equipment", "resource_id": 1, "schedule_id": None, "proposal_index": 0},
+        ]},
+    ]
+    assert client.post("/schedules/bulk", json=batch).status_code == 400
+    assert client.post("/schedules/bulk", json=[batch[0], batch[2]]).status_code == 200
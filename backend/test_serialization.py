@@ -0,0 +1,40 @@
+from datetime import date
+from tortoise.contrib.pydantic import pydantic_model_creator
+from backend.crud.serialization import serialize_queryset
+from backend.models.tortoise_models import Department, Document, Document_Pydantic, Study, User
+
+def test_plain_rows_match_the_model_instance_path(run):
+    async def test():
+        department = await Department.create(name="Radiology", description="")
+        user = await User.create(name="Admin", email="admin@example.com", password_hash="x", role="admin")
+        for i, (tags, metadata) in enumerate([
+            (["consent", "ct"], {"filename": "a.pdf", "pages": 3, "signed": True}),
+            (None, None),
+            ([], {"nested": {"list": [1, 2.5, None]}}),
+        ]):
+            await Document.create(
+                title=f"Doc {i}", category="policy", department=department, created_by=user, updated_by=user,
+                file_path=f"/blobs/{i}", file_type="application/pdf", file_size=10 * i, checksum=f"{i:064x}",
+                tags=tags, metadata=metadata, access_control={"roles": ["admin"]} if i else None,
+                expiration_date=date(2030, 1, i + 1),
+            )
+        fast = await serialize_queryset(Document_Pydantic, Document.all().order_by("id"))
+        slow = [await Document_Pydantic.from_tortoise_orm(document) for document in await Document.all().order_by("id")]
+        assert [document.model_dump() for document in fast] == [document.model_dump() for document in slow]
+        assert fast[0].tags == ["consent", "ct"]
+        assert fast[2].metadata == {"nested": {"list": [1, 2.5, None]}}
+    run(test)
+
+def test_models_with_relations_fall_back_to_instances(run, seed):
+    async def test():
+        records = await seed()
+        # Created after the ORM is initialized, so the relation is part of the schema
+        StudyWithPatient = pydantic_model_creator(
+            Study, name="StudyWithPatient", include=("id", "study_type", "patient", "patient_id")
+        )
+        studies = await serialize_queryset(StudyWithPatient, Study.all())
+        assert [study.model_dump() for study in studies] == [
+            study.model_dump() for study in await StudyWithPatient.from_queryset(Study.all())
+        ]
+        assert studies[0].patient.medical_record_number == records["patient"].medical_record_number
+    run(test)
@@ -0,0 +1,84 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from backend.models.tortoise_models import Appointment, MaintenanceRecord, Schedule, User
+from backend.routers import appointments
+
+DAY = date.today() + timedelta(days=1)
+
+def start(make_client, seed, *shifts):
+    # shifts are (user, start hour, end hour, status) on the seeded CT scanner; user 2 is a second technologist
+    client = make_client(appointments.router)
+    records = client.portal.call(seed)
+
+    async def create():
+        await User.create(name="Tech", email="tech@example.com", password_hash="x", role="technician")
+        for user_id, first, last, status in shifts:
+            await Schedule.create(
+                user_id=user_id, date=DAY, start_time=time(first), end_time=time(last), status=status,
+                equipment=records["equipment"]
+            )
+    client.portal.call(create)
+    return client, records
+
+def slots(client, **params):
+    response = client.get("/appointments/slots", params={"start_date": DAY, "end_date": DAY, "limit": 100, **params})
+    assert response.status_code == 200
+    return [(slot["start"][11:16], slot["staff_ids"]) for slot in response.json()]
+
+def test_slots_need_one_person_on_shift_for_the_whole_slot(make_client, seed):
+    client, records = start(make_client, seed, (1, 8, 9, "scheduled"), (2, 9, 10, "scheduled"))
+    # 08:30 would need the first shift handing over to the second
+    assert slots(client, duration_minutes=60) == [("08:00", [1]), ("09:00", [2])]
+    assert slots(client, duration_minutes=30)[1:3] == [("08:15", [1]), ("08:30", [1])]
+    assert slots(client, duration_minutes=90) == []
+
+def test_overlapping_shifts_list_everyone_covering_the_slot(make_client, seed):
+    client, records = start(make_client, seed, (1, 8, 10, "scheduled"), (2, 9, 11, "scheduled"))
+    found = dict(slots(client, duration_minutes=60))
+    assert found["08:00"] == [1]
+    assert found["09:00"] == [1, 2]
+    assert found["10:00"] == [2]
+    assert "10:15" not in found
+
+def test_breaks_bookings_and_maintenance_block_slots(make_client, seed):
+    client, records = start(make_client, seed, (1, 8, 10, "scheduled"), (1, 8, 9, "break"))
+    assert slots(client, duration_minutes=60) == [("09:00", [1])]
+
+    async def book():
+        await Appointment.create(
+            patient=records["patient"], scheduled_time=datetime.combine(DAY, time(9)), type="scan",
+            room=records["room"], equipment=records["equipment"], duration_minutes=30
+        )
+    client.portal.call(book)
+    assert slots(client, duration_minutes=30) == [("09:30", [1])]
+
+    async def maintain():
+        await MaintenanceRecord.create(
+            equipment=records["equipment"], date=DAY, maintenance_type="preventive", description="Tube check",
+            performed_by="Vendor", cost=0, last_maintenance_date=DAY, next_maintenance_date=DAY, status="scheduled"
+        )
+    client.portal.call(maintain)
+    assert slots(client, duration_minutes=30) == []
+
+def test_bookings_are_compared_with_shifts_in_local_time(make_client, seed, monkeypatch):
+    client, records = start(make_client, seed, (1, 8, 10, "scheduled"))
+    # Shifts are New York wall-clock times; the booking is the UTC instant of 08:00 there
+    monkeypatch.setenv("TIMEZONE", "America/New_York")
+    local = ZoneInfo("America/New_York")
+
+    async def book():
+        await Appointment.create(
+            patient=records["patient"], scheduled_time=datetime.combine(DAY, time(8), local).astimezone(timezone.utc),
+            type="scan", room=records["room"], equipment=records["equipment"], duration_minutes=60
+        )
+    client.portal.call(book)
+    response = client.get("/appointments/slots", params={"start_date": DAY, "end_date": DAY, "duration_minutes": 60})
+    found = [datetime.fromisoformat(slot["start"]) for slot in response.json()]
+    assert found == [datetime.combine(DAY, time(9), local)]
+
+def test_staff_can_be_left_out_of_the_search(make_client, seed):
+    client, records = start(make_client, seed)
+    assert slots(client, duration_minutes=60) == []
+    found = slots(client, duration_minutes=60, require_staff=False)
+    assert len(found) == 24 * 4 - 3
+    assert found[0] == ("00:00", [])
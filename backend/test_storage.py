@@ -0,0 +1,106 @@
+import io
+import os
+import pytest
+from fastapi import UploadFile
+from backend.models.tortoise_models import Department, Document, User
+from backend.routers import document
+from backend.services import storage
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "BLOB_STORAGE_DIR", str(tmp_path))
+    return tmp_path
+
+def stored_files(root):
+    return sorted(os.path.relpath(os.path.join(d, name), root) for d, _, names in os.walk(root) for name in names)
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="scan.pdf")
+
+async def create_owner():
+    await Department.create(name="Radiology", description="")
+    await User.create(name="Admin", email="admin@example.com", password_hash="x", role="admin")
+
+async def create_document(path, size, checksum):
+    return await Document.create(
+        title="Consent", category="policy", department_id=1, created_by_id=1, updated_by_id=1, file_path=path,
+        file_type="application/pdf", file_size=size, checksum=checksum
+    )
+
+def test_identical_uploads_share_a_blob_until_the_last_delete(make_client, blob_dir):
+    client = make_client(document.router)
+    client.portal.call(create_owner)
+    form = {"title": "Consent", "category": "policy", "department_id": 1, "created_by_id": 1}
+
+    def post(data):
+        response = client.post("/documents/", data=form, files={"file": ("a.pdf", data, "application/pdf")})
+        assert response.status_code == 200
+        return response.json()
+    first, second = post(b"consent" * 1000), post(b"consent" * 1000)
+    assert first["file_path"] == second["file_path"]
+    assert len(stored_files(blob_dir)) == 1
+
+    assert client.delete(f"/documents/{first['id']}").status_code == 200
+    assert os.path.exists(second["file_path"])
+    assert client.delete(f"/documents/{second['id']}").status_code == 200
+    assert stored_files(blob_dir) == []
+
+def test_a_failed_row_leaves_nothing_behind(run, blob_dir):
+    async def test():
+        with pytest.raises(RuntimeError):
+            async with storage.stored_upload(upload(b"scan")):
+                raise RuntimeError("row not created")
+        assert stored_files(blob_dir) == []
+    run(test)
+
+def test_release_before_the_row_commits_is_undone_by_the_upload(run, blob_dir):
+    # The last other reference was deleted while this upload was between storing the blob and creating its row
+    async def test():
+        await create_owner()
+        async with storage.stored_upload(upload(b"scan")) as (path, size, checksum):
+            assert await storage.release_blob(checksum)
+            assert not os.path.exists(path)
+            await create_document(path, size, checksum)
+        assert stored_files(blob_dir) == [os.path.relpath(path, blob_dir)]
+    run(test)
+
+def test_release_restores_a_blob_referenced_after_its_first_count(run, blob_dir, monkeypatch):
+    async def test():
+        await create_owner()
+        async with storage.stored_upload(upload(b"scan")) as (path, size, checksum):
+            await create_document(path, size, checksum)
+
+        counts = [0]
+        count = storage.blob_reference_count
+
+        async def stale_first_count(checksum):
+            # The first count ran before the row above was committed
+            return counts.pop() if counts else await count(checksum)
+        monkeypatch.setattr(storage, "blob_reference_count", stale_first_count)
+        assert not await storage.release_blob(checksum)
+        assert stored_files(blob_dir) == [os.path.relpath(path, blob_dir)]
+    run(test)
+
+def test_updates_cannot_repoint_a_document_at_another_blob(make_client, blob_dir):
+    client = make_client(document.router)
+    client.portal.call(create_owner)
+    form = {"title": "Consent", "category": "policy", "department_id": 1, "created_by_id": 1}
+    created = client.post("/documents/", data=form, files={"file": ("a.pdf", b"consent", "application/pdf")}).json()
+
+    changes = {
+        "title": "Signed consent", "description": None, "category": "policy", "file_type": "application/pdf",
+        "created_at": created["created_at"], "updated_at": created["updated_at"], "expiration_date": None,
+        "tags": None, "metadata": None, "access_control": None,
+    }
+    url = f"/documents/{created['id']}"
+    tampered = client.put(url, json={**changes, "file_path": "/etc/passwd", "file_size": 1, "checksum": None})
+    assert tampered.status_code == 422
+    updated = client.put(url, json=changes)
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Signed consent"
+    assert [updated.json()[field] for field in ("file_path", "file_size", "checksum")] == [
+        created["file_path"], created["file_size"], created["checksum"]
+    ]
+    # The blob is still counted, so deleting the document releases it
+    assert client.delete(url).status_code == 200
+    assert stored_files(blob_dir) == []
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from backend.crud.pagination import NEXT_CURSOR_HEADER
+from backend.crud.worklist import rebuild_worklist, refresh_worklist
+from backend.models.tortoise_models import Report, Study, StudyStatus
+from backend.routers import equipment, patients, report, studies, worklist
+
+ROUTERS = (worklist.router, studies.router, report.router, patients.router, equipment.router)
+
+def study_ids(client, **params):
+    response = client.get("/worklist/", params=params)
+    assert response.status_code == 200
+    return [entry["study_id"] for entry in response.json()]
+
+def editable(record):
+    return {key: value for key, value in record.items() if key != "id"}
+
+def start(make_client, seed):
+    # Four completed studies, most urgent last created, plus the seeded study still scheduled
+    client = make_client(*ROUTERS)
+    records = client.portal.call(seed)
+
+    async def create():
+        ids = []
+        for day, priority in enumerate(["normal", "STAT", "urgent", "low"], start=1):
+            study = await Study.create(
+                patient=records["patient"], referring_physician=records["physician"], room=records["room"],
+                equipment=records["equipment"], study_date=datetime(2024, 2, day, tzinfo=timezone.utc),
+                study_type="CT Head", priority=priority, status=StudyStatus.COMPLETED
+            )
+            ids.append(study.id)
+        await rebuild_worklist()
+        return ids
+    return client, records, client.portal.call(create)
+
+def test_completed_studies_are_listed_most_urgent_first(make_client, seed):
+    client, records, (normal, stat, urgent, low) = start(make_client, seed)
+    assert study_ids(client) == [stat, urgent, normal, low]
+    entry = client.get("/worklist/").json()[0]
+    assert entry["priority"] == "stat"
+    assert entry["modality"] == "CT"
+    assert entry["patient_name"] == "Lovelace, Ada"
+    assert entry["report_status"] is None
+
+def test_keyset_pages_follow_the_reading_order(make_client, seed):
+    client, records, (normal, stat, urgent, low) = start(make_client, seed)
+    first = client.get("/worklist/", params={"after": "", "limit": 3})
+    second = client.get("/worklist/", params={"after": first.headers[NEXT_CURSOR_HEADER], "limit": 3})
+    assert [entry["study_id"] for entry in first.json()] == [stat, urgent, normal]
+    assert [entry["study_id"] for entry in second.json()] == [low]
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+def test_report_assignment_and_signing(make_client, seed):
+    client, records, (normal, stat, urgent, low) = start(make_client, seed)
+
+    async def draft():
+        draft = await Report.create(
+            study_id=urgent, patient=records["patient"], radiologist=records["user"], clinical_indication="Headache",
+            findings="None", impression="Normal", report_number="R-1"
+        )
+        await refresh_worklist([urgent])
+        return draft.id
+    report_id = client.portal.call(draft)
+
+    assert study_ids(client, radiologist_id=records["user"].id) == [urgent]
+    assert study_ids(client, unassigned=True) == [stat, normal, low]
+    assert study_ids(client, report_status="draft") == [urgent]
+    assert study_ids(client, modality="ct", priority="STAT") == [stat]
+
+    assert client.post(f"/reports/{report_id}/sign", params={"signed_by": "Dr. Reader"}).status_code == 200
+    assert study_ids(client) == [stat, normal, low]
+
+def test_changes_to_shown_records_refresh_entries(make_client, seed):
+    client, records, ids = start(make_client, seed)
+    patient = editable(client.get(f"/patients/{records['patient'].id}").json())
+    patient.update(first_name="Augusta", last_name="King")
+    assert client.put(f"/patients/{records['patient'].id}", json=patient).status_code == 200
+    assert {entry["patient_name"] for entry in client.get("/worklist/").json()} == {"King, Augusta"}
+
+    item = editable(client.get(f"/equipment/{records['equipment'].id}").json())
+    item["type"] = "mr"
+    assert client.put(f"/equipment/{records['equipment'].id}", json=item).status_code == 200
+    assert study_ids(client, modality="MR") == study_ids(client)
+
+def test_deleted_studies_leave_the_worklist(make_client, seed):
+    client, records, (normal, stat, urgent, low) = start(make_client, seed)
+    assert client.delete(f"/studies/{normal}").status_code == 200
+    assert study_ids(client) == [stat, urgent, low]
+    # Deleting the patient removes their studies through the database's cascade
+    assert client.delete(f"/patients/{records['patient'].id}").status_code == 200
+    assert study_ids(client) == []